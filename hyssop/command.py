@@ -23,6 +23,7 @@ class CommandProcessor:
     Command_Create_Project = "create"
     Command_Show_Version = "version"
     Command_Pack_Project = "pack"
+    Command_Bench_Project = "bench"
 
     args_key_project_directory = "project_directory"
 
@@ -51,6 +52,15 @@ class CommandProcessor:
 
         # import coverage
         self.create_project()
+        self.project.set_event_loop_policy()
+        if self.args.jobs is not None:
+            from .unit_test.runner import ParallelTestRunner, get_test_case_ids
+
+            ParallelTestRunner(self.project.project_dir, self.args.jobs, event_loop=self.project.event_loop).run(
+                get_test_case_ids(self.project.unit_test_module)
+            )
+            return
+
         runner = unittest.TextTestRunner()
         # cov = coverage.Coverage()
         # cov.start()
@@ -60,6 +70,34 @@ class CommandProcessor:
         # cov.report()
         # cov.html_report(directory="htmlcov")
 
+    def bench(self) -> None:
+        import sys
+
+        from .unit_test.benchmark import (
+            BenchmarkRunner,
+            get_benchmark_cases,
+            load_benchmark_results,
+            save_benchmark_results,
+        )
+
+        self.create_project()
+        self.project.set_event_loop_policy()
+        cases = get_benchmark_cases(self.project.unit_test_module)
+        runner = BenchmarkRunner(self.args.warmup, self.args.repeat, self.args.threshold)
+        results = runner.run(cases)
+        if self.args.o:
+            save_benchmark_results(self.args.o, results)
+
+        if self.args.baseline:
+            if os.path.isfile(self.args.baseline):
+                regressions = runner.compare(results, load_benchmark_results(self.args.baseline), cases)
+                if regressions:
+                    print("{} benchmarks regressed".format(len(regressions)))
+                    sys.exit(1)
+            else:
+                save_benchmark_results(self.args.baseline, results)
+                print("baseline saved to {}".format(self.args.baseline))
+
     def pack(self) -> None:
         from .project.pack import HyssopPack
 
@@ -69,6 +107,18 @@ class CommandProcessor:
                 self.args.o,
                 prepare_wheels=self.args.add_wheels,
                 compile_py=not self.args.decompile_pyc,
+                jobs=self.args.jobs,
+                previous_manifest=self.args.delta,
+                use_cache=not self.args.no_cache,
+                codec=self.args.codec,
+                level=self.args.level,
+                threads=self.args.threads,
+                wheel_cache=self.args.wheel_cache,
+                find_links=self.args.find_links,
+                offline=self.args.offline,
+                pack_format=self.args.format,
+                entry_module=type(self).__module__.split(".")[0],
+                entry_command="start" if hasattr(self, "start") else "test",
             )
 
     def version(self):
@@ -215,8 +265,26 @@ exclude:
             CommandProcessor.Command_Test_Project, help="test hyssop library or specfied project directory path"
         )
         test_parser.add_argument(self.args_key_project_directory, nargs="?", help="project directory path")
+        test_parser.add_argument(
+            "-j", "--jobs", type=int, default=None, help="run test cases in the number of processes with durations"
+        )
         test_parser.set_defaults(command=CommandProcessor.Command_Test_Project)
 
+        bench_parser = self.command_parsers.add_parser(
+            CommandProcessor.Command_Bench_Project, help="benchmark hyssop library or specfied project directory path"
+        )
+        bench_parser.add_argument(self.args_key_project_directory, nargs="?", help="project directory path")
+        bench_parser.add_argument("-o", help="specify output json file path of results", default=None)
+        bench_parser.add_argument("--warmup", type=int, default=None, help="override warmup calls of benchmarks")
+        bench_parser.add_argument("--repeat", type=int, default=None, help="override repetitions of benchmarks")
+        bench_parser.add_argument(
+            "--baseline", default=None, help="compare with baseline json file, save results as baseline if not exists"
+        )
+        bench_parser.add_argument(
+            "--threshold", type=float, default=0.1, help="regression ratio of median time to baseline, default 0.1"
+        )
+        bench_parser.set_defaults(command=CommandProcessor.Command_Bench_Project)
+
         make_serv_parser = self.command_parsers.add_parser(
             CommandProcessor.Command_Create_Project,
             help="create a project template with specfied project directory path",
@@ -231,6 +299,36 @@ exclude:
         pack_parser.add_argument("-o", help="specify output compressed file path", default=None)
         pack_parser.add_argument("-w", "--add_wheels", action="store_true", help="add dependency wheel files")
         pack_parser.add_argument("-d", "--decompile_pyc", action="store_true", help="disable compile .py to .pyc")
+        pack_parser.add_argument(
+            "-j", "--jobs", type=int, default=None, help="number of processes to compile .py files, default cpu count"
+        )
+        pack_parser.add_argument(
+            "--delta", default=None, help="pack only the files changed since the specified manifest of previous output"
+        )
+        pack_parser.add_argument("--no_cache", action="store_true", help="disable the compiled bytecode cache")
+        pack_parser.add_argument(
+            "--format",
+            choices=["archive", "pyz"],
+            default="archive",
+            help="archive packs .zip for windows and tar for the others, pyz packs zipapp runs with python",
+        )
+        pack_parser.add_argument(
+            "--codec",
+            choices=["none", "gz", "xz", "zstd"],
+            default=None,
+            help="compression codec, default is gz for tar and none for zip, zstd requires zstandard package",
+        )
+        pack_parser.add_argument("--level", type=int, default=None, help="compression level of codec")
+        pack_parser.add_argument(
+            "--threads", type=int, default=1, help="number of threads to compress the output in independent blocks"
+        )
+        pack_parser.add_argument(
+            "--wheel_cache", default=None, help="folder of cached dependency wheels, default ~/.cache/hyssop/wheels"
+        )
+        pack_parser.add_argument(
+            "--find_links", action="append", default=None, help="additional local folder of dependency wheels"
+        )
+        pack_parser.add_argument("--offline", action="store_true", help="build dependency wheels without package index")
         pack_parser.set_defaults(command=CommandProcessor.Command_Pack_Project)
 
         version_serv_parser = self.command_parsers.add_parser(
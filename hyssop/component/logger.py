@@ -12,35 +12,100 @@ File created: August 21st 2020
 
         component:
             logger:
-                log_to_resources: False     # optional: Enable log to resources
+                log_to_queue: False         # optional: Enable log to the log sink process via multiprocessing queue
                 log_to_console: False       # optional: Enable log to console
                 # optional. Log to files in the folder under porject directory if specified
                 dir: 'logs'
+                # optional. Write log files in background thread, logging calls only put records into queue
+                log_async: False
+                log_queue_size: 10000       # optional: max records (batches if log_to_queue) in the queue
+                log_queue_policy: 'drop'    # optional: 'drop' records or 'block' logging calls when queue is full
+                log_batch_size: 256         # optional: max records written or sent per batch
+                log_flush_interval: 1.0     # optional: seconds between flushing log files or queued batches
+                # optional. Rotate log files by 'size' or 'time', keep log_backup_count rotated files,
+                # the rotated files are always opened in append mode, get_logger() rejects the other modes
+                log_rotation: 'size'
+                log_max_bytes: 10485760     # optional: file size to rotate when log_rotation is 'size'
+                log_rotate_when: 'midnight' # optional: 'S', 'M', 'H', 'D', 'W0'-'W6' or 'midnight' of 'time' rotation
+                log_rotate_interval: 1      # optional: interval of log_rotate_when
+                log_backup_count: 7         # optional: rotated files to keep
+                log_compression: 'gz'       # optional: compress rotated files with 'gz' or 'zstd' in background
+                log_format: 'text'          # optional: 'text' or 'json' lines with the fields of log_context()
+                log_rate_limits:            # optional: max records per second of the logger, warnings are not limited
+                    aiohttp.access: 100
+                log_sampling:               # optional: ratio in (0, 1] of records to keep of the logger, warnings are kept
+                    aiohttp.access: 0.1
+
+        - log_to_queue moves formatting and file writing to a log sink process started by start(),
+          the process stops after the pending records written by dispose().
+          log_queue_policy applies to the batches sent to the process as well.
+          Override _log_to_resources() to send the messages to the other resources.
 
 Modified By: hsky77
 Last Updated: April 4th 2025 16:02:01 pm
 """
 
 
-from logging import INFO, DEBUG, ERROR, Logger, getLogger, FileHandler, Formatter
+import signal
+from logging import INFO, DEBUG, ERROR, Logger, getLogger, FileHandler, Filter, Formatter, Handler, StreamHandler
 from multiprocessing import Process, Queue
 from os import makedirs, path
-from typing import Any, Dict, Optional
+from queue import Full
+from typing import Annotated, Any, Dict, List, Literal, Optional, Set, Tuple
 
 from pydantic import BaseModel, Field
 
 from hyssop.utils import join_path
-from hyssop.utils.logger import LOG_FORMAT, MultiProcessingQueueHandle
+from hyssop.utils.logger import (
+    LOG_FORMAT,
+    LOG_QUEUE_POLICY_DROP,
+    AsyncLogListener,
+    AsyncLogQueueHandler,
+    CompressingRotatingFileHandler,
+    CompressingTimedRotatingFileHandler,
+    JsonFormatter,
+    LogContextFilter,
+    LogRecordData,
+    MultiProcessingQueueHandle,
+    RateLimitFilter,
+    SamplingFilter,
+    to_log_record,
+)
+from hyssop.utils.worker import FunctionLoopWorker
 
 from .base import Component
 
 
 class LoggerComponentConfig(BaseModel):
     log_level: int = Field(INFO, description="Log level")
-    log_to_queue: bool = Field(False, description="Enable log to multiprocessing queue")
+    log_to_queue: bool = Field(False, description="Enable log to the log sink process via multiprocessing queue")
     log_to_console: bool = Field(False, description="Enable log to console")
     log_to_file: bool = Field(False, description="Enable log to file")
     dir: Optional[str] = Field(None, description="Log to files in the folder under porject directory if specified")
+    log_async: bool = Field(False, description="Write log files in background thread via queue")
+    log_queue_size: int = Field(10000, gt=0, description="Max records, or batches of log_to_queue, in the queue")
+    log_queue_policy: Literal["drop", "block"] = Field(
+        LOG_QUEUE_POLICY_DROP, description="Drop records or block logging calls when the log queue is full"
+    )
+    log_batch_size: int = Field(256, gt=0, description="Max records written or sent to queue per batch")
+    log_flush_interval: float = Field(1.0, gt=0, description="Seconds between flushing log files or queued batches")
+    log_rotation: Optional[Literal["size", "time"]] = Field(
+        None, description="Rotate log files by size or time, the files are opened in append mode"
+    )
+    log_max_bytes: int = Field(10 * 1024 * 1024, gt=0, description="File size to rotate when log_rotation is size")
+    log_rotate_when: str = Field("midnight", description="TimedRotatingFileHandler 'when' if log_rotation is time")
+    log_rotate_interval: int = Field(1, gt=0, description="Interval of log_rotate_when")
+    log_backup_count: int = Field(7, ge=0, description="Number of rotated log files to keep")
+    log_compression: Optional[Literal["gz", "zstd"]] = Field(
+        None, description="Compress rotated log files in background"
+    )
+    log_format: Literal["text", "json"] = Field("text", description="Format log records to text or json lines")
+    log_rate_limits: Dict[str, Annotated[float, Field(gt=0)]] = Field(
+        default_factory=dict, description="Max records per second of the loggers, warnings are not limited"
+    )
+    log_sampling: Dict[str, Annotated[float, Field(gt=0, le=1)]] = Field(
+        default_factory=dict, description="Ratio in (0, 1] of records to keep of the loggers, warnings are kept"
+    )
 
 
 class LoggerComponent(Component[LoggerComponentConfig]):
@@ -51,34 +116,113 @@ class LoggerComponent(Component[LoggerComponentConfig]):
     def init(self):
         self.message_process: Optional[Process] = None
         self.message_queue: Optional[Queue] = None
+        self.message_flush_worker: Optional[FunctionLoopWorker] = None
+        self.queue_handlers: Dict[str, MultiProcessingQueueHandle] = {}
         if self.config.log_to_queue:
-            self.message_queue = Queue()
-            self.message_process = Process(target=self.__log_from_queue, args=(self.message_queue,))
+            self.message_queue = Queue(self.config.log_queue_size)
+            self.message_process = Process(target=self.__log_from_queue, args=(self.message_queue,), daemon=True)
+
+        self.log_listener: Optional[AsyncLogListener] = None
+        self.async_handlers: Dict[str, AsyncLogQueueHandler] = {}
+        self.filtered_loggers: Set[str] = set()
+        if self.config.log_async:
+            self.log_listener = AsyncLogListener(
+                self.config.log_queue_size,
+                self.config.log_queue_policy,
+                self.config.log_batch_size,
+                self.config.log_flush_interval,
+            )
 
     def info(self) -> Dict[str, Any]:
-        return {
+        info = {
             **super().info(),
             "message_process": self.message_process.pid if self.message_process else None,
             "message_queue": self.message_queue.qsize() if self.message_queue else None,
         }
+        if self.log_listener is not None:
+            info["metrics"] = self.log_listener.get_metrics()
+        if self.message_queue is not None:
+            info["metrics"] = {
+                **info.get("metrics", {}),
+                "queue_dropped": sum(h.dropped for h in self.queue_handlers.values()),
+            }
+        suppressed = self.get_suppressed_counts()
+        if suppressed:
+            info["metrics"] = {**info.get("metrics", {}), "suppressed": suppressed}
+        return info
+
+    def get_suppressed_counts(self) -> Dict[str, int]:
+        """Return the count of records suppressed by rate limits and sampling of the loggers"""
+        counts = {}
+        for name in {**self.config.log_rate_limits, **self.config.log_sampling}:
+            counts[name] = sum(
+                f.suppressed for f in getLogger(name).filters if isinstance(f, (RateLimitFilter, SamplingFilter))
+            )
+        return counts
+
+    async def start(self):
+        # the threads are started here rather than init() to be running in the forked worker processes
+        if self.log_listener is not None:
+            self.log_listener.start()
+        if self.message_process is not None and self.message_process.pid is None:
+            self.message_process.start()
+            self.message_flush_worker = FunctionLoopWorker(loop_interval_seconds=self.config.log_flush_interval)
+            self.message_flush_worker.daemon = True
+            self.message_flush_worker.run_method(self.flush_queue_handlers)
+
+    def flush_queue_handlers(self) -> None:
+        """Send the buffered records of all loggers to the log sink process"""
+        for h in list(self.queue_handlers.values()):
+            h.flush()
 
     def get_logger(
         self, name: str, sub_dir: str = "", mode: str = "a", encoding: str = "utf-8", echo: bool = False
     ) -> Logger:
-        """create and return logger object, sub_dir appends the path to configured log path"""
+        """
+        create and return logger object, sub_dir appends the path to configured log path,
+        mode other than 'a' raises ValueError if log_rotation is configured
+        """
         logger = getLogger(name)
         logger.setLevel(self.config.log_level)
         logger.propagate = self.config.log_to_console or echo
-        if self.config.log_to_file:
+        if self.config.log_to_file and not self.config.log_to_queue:
             self.update_file_handler(logger, sub_dir, mode, encoding)
         else:
             self.remove_file_handler(logger, sub_dir)
 
         if self.config.log_to_queue and self.message_queue:
-            logger.addHandler(MultiProcessingQueueHandle(self.message_queue))
+            self.update_queue_handler(logger, sub_dir)
 
+        self.update_filters(logger)
         return logger
 
+    def update_filters(self, logger: Logger) -> None:
+        """
+        Set the log context, rate limit and sampling filters of logger as configured, keep the unchanged ones.
+        The filters are removed by dispose().
+        """
+        self.filtered_loggers.add(logger.name)
+        filters: Dict[type, Any] = {type(f): f for f in logger.filters}
+        expected: Dict[type, Optional[Filter]] = {LogContextFilter: None, RateLimitFilter: None, SamplingFilter: None}
+        if self.config.log_format == "json":
+            expected[LogContextFilter] = filters.get(LogContextFilter) or LogContextFilter()
+        rate = self.config.log_rate_limits.get(logger.name)
+        if rate is not None:
+            f = filters.get(RateLimitFilter)
+            expected[RateLimitFilter] = f if f is not None and f.rate == rate else RateLimitFilter(rate)
+        ratio = self.config.log_sampling.get(logger.name)
+        if ratio is not None:
+            f = filters.get(SamplingFilter)
+            expected[SamplingFilter] = f if f is not None and f.ratio == ratio else SamplingFilter(ratio)
+
+        for filter_type, new_filter in expected.items():
+            current = filters.get(filter_type)
+            if current is not new_filter:
+                if current is not None:
+                    logger.removeFilter(current)
+                if new_filter is not None:
+                    logger.addFilter(new_filter)
+
     def update_default_logger(self, debug: bool = False) -> None:
         self.config.log_level = DEBUG if debug else ERROR
         for name in self.default_loggers:
@@ -96,36 +240,159 @@ class LoggerComponent(Component[LoggerComponentConfig]):
             log_file = join_path(log_dir, logger.name + ".log")
 
             exist = False
-            for h in logger.handlers:
-                if isinstance(h, FileHandler):
-                    if h.baseFilename == path.abspath(log_file):
+            for h in list(logger.handlers):
+                file_handler = self._get_file_handler(h)
+                if file_handler is not None:
+                    if file_handler.baseFilename == path.abspath(log_file) and self._is_handler_mode_matched(h):
                         exist = True
                     else:
                         h.close()
                         logger.removeHandler(h)
 
             if not exist:
-                handler = FileHandler(log_file, mode=mode, encoding=encoding)
-                handler.setFormatter(Formatter(LOG_FORMAT))
-                logger.addHandler(handler)
+                handler = self._create_file_handler(log_file, mode, encoding)
+                if self.log_listener is not None:
+                    self.async_handlers[logger.name] = AsyncLogQueueHandler(self.log_listener, handler)
+                    logger.addHandler(self.async_handlers[logger.name])
+                else:
+                    logger.addHandler(handler)
 
     def remove_file_handler(self, logger: Logger, sub_dir: str = ""):
         if self.project_dir and self.config.dir:
             log_file = join_path(self.project_dir, self.config.dir, sub_dir, logger.name + ".log")
             for h in logger.handlers:
-                if isinstance(h, FileHandler) and h.baseFilename == path.abspath(log_file):
+                file_handler = self._get_file_handler(h)
+                if file_handler is not None and file_handler.baseFilename == path.abspath(log_file):
                     h.close()
                     logger.removeHandler(h)
                     break
 
+    def update_queue_handler(self, logger: Logger, sub_dir: str = ""):
+        """Attach the handler sends records to the log sink process if logger does not have one."""
+        handler = self.queue_handlers.get(logger.name)
+        if handler is not None and handler in logger.handlers:
+            handler.sub_dir = sub_dir
+            return
+
+        handler = MultiProcessingQueueHandle(
+            self.message_queue,
+            sub_dir,
+            self.config.log_batch_size,
+            self.config.log_flush_interval,
+            self.config.log_queue_policy,
+        )
+        self.queue_handlers[logger.name] = handler
+        logger.addHandler(handler)
+
+    def _create_file_handler(self, log_file: str, mode: str = "a", encoding: str = "utf-8") -> FileHandler:
+        if self.config.log_rotation is not None and mode != "a":
+            # the rotating handlers always append to the log file
+            raise ValueError("mode '{}' is not supported by log_rotation '{}'".format(mode, self.config.log_rotation))
+
+        if self.config.log_rotation == "size":
+            handler: FileHandler = CompressingRotatingFileHandler(
+                log_file,
+                mode=mode,
+                maxBytes=self.config.log_max_bytes,
+                backupCount=self.config.log_backup_count,
+                encoding=encoding,
+                compression=self.config.log_compression,
+            )
+        elif self.config.log_rotation == "time":
+            handler = CompressingTimedRotatingFileHandler(
+                log_file,
+                when=self.config.log_rotate_when,
+                interval=self.config.log_rotate_interval,
+                backupCount=self.config.log_backup_count,
+                encoding=encoding,
+                compression=self.config.log_compression,
+            )
+        else:
+            handler = FileHandler(log_file, mode=mode, encoding=encoding)
+        handler.setFormatter(self._create_formatter())
+        return handler
+
+    def _create_formatter(self) -> Formatter:
+        return JsonFormatter() if self.config.log_format == "json" else Formatter(LOG_FORMAT)
+
+    def _get_file_handler(self, handler: Handler) -> Optional[FileHandler]:
+        """Return the file handler or the one wrapped by async queue handler."""
+        if isinstance(handler, AsyncLogQueueHandler):
+            handler = handler.target
+        return handler if isinstance(handler, FileHandler) else None
+
+    def _is_handler_mode_matched(self, handler: Handler) -> bool:
+        """Check the handler is attached in the configured sync or async mode."""
+        return isinstance(handler, AsyncLogQueueHandler) == (self.log_listener is not None)
+
     async def dispose(self):
+        # detach the async handlers before stopping listener, the records logged after dispose are not queued
+        for logger_name, h in self.async_handlers.items():
+            getLogger(logger_name).removeHandler(h)
+        if self.log_listener is not None:
+            self.log_listener.stop()
+        for h in self.async_handlers.values():
+            h.close()
+        self.async_handlers.clear()
+
+        for logger_name in self.filtered_loggers:
+            logger = getLogger(logger_name)
+            for f in list(logger.filters):
+                if isinstance(f, (LogContextFilter, RateLimitFilter, SamplingFilter)):
+                    logger.removeFilter(f)
+        self.filtered_loggers.clear()
+
+        if self.message_flush_worker is not None:
+            self.message_flush_worker.dispose()
+            self.message_flush_worker = None
+
+        for logger_name, h in self.queue_handlers.items():
+            h.close()
+            getLogger(logger_name).removeHandler(h)
+        self.queue_handlers.clear()
+
         if self.message_process is not None and self.message_process.is_alive() and self.message_queue is not None:
-            self.message_queue.put_nowait("quit process")
-            self.message_process.join()
+            timeout = self.config.log_flush_interval * 10
+            try:
+                self.message_queue.put(None, timeout=timeout)
+                self.message_process.join(timeout)
+            except Full:
+                pass
+            if self.message_process.is_alive():
+                self.message_process.terminate()
 
     def __log_from_queue(self, q: Queue):
-        for message in iter(q.get, "quit process"):
-            self._log_to_resources(message)
+        # the parent process decides when to stop the sink
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        self._sink_handlers: Dict[Tuple[str, str], Handler] = {}
+        try:
+            for sub_dir, records in iter(q.get, None):
+                self._log_batch_to_resources(sub_dir, records)
+        finally:
+            for h in self._sink_handlers.values():
+                h.close()
+
+    def _log_batch_to_resources(self, sub_dir: str, records: List[LogRecordData]):
+        """
+        This function will be called in the log sink process with the batch of records sent via multiprocessing queue.
+        It writes records to the log files if log_to_file is enabled, elsewise to console,
+        and calls _log_to_resources() with the message of each record.
+        """
+        for data in records:
+            key = (sub_dir, data[0])
+            handler = self._sink_handlers.get(key)
+            if handler is None:
+                if self.config.log_to_file and self.project_dir and self.config.dir:
+                    log_dir = join_path(self.project_dir, self.config.dir, sub_dir)
+                    if not path.isdir(log_dir):
+                        makedirs(log_dir, exist_ok=True)
+                    handler = self._create_file_handler(join_path(log_dir, data[0] + ".log"))
+                else:
+                    handler = StreamHandler()
+                    handler.setFormatter(self._create_formatter())
+                self._sink_handlers[key] = handler
+            handler.handle(to_log_record(data))
+            self._log_to_resources(data[3])
 
     def _log_to_resources(self, message: str):
         """This function will be called in different process by using multiprocessing queue."""
@@ -7,6 +7,7 @@ from yaml import SafeLoader, load
 
 from hyssop.component import ComponentManagerT, DefaultComponentManager, create_component_manager
 from hyssop.unit_test import get_test_suite
+from hyssop.utils.event_loop import Event_Loop_Asyncio, set_event_loop_policy
 from hyssop.utils.func import join_path, join_to_abs_path
 
 
@@ -33,6 +34,7 @@ class HyssopProject:
                     config = load(f, Loader=SafeLoader)
         self.name = config.pop("name", "hyssop project") if config else project_name
         self.debug = config.pop("debug", False) if config else False
+        self.event_loop = config.pop("event_loop", Event_Loop_Asyncio) if config else Event_Loop_Asyncio
         self.config = config if config else {}
 
     @property
@@ -63,6 +65,10 @@ class HyssopProject:
     def requirement_file(self) -> str:
         return join_path(self.project_dir, self.Project_Requirement_File)
 
+    def set_event_loop_policy(self) -> str:
+        """set the event loop policy of project config "event_loop" and return the name of event loop in use"""
+        return set_event_loop_policy(self.event_loop)
+
     def create_component_manager(
         self,
         component_manager_t: Type[ComponentManagerT] = DefaultComponentManager,
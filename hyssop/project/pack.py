@@ -10,22 +10,61 @@ Modified By: hsky77
 Last Updated: October 15th 2021 10:45:29 am
 """
 
-
+import hashlib
+import json
 import os
 import sys
-from typing import ByteString, List, Set, Tuple
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from io import BytesIO
+from tempfile import mkdtemp
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
-from hyssop.utils.func import join_path, walk_to_file_paths
+from hyssop.utils.func import compile_path_patterns, join_path, walk_to_file_paths
 
 from . import HyssopProject
 
+Zip_Min_Epoch = 315532800  # 1980-01-01, the minimum date time of zip
+
+Pack_Codec_None = "none"
+Pack_Codec_Gzip = "gz"
+Pack_Codec_Xz = "xz"
+Pack_Codec_Zstd = "zstd"
+
+Pack_Format_Archive = "archive"
+Pack_Format_Pyz = "pyz"
+
+Pack_Codec_Extensions = {
+    Pack_Codec_None: ".tar",
+    Pack_Codec_Gzip: ".tar.gz",
+    Pack_Codec_Xz: ".tar.xz",
+    Pack_Codec_Zstd: ".tar.zst",
+}
+
+# hook(server_folder, [(path, arcname)], work_dir) returns the generated files [(path in work_dir, arcname)]
+PackHook = Callable[[str, List[Tuple[str, str]], str], Iterable[Tuple[str, str]]]
+
+pack_hooks: List[PackHook] = []
+
+
+def add_pack_hook(hook: PackHook) -> None:
+    """add hook called by HyssopPack.pack() to generate the files packed with the project files"""
+    if hook not in pack_hooks:
+        pack_hooks.append(hook)
+
 
 class HyssopPack(object):
     """
-    pack server files to compressed output file, .zip for windows os and tar.gz for the others
+    pack server files to compressed output file, .zip for windows os and tar for the others
     """
 
     default_exclude_keys = ["__pycache__"]
+    manifest_suffix = ".manifest.json"
+    bytecode_cache_folder = ("__pycache__", "hyssop_pack")
+    default_wheel_cache = os.environ.get(
+        "HYSSOP_WHEEL_CACHE", join_path(os.path.expanduser("~"), ".cache", "hyssop", "wheels")
+    )
 
     def pack(
         self,
@@ -34,31 +73,114 @@ class HyssopPack(object):
         prepare_wheels: bool = False,
         compile_py: bool = True,
         log_level: str = "INFO",
+        jobs: Optional[int] = None,
+        previous_manifest: Optional[str] = None,
+        use_cache: bool = True,
+        codec: Optional[str] = None,
+        level: Optional[int] = None,
+        threads: int = 1,
+        wheel_cache: Optional[str] = None,
+        find_links: Optional[List[str]] = None,
+        offline: bool = False,
+        pack_format: str = "archive",
+        entry_module: str = "hyssop",
+        entry_command: str = "test",
     ):
+        """
+        jobs: number of processes to compile .py files, default is the number of CPUs.
+        previous_manifest: pack only the files changed since the manifest of previous output.
+        use_cache: reuse the compiled bytecode of unchanged files in __pycache__/hyssop_pack beside the output.
+        codec: compression of output file in "none", "gz", "xz" or "zstd", default is "gz" for tar and "none" for zip.
+        level: compression level of codec, default is the codec default.
+        threads: number of threads to compress the output in independent blocks.
+        wheel_cache: folder of the wheels built by pip, default is ~/.cache/hyssop/wheels.
+        find_links: additional local folders of wheels for pip.
+        offline: build wheels from wheel_cache and find_links only without package index.
+        pack_format: "archive" for .zip or tar, "pyz" for zipapp runs "python <output>.pyz [command]" with the
+            command of entry_module, the dependency packages with data files or extension modules are extracted at
+            the first run, so the zipapp vendors platform wheels runs only on the platform of the packing machine.
+        entry_module: the module runs the project in zipapp, e.g. "hyssop" or "hyssop_aiohttp".
+        entry_command: the default command of zipapp.
+
+        The manifest of packed files is written to <output>.manifest.json. The archive is reproducible,
+        the mtime of files is taken from SOURCE_DATE_EPOCH environment variable.
+        The files generated by the hooks of add_pack_hook() are packed with the project files.
+        """
+        is_pyz = pack_format == Pack_Format_Pyz
+        if pack_format not in (Pack_Format_Archive, Pack_Format_Pyz):
+            raise ValueError("unsupported pack format: {}".format(pack_format))
+        if codec is None:
+            codec = Pack_Codec_None if sys.platform == "win32" or is_pyz else Pack_Codec_Gzip
+        if codec not in Pack_Codec_Extensions:
+            raise ValueError("unsupported pack codec: {}".format(codec))
+        if is_pyz and (codec not in (Pack_Codec_None, Pack_Codec_Gzip) or previous_manifest):
+            raise ValueError("zipapp supports only none or gz codec without delta packing")
+
+        file_name = os.path.basename(os.path.normpath(server_folder))
         if output_file_path is None:
-            file_name = os.path.basename(os.path.normpath(server_folder))
-            if sys.platform == "win32":
+            if is_pyz:
+                output_file_path = file_name + ".pyz"
+            elif sys.platform == "win32":
                 output_file_path = "win_" + file_name + ".zip"
             else:
-                output_file_path = "linux_" + file_name + ".tar.gz"
+                output_file_path = "linux_" + file_name + Pack_Codec_Extensions[codec]
 
         # create packing file paths
         paths, py_paths, requirements = self._create_file_paths(server_folder)
 
         # get wheel dependencies
         if prepare_wheels:
+            print("clean dependency folder")
+            self.__remove_dir(HyssopProject.Dependency_Folder)
             for req in requirements:
                 if os.path.isfile(req):
-                    self._preparing_python_wheels(HyssopProject.Dependency_Folder, req)
-            paths.update(walk_to_file_paths(HyssopProject.Dependency_Folder))
+                    self._preparing_python_wheels(
+                        HyssopProject.Dependency_Folder, req, wheel_cache, find_links=find_links, offline=offline
+                    )
+            if not is_pyz:
+                paths.update(walk_to_file_paths(HyssopProject.Dependency_Folder))
 
         # add arc path for iterable paths as [(path, arcpath)]
         paths = self._setup_arc_paths(paths, server_folder)
         py_paths = self._setup_arc_paths(py_paths, server_folder)
         requirements = self._setup_arc_paths(requirements, server_folder)
 
-        # making ouput file
-        self._packing_files(paths, py_paths, output_file_path, compile_py=compile_py)
+        wheel_dir = None
+        hook_dir = None
+        try:
+            if pack_hooks:
+                hook_dir = mkdtemp()
+                for hook in pack_hooks:
+                    paths.extend(hook(server_folder, paths + py_paths, hook_dir))
+
+            if is_pyz and prepare_wheels:
+                from .zipapp import extract_wheels
+
+                # vendor the dependencies as the top level packages of zipapp
+                wheel_dir = mkdtemp()
+                wheels = walk_to_file_paths(HyssopProject.Dependency_Folder)
+                for path in extract_wheels(sorted(w for w in wheels if w.endswith(".whl")), wheel_dir):
+                    (py_paths if path[1].endswith(".py") else paths).append(path)
+
+            # making ouput file
+            self._packing_files(
+                paths,
+                py_paths,
+                output_file_path,
+                compile_py=compile_py,
+                jobs=jobs,
+                previous_manifest=previous_manifest,
+                use_cache=use_cache,
+                codec=codec,
+                level=level,
+                threads=threads,
+                pyz_entry=(file_name, entry_module, entry_command) if is_pyz else None,
+            )
+        finally:
+            if wheel_dir:
+                self.__remove_dir(wheel_dir)
+            if hook_dir:
+                self.__remove_dir(hook_dir)
 
     def _setup_arc_paths(self, paths: Set[str], server_folder: str):
         new_paths = []
@@ -79,9 +201,9 @@ class HyssopPack(object):
         py_paths = set()
         requirement_paths = set()
 
-        hyssop_exclude = self.default_exclude_keys
         for directory in [server_folder]:
-            sub_paths = set()
+            sub_paths = []
+            exclude = list(self.default_exclude_keys)
             pack_list = join_path(directory, HyssopProject.Project_Pack_File)
             if os.path.isfile(pack_list):
                 with open(pack_list, "r") as f:
@@ -97,88 +219,231 @@ class HyssopPack(object):
                                     py_paths.update(pys)
                                     requirement_paths.update(rs)
                                 else:
-                                    sub_paths.add(path)
-
-                    sub_paths.update(walk_to_file_paths(directory))
+                                    sub_paths.append(path)
 
-                    exclude = hyssop_exclude
                     if "exclude" in config:
                         if config["exclude"] is not None:
-                            exclude = hyssop_exclude + config["exclude"]
+                            exclude.extend(config["exclude"])
                     exclude.append(pack_list)
 
-                    py_paths.update([p for p in sub_paths if ".py" in p and max([p.find(x) for x in exclude]) == -1])
-                    paths.update([p for p in sub_paths if ".py" not in p and max([p.find(x) for x in exclude]) == -1])
-            else:
-                # if pack setting file does not exist, collect all files under the server folder
-                sub_paths = walk_to_file_paths(directory)
-                paths.update(
-                    [p for p in sub_paths if ".py" not in p and max([p.find(x) for x in hyssop_exclude]) == -1]
-                )
-                py_paths.update([p for p in sub_paths if ".py" in p and max([p.find(x) for x in hyssop_exclude]) == -1])
+            # collect the files under the server folder, excluded directories are not walked into
+            is_excluded = compile_path_patterns(exclude)
+            sub_paths = [p for p in sub_paths if not is_excluded(p)]
+            sub_paths.extend(walk_to_file_paths(directory, exclude=is_excluded))
+
+            py_paths.update([p for p in sub_paths if p.endswith(".py")])
+            paths.update([p for p in sub_paths if not p.endswith(".py")])
 
             requirement_paths.add(join_path(directory, HyssopProject.Project_Requirement_File))
 
         return paths, py_paths, requirement_paths
 
-    def _preparing_python_wheels(self, dependency_folder: str, requirements: str) -> None:
-        """using pip to download python packages for later packing"""
+    def _preparing_python_wheels(
+        self,
+        dependency_folder: str,
+        requirements: str,
+        wheel_cache: Optional[str] = None,
+        find_links: Optional[List[str]] = None,
+        offline: bool = False,
+    ) -> None:
+        """
+        copy the pip wheels of requirements to dependency folder for later packing.
+        The wheels are built in the platform folder of wheel cache, and the built wheels of requirements are
+        recorded by the hash of requirements file, so unchanged requirements do not run pip again and
+        pip only builds the missing wheels of changed requirements.
+        """
         import subprocess
 
-        print("clean dependency folder")
-        self.__remove_dir(dependency_folder)
-
-        # build wheels
-        if sys.platform == "win32":
-            command = "python"
+        cache_dir = join_path(wheel_cache or self.default_wheel_cache, get_wheel_platform_tag())
+        with open(requirements, "rb") as f:
+            requirements_hash = hashlib.sha256(f.read()).hexdigest()
+        index_path = join_path(cache_dir, "requirements", requirements_hash + ".json")
+
+        wheels = None
+        if os.path.isfile(index_path):
+            with open(index_path, "r", encoding="utf-8") as f:
+                wheels = json.load(f)
+            if not all(os.path.isfile(join_path(cache_dir, w)) for w in wheels):
+                wheels = None
+
+        if wheels is None:
+            print("preparing pip wheels...")
+            # build in the cache folder so the built wheels are moved to the cache on the same filesystem
+            os.makedirs(cache_dir, exist_ok=True)
+            build_dir = mkdtemp(dir=cache_dir)
+            try:
+                command = [sys.executable, "-m", "pip", "wheel", "-w", build_dir, "-r", requirements]
+                for link in [cache_dir] + (find_links or []):
+                    command.extend(["--find-links", link])
+                if offline:
+                    command.append("--no-index")
+                res = subprocess.run(command)
+
+                if res.returncode > 0:
+                    raise Exception("getting pip wheels failed...")
+
+                wheels = sorted(w for w in os.listdir(build_dir) if w.endswith(".whl"))
+                for wheel in wheels:
+                    if not os.path.isfile(join_path(cache_dir, wheel)):
+                        os.replace(join_path(build_dir, wheel), join_path(cache_dir, wheel))
+                write_file_atomic(index_path, json.dumps(wheels, indent=2).encode("utf-8"))
+            finally:
+                self.__remove_dir(build_dir)
         else:
-            command = "python3"
-        print("preparing pip wheels...")
-        res = subprocess.run([command, "-m", "pip", "wheel", "-w", dependency_folder, "-r", requirements])
-
-        if res.returncode > 0:
-            raise Exception("getting pip wheels failed...")
-
-    def _packing_files(self, paths: List[str], py_paths: List[str], output_path: str, compile_py: bool = True) -> None:
-        if len(paths) > 0:
-            if sys.platform == "win32":
-                import zipfile
-
-                with zipfile.ZipFile(output_path, mode="w") as zf:
-                    for path in paths:
-                        print("packing file: {}".format(path[0]))
-                        zf.write(path[0], arcname=path[1])
-
-                    for path in py_paths:
-                        if compile_py:
-                            bytecode = self.__get_compiled_py_bytecode(path[0])
-                            zf.writestr(path[1].replace(".py", ".pyc"), bytecode)
-                        else:
-                            print("packing py file: {}".format(path[0]))
-                            zf.write(path[0], arcname=path[1])
-            else:
-                import tarfile
-                from io import BytesIO
-
-                with tarfile.open(output_path, mode="w:gz") as tarf:
-                    for path in paths:
-                        print("packing file: {}".format(path))
-                        tarf.add(path[0], arcname=path[1])
-
-                    for path in py_paths:
-                        if compile_py:
-                            bytecode = self.__get_compiled_py_bytecode(path[0])
-                            bIO = BytesIO()
-                            bIO.write(bytecode)
-                            bIO.seek(0)
-                            info = tarfile.TarInfo(name=path[1].replace(".py", ".pyc"))
-                            info.size = len(bIO.getbuffer())
-                            tarf.addfile(tarinfo=info, fileobj=bIO)
-                        else:
-                            print("packing py file: {}".format(path[0]))
-                            tarf.add(path[0], arcname=path[1])
+            print("using cached pip wheels of {}".format(requirements))
+
+        os.makedirs(dependency_folder, exist_ok=True)
+        for wheel in wheels:
+            copy_file(join_path(cache_dir, wheel), join_path(dependency_folder, wheel))
+
+    def _compile_py_files(
+        self, py_paths: List[Tuple[str, str, str]], jobs: Optional[int] = None, cache_dir: Optional[str] = None
+    ) -> Iterator[Tuple[Tuple[str, str, str], bytes]]:
+        """
+        Compile (path, arcname, source sha256) .py files in process pool and yield (path, bytecode) in the order of
+        py_paths as soon as the bytecode is ready, so the archive writer does not wait for all the files.
+        The bytecode of unchanged sources is read from cache_dir instead of compiling again.
+        """
+        cache_paths = [get_bytecode_cache_path(cache_dir, p[1], p[2]) if cache_dir else None for p in py_paths]
+        cached: Dict[int, bytes] = {}
+        for i, cache_path in enumerate(cache_paths):
+            if cache_path and os.path.isfile(cache_path):
+                with open(cache_path, "rb") as f:
+                    cached[i] = f.read()
+
+        misses = [p for i, p in enumerate(py_paths) if i not in cached]
+        jobs = jobs or os.cpu_count() or 1
+        if jobs <= 1 or len(misses) <= 1:
+            compiled = (get_compiled_py_bytecode(p[0], p[1]) for p in misses)
+            yield from self._merge_cached_bytecodes(py_paths, cache_paths, cached, compiled)
         else:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                chunksize = max(1, len(misses) // (jobs * 4))
+                compiled = executor.map(
+                    get_compiled_py_bytecode, [p[0] for p in misses], [p[1] for p in misses], chunksize=chunksize
+                )
+                yield from self._merge_cached_bytecodes(py_paths, cache_paths, cached, compiled)
+
+    def _merge_cached_bytecodes(
+        self,
+        py_paths: List[Tuple[str, str, str]],
+        cache_paths: List[Optional[str]],
+        cached: Dict[int, bytes],
+        compiled: Iterable[bytes],
+    ) -> Iterator[Tuple[Tuple[str, str, str], bytes]]:
+        compiled = iter(compiled)
+        for i, path in enumerate(py_paths):
+            if i in cached:
+                yield path, cached[i]
+            else:
+                bytecode = next(compiled)
+                cache_path = cache_paths[i]
+                if cache_path:
+                    write_file_atomic(cache_path, bytecode)
+                yield path, bytecode
+
+    def _create_manifest(
+        self, paths: List[Tuple[str, str]], py_paths: List[Tuple[str, str]], compile_py: bool
+    ) -> Dict[str, Any]:
+        files = {}
+        for path, arcname in paths + ([] if compile_py else py_paths):
+            files[arcname] = get_file_digest(path)
+        if compile_py:
+            for path, arcname in py_paths:
+                files[get_pyc_arcname(arcname)] = get_file_digest(path)
+
+        return {
+            "python": sys.implementation.cache_tag,
+            "compile_py": compile_py,
+            "files": dict(sorted(files.items())),
+        }
+
+    def _load_manifest(self, manifest_path: str) -> Dict[str, Any]:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _packing_files(
+        self,
+        paths: List[Tuple[str, str]],
+        py_paths: List[Tuple[str, str]],
+        output_path: str,
+        compile_py: bool = True,
+        jobs: Optional[int] = None,
+        previous_manifest: Optional[str] = None,
+        use_cache: bool = True,
+        codec: str = "gz",
+        level: Optional[int] = None,
+        threads: int = 1,
+        pyz_entry: Optional[Tuple[str, str, str]] = None,
+    ) -> None:
+        """pyz_entry: (project name, entry module, entry command) to pack zipapp"""
+        paths = sorted(paths, key=lambda p: p[1])
+        py_paths = sorted(py_paths, key=lambda p: p[1])
+        if len(paths) + len(py_paths) == 0:
             print("Warning: no file had been packed to {}".format(output_path))
+            return
+
+        manifest = self._create_manifest(paths, py_paths, compile_py)
+        files: Dict[str, Dict[str, Any]] = manifest["files"]
+
+        # files with the same digest in previous manifest are skipped in delta mode
+        unchanged: Dict[str, Dict[str, Any]] = {}
+        if previous_manifest:
+            previous = self._load_manifest(previous_manifest)
+            if previous.get("python") == manifest["python"] and previous.get("compile_py") == compile_py:
+                previous_files = previous.get("files", {})
+                unchanged = {
+                    k: v
+                    for k, v in previous_files.items()
+                    if k in files and v["sha256"] == files[k]["sha256"] and v["size"] == files[k]["size"]
+                }
+                manifest["removed"] = sorted(set(previous_files) - set(files))
+            manifest["base"] = os.path.basename(previous_manifest)
+            print("delta packing {} changed files since {}".format(len(files) - len(unchanged), previous_manifest))
+
+        for arcname, entry in unchanged.items():
+            files[arcname] = entry
+
+        paths = [p for p in paths if p[1] not in unchanged]
+        if compile_py:
+            py_paths = [p for p in py_paths if get_pyc_arcname(p[1]) not in unchanged]
+        else:
+            py_paths = [p for p in py_paths if p[1] not in unchanged]
+
+        cache_dir = None
+        if use_cache:
+            cache_dir = join_path(os.path.dirname(os.path.abspath(output_path)), *self.bytecode_cache_folder)
+
+        with open_archive_writer(output_path, codec, level, threads, pyz=pyz_entry is not None) as writer:
+            for path in paths:
+                print("packing file: {}".format(path[0]))
+                writer.add_file(path[0], path[1])
+
+            if compile_py:
+                py_entries = [(p[0], p[1], files[get_pyc_arcname(p[1])]["sha256"]) for p in py_paths]
+                for (path, arcname, _), bytecode in self._compile_py_files(py_entries, jobs, cache_dir):
+                    print("packing compiled python file: {}".format(path))
+                    arcname = get_pyc_arcname(arcname)
+                    files[arcname]["bytecode_sha256"] = hashlib.sha256(bytecode).hexdigest()
+                    writer.add_bytes(arcname, bytecode, mode=files[arcname]["mode"])
+            else:
+                for path in py_paths:
+                    print("packing py file: {}".format(path[0]))
+                    writer.add_file(path[0], path[1])
+
+            if pyz_entry:
+                from .zipapp import Pyz_Info_File, Pyz_Main_File, Pyz_Main_Source, create_pyz_info, get_directories
+
+                # zipimport finds the namespace packages, such as the project folder, by the directory entries
+                for directory in get_directories(files):
+                    writer.add_directory(directory)
+                pyz_info = create_pyz_info(*pyz_entry, files=files)
+                writer.add_bytes(Pyz_Main_File, Pyz_Main_Source.encode("utf-8"))
+                writer.add_bytes(Pyz_Info_File, json.dumps(pyz_info, indent=2).encode("utf-8"))
+
+        write_file_atomic(
+            output_path + self.manifest_suffix, json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8")
+        )
 
     def __remove_dir(self, dir: str) -> None:
         from shutil import rmtree
@@ -188,21 +453,270 @@ class HyssopPack(object):
         except Exception:
             pass
 
-    def __get_compiled_py_bytecode(self, path: str) -> ByteString:
-        from importlib import _bootstrap_external, machinery
-        import sys
-
-        print("compiling and packing python file: {}".format(path))
-        loader = machinery.SourceFileLoader("<hyssop_compiled>", path)
-        source_bytes = loader.get_data(path)
-        code = compile(source_bytes, path, "exec", dont_inherit=True)
-        source_stats = loader.path_stats(path)
-        if sys.version_info.minor < 7:
-            bytecode = _bootstrap_external._code_to_bytecode(  # type: ignore
-                code, source_stats["mtime"], source_stats["size"]
-            )
-        else:
-            bytecode = _bootstrap_external._code_to_timestamp_pyc(  # type: ignore
-                code, source_stats["mtime"], source_stats["size"]
-            )
-        return bytecode
+
+def get_pyc_arcname(arcname: str) -> str:
+    return arcname[:-3] + ".pyc"
+
+
+def get_source_date_epoch() -> int:
+    """return the SOURCE_DATE_EPOCH environment variable as archive mtime, default is 1980-01-01 for zip"""
+    return max(int(os.environ.get("SOURCE_DATE_EPOCH", Zip_Min_Epoch)), Zip_Min_Epoch)
+
+
+def get_file_digest(path: str) -> Dict[str, Any]:
+    """return sha256, size and normalized mode of file"""
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha256.update(chunk)
+    mode = 0o755 if os.stat(path).st_mode & 0o111 else 0o644
+    return {"sha256": sha256.hexdigest(), "size": os.path.getsize(path), "mode": mode}
+
+
+def get_bytecode_cache_path(cache_dir: str, arcname: str, source_sha256: str) -> str:
+    """bytecode cache is keyed by python version, arcname and source content"""
+    key = "{}:{}:{}".format(sys.implementation.cache_tag, arcname, source_sha256)
+    return join_path(cache_dir, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".pyc")
+
+
+def get_wheel_platform_tag() -> str:
+    """return the platform and python tag of wheels built by current interpreter"""
+    import sysconfig
+
+    tag = "{}-{}".format(sysconfig.get_platform(), sys.implementation.cache_tag)
+    return tag.replace(".", "_").replace(" ", "_")
+
+
+def copy_file(source: str, dest: str) -> None:
+    """hard link source to dest if possible, otherwise copy"""
+    from shutil import copyfile
+
+    if os.path.exists(dest):
+        os.remove(dest)
+    try:
+        os.link(source, dest)
+    except OSError:
+        copyfile(source, dest)
+
+
+def write_file_atomic(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = "{}.{}".format(path, os.getpid())
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _gzip_compress(data: bytes, level: int, mtime: int) -> bytes:
+    import gzip
+
+    buffer = BytesIO()
+    with gzip.GzipFile(filename="", mode="wb", fileobj=buffer, compresslevel=level, mtime=mtime) as f:
+        f.write(data)
+    return buffer.getvalue()
+
+
+def _xz_compress(data: bytes, level: int) -> bytes:
+    import lzma
+
+    return lzma.compress(data, preset=level)
+
+
+class ParallelBlockWriter(object):
+    """
+    file-like writer compresses the written data in independent blocks with threads and writes the compressed
+    blocks in order. zlib and lzma release GIL while compressing, and the concatenated gzip members or xz streams
+    are a standard stream decompressed by gzip, xz and tarfile.
+    """
+
+    def __init__(self, fileobj, compress: Callable[[bytes], bytes], threads: int, block_size: int = 1 << 22):
+        from collections import deque
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.fileobj = fileobj
+        self.compress = compress
+        self.block_size = block_size
+        self.max_pending = threads * 2
+        self.executor = ThreadPoolExecutor(max_workers=threads)
+        self.pending: Deque[Future] = deque()
+        self.buffer = bytearray()
+        self.position = 0
+        self.blocks = 0
+
+    def write(self, data: bytes) -> int:
+        self.buffer += data
+        self.position += len(data)
+        while len(self.buffer) >= self.block_size:
+            block = bytes(self.buffer[: self.block_size])
+            del self.buffer[: self.block_size]
+            self._submit(block)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def _submit(self, block: bytes) -> None:
+        self.blocks += 1
+        self.pending.append(self.executor.submit(self.compress, block))
+        while len(self.pending) > self.max_pending:
+            self.fileobj.write(self.pending.popleft().result())
+
+    def close(self) -> None:
+        if self.buffer or self.blocks == 0:
+            self._submit(bytes(self.buffer))
+            self.buffer.clear()
+        while self.pending:
+            self.fileobj.write(self.pending.popleft().result())
+        self.executor.shutdown()
+
+
+def open_compress_stream(fileobj, codec: str, level: Optional[int] = None, threads: int = 1, mtime: int = 0):
+    """open writable compression stream of codec on fileobj, the returned stream does not close fileobj"""
+    if codec == Pack_Codec_None:
+        return None
+    elif codec == Pack_Codec_Gzip:
+        import gzip
+
+        level = 9 if level is None else level
+        if threads > 1:
+            return ParallelBlockWriter(fileobj, partial(_gzip_compress, level=level, mtime=mtime), threads)
+        return gzip.GzipFile(filename="", mode="wb", fileobj=fileobj, compresslevel=level, mtime=mtime)
+    elif codec == Pack_Codec_Xz:
+        import lzma
+
+        level = 6 if level is None else level
+        if threads > 1:
+            return ParallelBlockWriter(fileobj, partial(_xz_compress, level=level), threads)
+        return lzma.LZMAFile(fileobj, mode="wb", preset=level)
+    elif codec == Pack_Codec_Zstd:
+        import zstandard
+
+        level = 3 if level is None else level
+        compressor = zstandard.ZstdCompressor(level=level, threads=threads if threads > 1 else 0)
+        return compressor.stream_writer(fileobj, closefd=False)
+    else:
+        raise ValueError("unsupported pack codec: {}".format(codec))
+
+
+class _TarArchiveWriter(object):
+    """write reproducible tar with fixed mtimes and owners"""
+
+    def __init__(self, output_path: str, codec: str = Pack_Codec_Gzip, level: Optional[int] = None, threads: int = 1):
+        import tarfile
+
+        self.mtime = get_source_date_epoch()
+        self.raw = open(output_path, "wb")
+        self.stream = open_compress_stream(self.raw, codec, level, threads, self.mtime)
+        self.tarf = tarfile.open(fileobj=self.stream or self.raw, mode="w", format=tarfile.PAX_FORMAT)
+
+    def _create_info(self, arcname: str, size: int, mode: int):
+        import tarfile
+
+        info = tarfile.TarInfo(name=arcname)
+        info.size = size
+        info.mtime = self.mtime
+        info.mode = mode
+        return info
+
+    def add_file(self, path: str, arcname: str) -> None:
+        mode = 0o755 if os.stat(path).st_mode & 0o111 else 0o644
+        with open(path, "rb") as f:
+            self.tarf.addfile(self._create_info(arcname, os.path.getsize(path), mode), f)
+
+    def add_bytes(self, arcname: str, data: bytes, mode: int = 0o644) -> None:
+        self.tarf.addfile(self._create_info(arcname, len(data), mode), BytesIO(data))
+
+    def close(self) -> None:
+        self.tarf.close()
+        if self.stream is not None:
+            self.stream.close()
+        self.raw.close()
+
+
+class _ZipArchiveWriter(object):
+    """write reproducible zip with fixed date time"""
+
+    def __init__(
+        self, output_path: str, codec: str = Pack_Codec_None, level: Optional[int] = None, prefix: bytes = b""
+    ):
+        import time
+        import zipfile
+
+        compressions = {
+            Pack_Codec_None: zipfile.ZIP_STORED,
+            Pack_Codec_Gzip: zipfile.ZIP_DEFLATED,
+            Pack_Codec_Xz: zipfile.ZIP_LZMA,
+        }
+        if codec not in compressions:
+            raise ValueError("unsupported zip codec: {}".format(codec))
+
+        self.date_time = time.gmtime(get_source_date_epoch())[:6]
+        self.raw = open(output_path, "wb")
+        self.raw.write(prefix)
+        self.zf = zipfile.ZipFile(self.raw, mode="w", compression=compressions[codec], compresslevel=level)
+
+    def _create_info(self, arcname: str, size: int, mode: int):
+        import zipfile
+
+        info = zipfile.ZipInfo(arcname, date_time=self.date_time)
+        info.file_size = size
+        info.external_attr = (0o100000 | mode) << 16
+        info.compress_type = self.zf.compression
+        return info
+
+    def add_file(self, path: str, arcname: str) -> None:
+        from shutil import copyfileobj
+
+        mode = 0o755 if os.stat(path).st_mode & 0o111 else 0o644
+        with open(path, "rb") as f, self.zf.open(self._create_info(arcname, os.path.getsize(path), mode), "w") as dst:
+            copyfileobj(f, dst)
+
+    def add_bytes(self, arcname: str, data: bytes, mode: int = 0o644) -> None:
+        self.zf.writestr(self._create_info(arcname, len(data), mode), data)
+
+    def add_directory(self, arcname: str) -> None:
+        import zipfile
+
+        info = zipfile.ZipInfo(arcname.rstrip("/") + "/", date_time=self.date_time)
+        info.external_attr = (0o040755 << 16) | 0x10
+        self.zf.writestr(info, b"")
+
+    def close(self) -> None:
+        self.zf.close()
+        self.raw.close()
+
+
+@contextmanager
+def open_archive_writer(
+    output_path: str, codec: str = Pack_Codec_Gzip, level: Optional[int] = None, threads: int = 1, pyz: bool = False
+):
+    """open .zip writer for windows os and tar writer for the others, or zipapp writer if pyz is True"""
+    if pyz:
+        from .zipapp import Pyz_Shebang
+
+        writer = _ZipArchiveWriter(output_path, codec, level, prefix=Pyz_Shebang)
+    elif sys.platform == "win32":
+        writer = _ZipArchiveWriter(output_path, codec, level)
+    else:
+        writer = _TarArchiveWriter(output_path, codec, level, threads)
+    try:
+        yield writer
+    finally:
+        writer.close()
+    if pyz:
+        os.chmod(output_path, os.stat(output_path).st_mode | 0o111)
+
+
+def get_compiled_py_bytecode(path: str, arcname: Optional[str] = None) -> bytes:
+    """
+    compile .py file to unchecked hash-based .pyc bytecode, so the output does not depend on the source mtime.
+    The arcname is used as the code file name to avoid leaking build paths.
+    It is module-level function to be called in process pool.
+    """
+    from importlib import _bootstrap_external, util
+
+    with open(path, "rb") as f:
+        source_bytes = f.read()
+    code = compile(source_bytes, arcname or path, "exec", dont_inherit=True)
+    bytecode = _bootstrap_external._code_to_hash_pyc(code, util.source_hash(source_bytes), checked=False)  # type: ignore
+    return bytes(bytecode)
@@ -0,0 +1,168 @@
+# Copyright (C) 2020-Present the hyssop authors and contributors.
+#
+# This module is part of hyssop and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+File created: October 19th 2026
+
+Modified By: hsky77
+Last Updated: October 19th 2026 23:41:08 pm
+
+Helpers of HyssopPack to pack project to a zipapp (.pyz).
+
+The modules of the project and the dependencies are imported from the zipapp by zipimport as precompiled .pyc.
+The other files of the project, such as project_config.yml and static files, are extracted to
+~/.cache/hyssop/pyz/<project>-<hash> (or HYSSOP_PYZ_ROOT) at the first run, since the project runs from a folder.
+
+The vendored packages with data files or extension modules cannot run from zip, e.g. hyssop reads its localization
+csv files by the path of __file__ and pydantic_core has a native module. These packages are extracted to the "site"
+folder of the same directory, which is inserted before the zipapp in sys.path. The zipapp vendors platform wheels
+runs only on the platform and Python version of the packing machine.
+"""
+
+import hashlib
+import json
+import os
+import zipfile
+from shutil import copyfileobj
+from typing import Any, Dict, Iterable, List, Tuple
+
+Pyz_Info_File = "_hyssop_pyz.json"
+Pyz_Main_File = "__main__.py"
+Pyz_Site_Folder = "site"
+Pyz_Shebang = b"#!/usr/bin/env python3\n"
+
+Pyz_Main_Source = """\
+# generated by hyssop pack --format pyz
+import json
+import os
+import runpy
+import shutil
+import sys
+import zipfile
+
+
+def extract(archive, info):
+    root = os.environ.get("HYSSOP_PYZ_ROOT") or os.path.join(os.path.expanduser("~"), ".cache", "hyssop", "pyz")
+    target = os.path.join(root, "{}-{}".format(info["name"], info["hash"]))
+    if not os.path.isdir(target):
+        tmp = "{}.{}".format(target, os.getpid())
+        os.makedirs(os.path.join(tmp, info["name"]))
+        with zipfile.ZipFile(archive) as zf:
+            for name in info["extract"]:
+                zf.extract(name, tmp)
+            for name in info["site"]:
+                zf.extract(name, os.path.join(tmp, "{site_folder}"))
+        try:
+            os.replace(tmp, target)
+        except OSError:
+            # extracted by another process
+            shutil.rmtree(tmp, ignore_errors=True)
+    return target
+
+
+def main():
+    archive = os.path.dirname(os.path.abspath(__file__))
+    with zipfile.ZipFile(archive) as zf:
+        info = json.loads(zf.read("{info_file}").decode("utf-8"))
+
+    # the modules are imported from archive in sys.path, target has the other files of project and the vendored
+    # packages cannot be imported from zip
+    target = extract(archive, info)
+    if info["site"]:
+        sys.path.insert(0, os.path.join(target, "{site_folder}"))
+
+    args = sys.argv[1:] or [info["command"]]
+    if args[0] in info["project_commands"]:
+        args.insert(1, os.path.join(target, info["name"]))
+    sys.argv = [sys.argv[0]] + args
+    runpy.run_module(info["entry"], run_name="__main__", alter_sys=True)
+
+
+main()
+""".replace("{info_file}", Pyz_Info_File).replace("{site_folder}", Pyz_Site_Folder)
+
+
+def extract_wheels(wheel_paths: Iterable[str], dest: str) -> List[Tuple[str, str]]:
+    """
+    extract the importable files of wheels to dest and return [(path, arcname)],
+    the files of .data/purelib and .data/platlib are moved to root, the other .data files are skipped.
+    """
+    paths = []
+    for wheel_path in wheel_paths:
+        with zipfile.ZipFile(wheel_path) as zf:
+            for name in zf.namelist():
+                if name.endswith("/"):
+                    continue
+
+                arcname = name
+                parts = name.split("/")
+                if parts[0].endswith(".data"):
+                    if len(parts) < 3 or parts[1] not in ("purelib", "platlib"):
+                        continue
+                    arcname = "/".join(parts[2:])
+
+                path = os.path.join(dest, *arcname.split("/"))
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with zf.open(name) as src, open(path, "wb") as dst:
+                    copyfileobj(src, dst)
+                paths.append((path, arcname))
+    return paths
+
+
+def get_directories(arcnames: Iterable[str]) -> List[str]:
+    """return the parent directories of arcnames"""
+    directories = set()
+    for arcname in arcnames:
+        parts = arcname.split("/")[:-1]
+        for i in range(1, len(parts) + 1):
+            directories.add("/".join(parts[:i]))
+    return sorted(directories)
+
+
+def is_module_file(arcname: str) -> bool:
+    """return True if arcname is python module or the files not required at runtime, type stubs and py.typed"""
+    return arcname.endswith((".py", ".pyc", ".pyi")) or arcname.split("/")[-1] == "py.typed"
+
+
+def get_extract_files(name: str, arcnames: Iterable[str]) -> List[str]:
+    """return the files should be extracted from zipapp, which are the files of project other than python modules."""
+    prefix = name + "/"
+    return sorted(arcname for arcname in arcnames if arcname.startswith(prefix) and not is_module_file(arcname))
+
+
+def get_site_files(name: str, arcnames: Iterable[str]) -> List[str]:
+    """
+    return the files of the vendored top level packages and modules should be extracted to site folder,
+    which are the ones have the files other than python modules, such as data files and extension modules.
+    The .dist-info folders are not extracted.
+    """
+    tops: Dict[str, List[str]] = {}
+    for arcname in arcnames:
+        top = arcname.split("/")[0]
+        if top != name and not top.endswith(".dist-info") and arcname not in (Pyz_Main_File, Pyz_Info_File):
+            tops.setdefault(top, []).append(arcname)
+    return sorted(arcname for files in tops.values() if not all(is_module_file(f) for f in files) for arcname in files)
+
+
+def create_pyz_info(
+    name: str, entry_module: str, entry_command: str, files: Dict[str, Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    create the information of zipapp from the manifest files,
+    the hash is the digest of extracted files to decide whether to extract again.
+    """
+    extract = get_extract_files(name, files)
+    site = get_site_files(name, files)
+    extract_files = {k: files[k] for k in extract + site}
+    digest = hashlib.sha256(json.dumps(extract_files, sort_keys=True).encode("utf-8")).hexdigest()
+    return {
+        "name": name,
+        "hash": digest[:16],
+        "extract": extract,
+        "site": site,
+        "entry": entry_module,
+        "command": entry_command,
+        "project_commands": ["start", "test"],
+    }
@@ -42,6 +42,10 @@ Usage:
         3. In the commond prompt, run command "python -m hyssop test <server_directory>"
             to test all the extend test cases defined in "__init__.py"
 
+    - benchmark cases inherit "hyssop.unit_test.base.IBenchmarkCase" and override bench(), they are defined in
+        the class inherits "hyssop.unit_test.BenchmarkTypes" in the same "__init__.py",
+        run command "python -m hyssop bench <server_directory> --baseline baseline.json" to compare with baseline
+
 Modified By: hsky77
 Last Updated: April 4th 2025 17:15:07 pm
 """
@@ -49,14 +53,28 @@ Last Updated: April 4th 2025 17:15:07 pm
 from typing import Optional
 from unittest import TestSuite
 
-from .base import UnitTestTypes
+from .base import BenchmarkTypes, UnitTestTypes
+from .bench_utils import BenchmarkLocalization, BenchmarkPathPatterns
+from .ut_localization import TestCaseLocalization
+from .ut_logger import TestCaseLogger
+from .ut_pack import TestCasePack
 from .ut_project import TestCaseComponent
+from .ut_runner import TestCaseRunner
 from .ut_worker import TestCaseWorker
 
 
 class DefaultUnitTestTypes(UnitTestTypes):
     TestComponent = TestCaseComponent
     TestWorker = TestCaseWorker
+    TestLogger = TestCaseLogger
+    TestLocalization = TestCaseLocalization
+    TestPack = TestCasePack
+    TestRunner = TestCaseRunner
+
+
+class DefaultBenchmarkTypes(BenchmarkTypes):
+    BenchLocalization = BenchmarkLocalization
+    BenchPathPatterns = BenchmarkPathPatterns
 
 
 def get_test_suite(unittest_module_path: Optional[str] = __package__) -> TestSuite:
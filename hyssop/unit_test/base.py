@@ -11,6 +11,7 @@ Last Updated: April 4th 2025 16:57:35 pm
 """
 
 from abc import ABC, abstractmethod
+from typing import Optional
 from unittest import TestCase
 
 from hyssop.utils.dynamic_class_types import DynamicClassesTypes
@@ -28,3 +29,29 @@ class IUnitTestCase(ABC, TestCase):
 
 class UnitTestTypes(DynamicClassesTypes[IUnitTestCase]):
     """Base unit test types."""
+
+
+class IBenchmarkCase(ABC):
+    """
+    hyssop benchmark case interface, bench() could be a coroutine function.
+    Each repetition calls bench() "number" times after "warmup" calls, the result is the time per call.
+    """
+
+    warmup: int = 1
+    repeat: int = 5
+    number: int = 1
+    threshold: Optional[float] = None  # regression threshold ratio overrides the runner threshold
+
+    def setUp(self) -> None:
+        pass
+
+    def tearDown(self) -> None:
+        pass
+
+    @abstractmethod
+    def bench(self):
+        pass
+
+
+class BenchmarkTypes(DynamicClassesTypes[IBenchmarkCase]):
+    """Base benchmark types."""
@@ -0,0 +1,41 @@
+# Copyright (C) 2020-Present the hyssop authors and contributors.
+#
+# This module is part of hyssop and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+File created: October 19th 2026
+
+Modified By: hsky77
+Last Updated: October 19th 2026 14:02:44 pm
+"""
+
+from .base import IBenchmarkCase
+
+
+class BenchmarkLocalization(IBenchmarkCase):
+    number = 10000
+
+    def setUp(self):
+        from hyssop.utils import BaseLocal
+        from hyssop.utils.constants import LocalCode_Message_Format_Invalid
+
+        self.local = BaseLocal
+        self.code = LocalCode_Message_Format_Invalid
+
+    def bench(self):
+        self.local.get_message(self.code, 0, "args")
+
+
+class BenchmarkPathPatterns(IBenchmarkCase):
+    number = 1000
+
+    def setUp(self):
+        from hyssop.utils.func import compile_path_patterns
+
+        self.is_excluded = compile_path_patterns(["__pycache__", ".log", "node_modules", "*.tmp", "data/raw"])
+        self.paths = ["/project/component/module_{}.py".format(i) for i in range(10)]
+
+    def bench(self):
+        for path in self.paths:
+            self.is_excluded(path)
@@ -0,0 +1,165 @@
+# Copyright (C) 2020-Present the hyssop authors and contributors.
+#
+# This module is part of hyssop and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+File created: October 19th 2026
+
+Modified By: hsky77
+Last Updated: October 19th 2026 13:52:16 pm
+
+Benchmark runner of "hyssop bench".
+
+The benchmark cases of BenchmarkTypes are run with warmup and repetitions, the results are written to json file
+and compared with the results of baseline json file. A benchmark regresses if its median time per call exceeds
+the baseline median by more than the threshold ratio.
+"""
+
+import asyncio
+import json
+import platform
+import statistics
+import sys
+from inspect import iscoroutinefunction
+from time import perf_counter
+from typing import Any, Dict, List, Optional, TextIO, Type
+
+from .base import BenchmarkTypes, IBenchmarkCase
+
+
+def get_benchmark_cases(module_path: str) -> Dict[str, Type[IBenchmarkCase]]:
+    """return {"<module>.<class>": benchmark case class} of BenchmarkTypes in module"""
+    cases = {}
+    for t in BenchmarkTypes.get_dynamic_classes_types(module_path):
+        for _, case_cls in t.get_dynamic_classes():
+            cases["{}.{}".format(case_cls.__module__, case_cls.__qualname__)] = case_cls
+    return cases
+
+
+def run_benchmark_case(
+    case_cls: Type[IBenchmarkCase], warmup: Optional[int] = None, repeat: Optional[int] = None
+) -> Dict[str, Any]:
+    """run benchmark case and return the statistics of seconds per call"""
+    case = case_cls()
+    warmup = case.warmup if warmup is None else warmup
+    repeat = case.repeat if repeat is None else repeat
+    number = max(case.number, 1)
+
+    loop = asyncio.new_event_loop() if iscoroutinefunction(case.bench) else None
+
+    def bench():
+        if loop is None:
+            case.bench()
+        else:
+            loop.run_until_complete(case.bench())
+
+    case.setUp()
+    try:
+        for _ in range(warmup):
+            bench()
+
+        times = []
+        for _ in range(max(repeat, 1)):
+            start = perf_counter()
+            for _ in range(number):
+                bench()
+            times.append((perf_counter() - start) / number)
+    finally:
+        case.tearDown()
+        if loop is not None:
+            loop.close()
+
+    return {
+        "min": min(times),
+        "max": max(times),
+        "mean": statistics.mean(times),
+        "median": statistics.median(times),
+        "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "repeat": len(times),
+        "number": number,
+    }
+
+
+def format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return "{:.3f}{}".format(seconds / scale, unit)
+    return "{:.1f}ns".format(seconds / 1e-9)
+
+
+class BenchmarkRunner:
+    """run benchmark cases, write json results and compare with baseline"""
+
+    def __init__(
+        self,
+        warmup: Optional[int] = None,
+        repeat: Optional[int] = None,
+        threshold: float = 0.1,
+        stream: TextIO = sys.stderr,
+    ):
+        self.warmup = warmup
+        self.repeat = repeat
+        self.threshold = threshold
+        self.stream = stream
+
+    def run(self, cases: Dict[str, Type[IBenchmarkCase]]) -> Dict[str, Any]:
+        benchmarks = {}
+        for bench_id, case_cls in cases.items():
+            benchmarks[bench_id] = run_benchmark_case(case_cls, self.warmup, self.repeat)
+            self.stream.write(
+                "{:>12} +- {:<10} {}\n".format(
+                    format_seconds(benchmarks[bench_id]["median"]),
+                    format_seconds(benchmarks[bench_id]["stdev"]),
+                    bench_id,
+                )
+            )
+        self.stream.flush()
+        return {
+            "python": platform.python_version(),
+            "implementation": sys.implementation.cache_tag,
+            "platform": platform.platform(),
+            "benchmarks": benchmarks,
+        }
+
+    def compare(
+        self, results: Dict[str, Any], baseline: Dict[str, Any], cases: Dict[str, Type[IBenchmarkCase]]
+    ) -> List[str]:
+        """return the ids of regressed benchmarks"""
+        regressions = []
+        baseline_benchmarks = baseline.get("benchmarks", {})
+        for bench_id, result in results["benchmarks"].items():
+            if bench_id not in baseline_benchmarks:
+                continue
+
+            case_cls = cases.get(bench_id)
+            threshold = self.threshold
+            if case_cls is not None and case_cls.threshold is not None:
+                threshold = case_cls.threshold
+
+            base = baseline_benchmarks[bench_id]["median"]
+            ratio = result["median"] / base if base > 0 else 1.0
+            regressed = ratio > 1 + threshold
+            if regressed:
+                regressions.append(bench_id)
+            self.stream.write(
+                "{:>8} {:>7.2f}x {} -> {} {}\n".format(
+                    "REGRESS" if regressed else "ok",
+                    ratio,
+                    format_seconds(base),
+                    format_seconds(result["median"]),
+                    bench_id,
+                )
+            )
+        self.stream.flush()
+        return regressions
+
+
+def load_benchmark_results(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_benchmark_results(path: str, results: Dict[str, Any]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
@@ -0,0 +1,166 @@
+# Copyright (C) 2020-Present the hyssop authors and contributors.
+#
+# This module is part of hyssop and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+File created: October 19th 2026
+
+Modified By: hsky77
+Last Updated: October 19th 2026 15:31:26 pm
+
+Parallel test runner of "hyssop test -j N".
+
+The test cases of UnitTestTypes are run in worker processes, each worker changes to the project working directory
+as HyssopProject does so the test cases create their own component managers.
+The durations of test cases are saved in the "__pycache__" folder of project, the slowest test cases
+of last run are scheduled first. The workers set the event loop policy of project config "event_loop".
+"""
+
+import json
+import os
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from importlib import import_module
+from time import perf_counter
+from typing import Dict, List, NamedTuple, Optional, TextIO
+from unittest import TestResult
+
+from hyssop.utils.event_loop import set_event_loop_policy
+from hyssop.utils.func import join_path
+
+from .base import UnitTestTypes
+
+Test_Durations_File = "hyssop_test_durations.json"
+
+Test_Status_Ok = "ok"
+Test_Status_Fail = "FAIL"
+Test_Status_Error = "ERROR"
+Test_Status_Skip = "skip"
+
+
+class TestCaseResult(NamedTuple):
+    test_id: str
+    status: str
+    duration: float
+    output: str = ""
+
+
+def get_test_case_ids(unittest_module_path: str) -> List[str]:
+    """return the ids "<module>.<class>" of test cases of UnitTestTypes in unittest module"""
+    test_ids = []
+    for t in UnitTestTypes.get_dynamic_classes_types(unittest_module_path):
+        for _, test_cls in t.get_dynamic_classes():
+            test_ids.append("{}.{}".format(test_cls.__module__, test_cls.__qualname__))
+    return test_ids
+
+
+def init_test_worker(project_dir: str, event_loop: Optional[str] = None) -> None:
+    """change to the working directory of project and set the event loop policy as HyssopProject does"""
+    working_dir = os.path.dirname(project_dir)
+    os.chdir(working_dir)
+    if working_dir not in sys.path:
+        sys.path.insert(0, working_dir)
+    set_event_loop_policy(event_loop)
+
+
+def run_test_case(test_id: str) -> TestCaseResult:
+    """run "test" method of test case in current process"""
+    start = perf_counter()
+    try:
+        module, name = test_id.rsplit(".", 1)
+        test_cls = getattr(import_module(module), name)
+        result = TestResult()
+        test_cls("test").run(result)
+    except Exception:
+        return TestCaseResult(test_id, Test_Status_Error, perf_counter() - start, traceback.format_exc())
+
+    duration = perf_counter() - start
+    if result.errors:
+        return TestCaseResult(test_id, Test_Status_Error, duration, result.errors[0][1])
+    if result.failures:
+        return TestCaseResult(test_id, Test_Status_Fail, duration, result.failures[0][1])
+    if result.skipped:
+        return TestCaseResult(test_id, Test_Status_Skip, duration, result.skipped[0][1])
+    return TestCaseResult(test_id, Test_Status_Ok, duration)
+
+
+class ParallelTestRunner:
+    """run test cases in process pool and report the merged results with durations"""
+
+    def __init__(
+        self,
+        project_dir: str,
+        jobs: Optional[int] = None,
+        stream: TextIO = sys.stderr,
+        event_loop: Optional[str] = None,
+    ):
+        self.project_dir = project_dir
+        self.jobs = jobs or os.cpu_count() or 1
+        self.event_loop = event_loop
+        self.stream = stream
+        self.durations_path = join_path(project_dir, "__pycache__", Test_Durations_File)
+
+    def load_durations(self) -> Dict[str, float]:
+        try:
+            with open(self.durations_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_durations(self, results: List[TestCaseResult]) -> None:
+        durations = self.load_durations()
+        durations.update({r.test_id: round(r.duration, 6) for r in results})
+        try:
+            os.makedirs(os.path.dirname(self.durations_path), exist_ok=True)
+            with open(self.durations_path, "w", encoding="utf-8") as f:
+                json.dump(durations, f, indent=2, sort_keys=True)
+        except OSError:
+            pass
+
+    def schedule(self, test_ids: List[str]) -> List[str]:
+        """the test cases without duration record are scheduled first, then the slowest"""
+        durations = self.load_durations()
+        return sorted(test_ids, key=lambda t: durations.get(t, float("inf")), reverse=True)
+
+    def run(self, test_ids: List[str]) -> List[TestCaseResult]:
+        start = perf_counter()
+        results: List[TestCaseResult] = []
+        with ProcessPoolExecutor(
+            max_workers=min(self.jobs, max(len(test_ids), 1)),
+            initializer=init_test_worker,
+            initargs=(self.project_dir, self.event_loop),
+        ) as executor:
+            futures = {executor.submit(run_test_case, test_id): test_id for test_id in self.schedule(test_ids)}
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception:
+                    result = TestCaseResult(futures[future], Test_Status_Error, 0, traceback.format_exc())
+                results.append(result)
+                self.stream.write("." if result.status == Test_Status_Ok else result.status[0])
+                self.stream.flush()
+
+        self.save_durations(results)
+        self.report(results, perf_counter() - start)
+        return results
+
+    def report(self, results: List[TestCaseResult], elapsed: float) -> None:
+        self.stream.write("\n")
+        for result in results:
+            if result.status in (Test_Status_Fail, Test_Status_Error):
+                self.stream.write("=" * 70 + "\n")
+                self.stream.write("{}: {}\n".format(result.status, result.test_id))
+                self.stream.write("-" * 70 + "\n")
+                self.stream.write(result.output + "\n")
+
+        self.stream.write("-" * 70 + "\n")
+        self.stream.write("Durations:\n")
+        for result in sorted(results, key=lambda r: r.duration, reverse=True):
+            self.stream.write("  {:8.3f}s  {:5}  {}\n".format(result.duration, result.status, result.test_id))
+
+        failed = [r for r in results if r.status in (Test_Status_Fail, Test_Status_Error)]
+        self.stream.write("\nRan {} tests in {:.3f}s with {} workers\n\n".format(len(results), elapsed, self.jobs))
+        self.stream.write("FAILED (failures={})\n".format(len(failed)) if failed else "OK\n")
+        self.stream.flush()
@@ -0,0 +1,134 @@
+# Copyright (C) 2020-Present the hyssop authors and contributors.
+#
+# This module is part of hyssop and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+File created: October 19th 2026
+
+Modified By: hsky77
+Last Updated: October 19th 2026 12:03:41 pm
+"""
+
+import sys
+from os import path
+from shutil import rmtree
+from tempfile import mkdtemp
+
+from .base import IUnitTestCase
+
+CSV_CONTENT = """code,en,zh_TW
+0,"language: {}, code: {} does not exist","語言: {}, 代碼: {} 不存在"
+3,"message format error, code: {} args: {}","訊息格式錯誤, 代碼: {} 參數: {}"
+900,hello,你好
+901,"hello, {}","你好, {}"
+"""
+
+
+class TestCaseLocalization(IUnitTestCase):
+    def setUp(self):
+        self.csv_dir = mkdtemp()
+        self.csv_file = path.join(self.csv_dir, "local.csv")
+        with open(self.csv_file, "w", encoding="utf-8") as f:
+            f.write(CSV_CONTENT)
+
+    def tearDown(self):
+        rmtree(self.csv_dir, ignore_errors=True)
+
+    def test(self):
+        self.test_import_csv()
+        self.test_lazy_languages()
+        self.test_message_template()
+        self.test_duplicated_code()
+
+    def test_import_csv(self):
+        from hyssop.utils.localization import Localization
+
+        dont_write_bytecode = sys.dont_write_bytecode
+        sys.dont_write_bytecode = False
+        try:
+            local = Localization()
+            local.import_csv([self.csv_file])
+            local.import_csv([self.csv_file])
+        finally:
+            sys.dont_write_bytecode = dont_write_bytecode
+
+        self.assertEqual(local.get_info()["files_loaded"], [self.csv_file])
+        self.assertEqual(local.get_message(901, "hyssop"), "hello, hyssop")
+        local.set_language("zh_TW")
+        self.assertEqual(local.get_message(900), "你好")
+
+        for lang in ["en", "zh_TW"]:
+            self.assertTrue(path.isfile(local._get_catalog_cache_path(self.csv_file, lang)))
+
+        # load from cache
+        cached = Localization("zh_TW")
+        cached.import_csv([self.csv_file])
+        self.assertEqual(cached.get_message(901, "hyssop"), "你好, hyssop")
+
+        # cache is invalid after the file changed
+        with open(self.csv_file, "a", encoding="utf-8") as f:
+            f.write('902,"bye, {}","再見, {}"\n')
+        local.import_csv([self.csv_file])
+        self.assertEqual(local.get_message(902, "hyssop"), "再見, hyssop")
+        self.assertEqual(local.get_info()["files_loaded"], [self.csv_file])
+
+    def test_lazy_languages(self):
+        from hyssop.utils.localization import Localization
+
+        local = Localization()
+        local.import_csv([self.csv_file])
+        self.assertEqual(local.get_info()["loaded_languages"], [])
+        self.assertEqual(local.get_message(900), "hello")
+        self.assertEqual(local.get_info()["loaded_languages"], ["en"])
+        self.assertEqual(sorted(local.get_info()["languages"]), ["en", "zh_TW"])
+
+        local.set_language("zh_TW")
+        self.assertEqual(local.get_message(901, "hyssop"), "你好, hyssop")
+        self.assertEqual(local.get_message(901), "訊息格式錯誤, 代碼: 901 參數: ()")
+        self.assertEqual(local.get_message(999), "語言: zh_TW, 代碼: 999 不存在")
+
+        local.set_language("jp")
+        self.assertRaises(KeyError, local.get_message, 900)
+
+    def test_message_template(self):
+        from hyssop.utils.localization import compile_message_template
+
+        for template, args in [
+            ("no field {{escaped}}", ()),
+            ("{} and {}", (1, "a")),
+            ("{}{}", (1.5, None)),
+            ("100% {}", ((1, 2), "extra")),
+            ("{0} {0!r} {1:>4}", ("a", "b")),
+            ("{name}", ()),
+        ]:
+            compiled = compile_message_template(template)
+            try:
+                expected = template.format(*args)
+            except (IndexError, KeyError) as e:
+                self.assertRaises(type(e), compiled, *args)
+            else:
+                self.assertEqual(compiled(*args), expected)
+        self.assertRaises(IndexError, compile_message_template("{} {}"), 1)
+
+    def test_duplicated_code(self):
+        from hyssop.utils.localization import Localization
+
+        duplicated_file = path.join(self.csv_dir, "duplicated.csv")
+        with open(duplicated_file, "w", encoding="utf-8") as f:
+            f.write("code,zh_TW\n900,哈囉\n")
+        other_file = path.join(self.csv_dir, "other.csv")
+        with open(other_file, "w", encoding="utf-8") as f:
+            f.write("code,jp\n900,こんにちは\n")
+
+        for _ in range(2):  # parsed and cached catalogs
+            local = Localization()
+            local.import_csv([self.csv_file])
+            self.assertRaises(KeyError, local.import_csv, [duplicated_file], replace_duplicated_code=False)
+            self.assertEqual(local.get_info()["files_loaded"], [self.csv_file])
+
+        # the codes of the other languages are not duplicated
+        local.import_csv([other_file], replace_duplicated_code=False)
+        local.import_csv([duplicated_file])
+        local.set_language("zh_TW")
+        self.assertEqual(local.get_message(900), "哈囉")
@@ -0,0 +1,330 @@
+# Copyright (C) 2020-Present the hyssop authors and contributors.
+#
+# This module is part of hyssop and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+File created: October 19th 2026
+
+Modified By: hsky77
+Last Updated: October 19th 2026 23:05:12 pm
+"""
+
+import sys
+from asyncio import run
+from logging import DEBUG, ERROR, Handler, StreamHandler, makeLogRecord
+from os import listdir, path
+from shutil import rmtree
+from tempfile import mkdtemp
+from time import sleep, time
+
+from .base import IUnitTestCase
+
+
+class TestCaseLogger(IUnitTestCase):
+    def setUp(self):
+        self.log_dir = mkdtemp()
+
+    def tearDown(self):
+        rmtree(self.log_dir, ignore_errors=True)
+
+    def create_component_manager(self, **logger_config):
+        from hyssop import Module_Path
+        from hyssop.project import HyssopProject
+
+        config = {
+            "component": {
+                "logger": {"log_level": DEBUG, "log_to_file": True, "dir": self.log_dir, **logger_config},
+            },
+        }
+        return HyssopProject(Module_Path, config).create_component_manager()
+
+    def read_log(self, name: str) -> str:
+        with open(path.join(self.log_dir, name + ".log"), "r", encoding="utf-8") as f:
+            return f.read()
+
+    def test(self):
+        self.test_async_logging()
+        self.test_async_logging_drop()
+        self.test_async_logging_handle()
+        if sys.platform != "win32":
+            self.test_async_logging_fork()
+        self.test_queue_logging()
+        self.test_queue_logging_policy()
+        self.test_rotation()
+        self.test_rotation_slow_compression()
+        self.test_json_format()
+        self.test_json_format()  # the filters of the previous component manager are removed by dispose
+        self.test_queue_json_format()
+        self.test_filter_config()
+
+    def test_async_logging(self):
+        from hyssop.utils.logger import AsyncLogQueueHandler
+
+        component_manager = self.create_component_manager(
+            log_async=True, log_flush_interval=0.1, log_queue_size=10, log_queue_policy="block"
+        )
+        run(component_manager.start_components())
+        logger = component_manager.get_logger("ut_async")
+        component_manager.get_logger("ut_async")
+        self.assertEqual(len([h for h in logger.handlers if isinstance(h, AsyncLogQueueHandler)]), 1)
+
+        records = []
+        capture = Handler()
+        capture.emit = records.append  # type: ignore
+        logger.addHandler(capture)
+
+        args = ["mutable"]
+        logger.info("message %s", args)
+        args.append("changed")
+        for i in range(100):
+            logger.debug("record %d", i)
+        logger.removeHandler(capture)
+
+        # the records passed to the other handlers are not modified by async handler
+        self.assertEqual(records[0].msg, "message %s")
+        self.assertEqual(records[0].args, (args,))
+
+        run(component_manager.dispose_components())
+        content = self.read_log("ut_async")
+        self.assertIn("message ['mutable']", content)
+        self.assertIn("record 99", content)
+
+        metrics = component_manager.get_component("logger").info()["metrics"]
+        self.assertEqual(metrics["written"], 101)
+        self.assertEqual(metrics["dropped"], 0)
+
+        # the handlers are detached by dispose, logging does not block on the full queue of stopped listener
+        self.assertFalse([h for h in logger.handlers if isinstance(h, AsyncLogQueueHandler)])
+        for i in range(20):
+            logger.info("after dispose %d", i)
+        self.assertNotIn("after dispose", self.read_log("ut_async"))
+
+    def test_async_logging_drop(self):
+        from threading import Event
+        from hyssop.utils.logger import AsyncLogListener
+
+        # the listener thread is blocked by the first record, the second one fills the queue
+        release = Event()
+        handler = Handler()
+        handler.handle = lambda record: release.wait()  # type: ignore
+        listener = AsyncLogListener(queue_size=1, policy="drop")
+        listener.start()
+        record = makeLogRecord({"msg": "drop"})
+        listener.enqueue(handler, record)
+        while listener.pending_count > 0:
+            sleep(0.01)
+        listener.enqueue(handler, record)
+        listener.enqueue(handler, record)
+        self.assertEqual(listener.enqueued, 2)
+        self.assertEqual(listener.dropped, 1)
+        release.set()
+        listener.stop()
+        self.assertEqual(listener.written, 2)
+
+    def test_async_logging_handle(self):
+        from io import StringIO
+        from hyssop.utils.logger import AsyncLogListener
+
+        # the stdlib stream handlers are written by handle() which applies their filters
+        handled = []
+        handler = StreamHandler(StringIO())
+        handler.addFilter(lambda record: record.msg != "filtered")
+        handle = handler.handle
+        handler.handle = lambda record: handled.append(record.msg) or handle(record)  # type: ignore
+        listener = AsyncLogListener()
+        listener.start()
+        for msg in ("written", "filtered"):
+            listener.enqueue(handler, makeLogRecord({"msg": msg}))
+        listener.stop()
+        self.assertEqual(handled, ["written", "filtered"])
+        self.assertEqual(handler.stream.getvalue(), "written\n")
+        self.assertEqual(listener.written, 1)
+        self.assertEqual(listener.errors, 0)
+
+    def test_async_logging_fork(self):
+        from os import _exit, fork, waitpid
+
+        component_manager = self.create_component_manager(log_async=True, log_flush_interval=0.1)
+        logger = component_manager.get_logger("ut_fork")
+
+        # the records are written synchronously before the listener is started by start_components()
+        logger.info("before fork")
+        self.assertIn("before fork", self.read_log("ut_fork"))
+        self.assertFalse(component_manager.get_component("logger").log_listener.is_alive())
+
+        pid = fork()
+        if pid == 0:
+            code = 1
+            try:
+                run(component_manager.start_components())
+                logger.info("forked worker")
+                run(component_manager.dispose_components())
+                code = 0
+            finally:
+                _exit(code)
+
+        self.assertEqual(waitpid(pid, 0)[1], 0)
+        run(component_manager.dispose_components())
+        self.assertIn("forked worker", self.read_log("ut_fork"))
+
+    def test_queue_logging(self):
+        from hyssop.utils.logger import MultiProcessingQueueHandle
+
+        component_manager = self.create_component_manager(log_to_queue=True, log_batch_size=10)
+        run(component_manager.start_components())
+        logger = component_manager.get_logger("ut_queue")
+        component_manager.get_logger("ut_queue")
+        self.assertEqual(len([h for h in logger.handlers if isinstance(h, MultiProcessingQueueHandle)]), 1)
+
+        for i in range(25):
+            logger.info("record %d", i)
+        try:
+            raise ValueError("queue error")
+        except ValueError:
+            logger.exception("exception")
+
+        run(component_manager.dispose_components())
+        content = self.read_log("ut_queue")
+        self.assertIn("record 24", content)
+        self.assertIn("ValueError: queue error", content)
+        self.assertEqual(content.count("record"), 25)
+        self.assertFalse(component_manager.get_component("logger").message_process.is_alive())
+
+    def test_queue_logging_policy(self):
+        from multiprocessing import Queue
+        from threading import Timer
+        from hyssop.utils.logger import MultiProcessingQueueHandle
+
+        record = makeLogRecord({"msg": "policy", "levelno": ERROR})
+        drop_queue = Queue(1)
+        handler = MultiProcessingQueueHandle(drop_queue, policy="drop")
+        handler.emit(record)
+        handler.emit(record)
+        self.assertEqual(handler.dropped, 1)
+
+        block_queue = Queue(1)
+        handler = MultiProcessingQueueHandle(block_queue, policy="block")
+        handler.emit(record)
+        Timer(0.2, block_queue.get).start()
+        handler.emit(record)  # blocks until the first batch is consumed
+        self.assertEqual(handler.dropped, 0)
+        self.assertEqual(block_queue.get(timeout=1)[1][0][3], "policy")
+
+    def test_rotation(self):
+        import gzip
+
+        component_manager = self.create_component_manager(
+            log_rotation="size", log_max_bytes=1024, log_backup_count=2, log_compression="gz"
+        )
+        logger = component_manager.get_logger("ut_rotation")
+        for i in range(200):
+            logger.info("rotation record %d", i)
+
+        start_time = time()
+        while len([f for f in listdir(self.log_dir) if f.endswith(".gz")]) < 2:
+            self.assertGreaterEqual(3, time() - start_time)
+            sleep(0.01)
+
+        # the rotating handlers always append to the log files
+        with self.assertRaises(ValueError):
+            component_manager.get_component("logger").get_logger("ut_rotation_mode", mode="w")
+
+        run(component_manager.dispose_components())
+        self.assertIn("rotation record 199", self.read_log("ut_rotation"))
+        with gzip.open(path.join(self.log_dir, "ut_rotation.log.1.gz"), "rt") as f:
+            self.assertIn("rotation record", f.read())
+        self.assertFalse(path.exists(path.join(self.log_dir, "ut_rotation.log.3.gz")))
+        for h in list(logger.handlers):
+            h.close()
+            logger.removeHandler(h)
+
+    def test_rotation_slow_compression(self):
+        import gzip
+        from unittest.mock import patch
+        from hyssop.utils import logger as logger_module
+
+        compress_log_file = logger_module.compress_log_file
+
+        def slow_compress_log_file(*args):
+            sleep(0.05)
+            compress_log_file(*args)
+
+        log_file = path.join(self.log_dir, "ut_slow_rotation.log")
+        with patch.object(logger_module, "compress_log_file", slow_compress_log_file):
+            handler = logger_module.CompressingRotatingFileHandler(
+                log_file, maxBytes=100, backupCount=3, encoding="utf-8", compression="gz"
+            )
+            for i in range(50):
+                handler.emit(makeLogRecord({"msg": "slow rotation record %d" % i}))
+            handler.doRollover()
+            handler._compress_job.run()
+            handler.close()
+
+        # the kept backups are contiguous, no rotated file is overwritten before it is compressed
+        self.assertFalse([f for f in listdir(self.log_dir) if f.endswith(".pending")])
+        lines = []
+        for i in (3, 2, 1):
+            with gzip.open("{}.{}.gz".format(log_file, i), "rt", encoding="utf-8") as f:
+                lines.extend(f.read().splitlines())
+        numbers = [int(line.rsplit(" ", 1)[1]) for line in lines]
+        self.assertEqual(numbers, list(range(numbers[0], 50)))
+
+    def test_json_format(self):
+        import json
+        from hyssop.utils.logger import log_context
+
+        component_manager = self.create_component_manager(
+            log_format="json", log_rate_limits={"ut_json": 1000}, log_sampling={"ut_json": 0.5}
+        )
+        logger = component_manager.get_logger("ut_json")
+        with log_context(time(), component="logger", request_id="r1"):
+            for i in range(10):
+                component_manager.get_logger("ut_json").info("json record %d", i, extra={"index": i})
+        logger.warning("warning out of context")
+
+        records = [json.loads(line) for line in self.read_log("ut_json").splitlines()]
+        self.assertEqual(len(records), 6)
+        self.assertEqual(records[0]["component"], "logger")
+        self.assertEqual(records[0]["request_id"], "r1")
+        self.assertIn("elapsed_ms", records[0])
+        self.assertEqual(records[0]["index"], 0)
+        self.assertEqual(records[-1]["message"], "warning out of context")
+        self.assertNotIn("request_id", records[-1])
+
+        info = component_manager.get_component("logger").info()
+        self.assertEqual(info["metrics"]["suppressed"]["ut_json"], 5)
+        run(component_manager.dispose_components())
+        self.assertFalse(logger.filters)
+        for h in list(logger.handlers):
+            h.close()
+            logger.removeHandler(h)
+        rmtree(self.log_dir, ignore_errors=True)
+
+    def test_queue_json_format(self):
+        import json
+        from hyssop.utils.logger import log_context
+
+        component_manager = self.create_component_manager(log_to_queue=True, log_format="json")
+        run(component_manager.start_components())
+        logger = component_manager.get_logger("ut_queue_json")
+        with log_context(component="logger", request_id="r2"):
+            logger.info("queue json record", extra={"index": 1, "value": object()})
+        run(component_manager.dispose_components())
+
+        records = [json.loads(line) for line in self.read_log("ut_queue_json").splitlines()]
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["request_id"], "r2")
+        self.assertEqual(records[0]["index"], 1)
+        self.assertTrue(records[0]["value"].startswith("<object"))
+
+    def test_filter_config(self):
+        from pydantic import ValidationError
+
+        for config in (
+            {"log_sampling": {"ut_filter": 0}},
+            {"log_sampling": {"ut_filter": 1.5}},
+            {"log_rate_limits": {"ut_filter": 0}},
+        ):
+            with self.assertRaises(ValidationError):
+                self.create_component_manager(**config)
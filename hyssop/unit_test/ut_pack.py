@@ -0,0 +1,382 @@
+# Copyright (C) 2020-Present the hyssop authors and contributors.
+#
+# This module is part of hyssop and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+File created: October 19th 2026
+
+Modified By: hsky77
+Last Updated: October 19th 2026 23:41:08 pm
+"""
+
+import json
+import marshal
+import tarfile
+from os import listdir, makedirs, path, remove, utime
+from shutil import rmtree
+from tempfile import mkdtemp
+
+from .base import IUnitTestCase
+
+
+class TestCasePack(IUnitTestCase):
+    def setUp(self):
+        self.work_dir = mkdtemp()
+        self.project_dir = path.join(self.work_dir, "pack_project")
+        makedirs(path.join(self.project_dir, "component"))
+        for i in range(8):
+            with open(path.join(self.project_dir, "component", "m{}.py".format(i)), "w") as f:
+                f.write("VALUE = {}\n".format(i))
+        with open(path.join(self.project_dir, "project_config.yml"), "w") as f:
+            f.write("name: pack project\n")
+
+    def tearDown(self):
+        rmtree(self.work_dir, ignore_errors=True)
+
+    def pack(self, output_name: str, **kwargs) -> str:
+        from hyssop.project.pack import HyssopPack
+
+        output = path.join(self.work_dir, output_name)
+        HyssopPack().pack(self.project_dir, output, **kwargs)
+        return output
+
+    def read_tar(self, output: str):
+        with tarfile.open(output) as tarf:
+            return {m.name: tarf.extractfile(m).read() for m in tarf.getmembers() if m.isfile()}  # type: ignore
+
+    def test(self):
+        self.test_parallel_compile()
+        self.test_reproducible_pack()
+        self.test_delta_pack()
+        self.test_exclude_patterns()
+        self.test_codecs()
+        self.test_wheel_cache()
+        self.test_pyz()
+        self.test_pyz_vendored_dependencies()
+        self.test_pyz_site_files()
+        self.test_pack_hooks()
+
+    def test_parallel_compile(self):
+        serial = self.read_tar(self.pack("serial.tar.gz", jobs=1, use_cache=False))
+        parallel = self.read_tar(self.pack("parallel.tar.gz", jobs=2, use_cache=False))
+        self.assertEqual(list(serial), list(parallel))
+        self.assertEqual(serial, parallel)
+        self.assertIn("pack_project/project_config.yml", parallel)
+
+        namespace = {}
+        exec(marshal.loads(parallel["pack_project/component/m3.pyc"][16:]), namespace)
+        self.assertEqual(namespace["VALUE"], 3)
+
+    def read_manifest(self, output: str):
+        with open(output + ".manifest.json", "r") as f:
+            return json.load(f)
+
+    def test_reproducible_pack(self):
+        first = self.pack("first.tar.gz")
+        cache_dir = path.join(self.work_dir, "__pycache__", "hyssop_pack")
+        self.assertEqual(len(listdir(cache_dir)), 8)
+
+        utime(path.join(self.project_dir, "component", "m1.py"), (1, 1))
+        second = self.pack("second.tar.gz")
+        with open(first, "rb") as f1, open(second, "rb") as f2:
+            self.assertEqual(f1.read(), f2.read())
+
+        manifest = self.read_manifest(second)
+        self.assertEqual(manifest, self.read_manifest(first))
+        entry = manifest["files"]["pack_project/component/m1.pyc"]
+        self.assertEqual(entry["size"], len("VALUE = 1\n"))
+        self.assertIn("bytecode_sha256", entry)
+
+    def test_delta_pack(self):
+        base = self.pack("base.tar.gz")
+        with open(path.join(self.project_dir, "component", "m2.py"), "w") as f:
+            f.write("VALUE = 'changed'\n")
+        with open(path.join(self.project_dir, "component", "new.py"), "w") as f:
+            f.write("VALUE = 'new'\n")
+        remove(path.join(self.project_dir, "component", "m5.py"))
+
+        delta = self.pack("delta.tar.gz", previous_manifest=base + ".manifest.json")
+        self.assertEqual(
+            sorted(self.read_tar(delta)), ["pack_project/component/m2.pyc", "pack_project/component/new.pyc"]
+        )
+        manifest = self.read_manifest(delta)
+        self.assertEqual(manifest["removed"], ["pack_project/component/m5.pyc"])
+        self.assertEqual(len(manifest["files"]), 9)
+        self.assertEqual(
+            manifest["files"]["pack_project/component/m1.pyc"],
+            self.read_manifest(base)["files"]["pack_project/component/m1.pyc"],
+        )
+
+    def test_exclude_patterns(self):
+        from hyssop.utils.func import compile_path_patterns, walk_to_file_paths
+
+        is_excluded = compile_path_patterns(["node_modules", "*.log", "data/raw"])
+        self.assertTrue(is_excluded("/p/node_modules/"))
+        self.assertTrue(is_excluded("/p/a.log"))
+        self.assertTrue(is_excluded("/p/data/raw/x.csv"))
+        self.assertFalse(is_excluded("/p/a.log.txt"))
+        self.assertFalse(is_excluded("/p/data/x.csv"))
+
+        for sub_dir in ["node_modules/lib", "data/raw", "data/ok"]:
+            makedirs(path.join(self.project_dir, sub_dir))
+            with open(path.join(self.project_dir, sub_dir, "file.txt"), "w") as f:
+                f.write(sub_dir)
+        for name in ["app.log", "types.pyi"]:
+            with open(path.join(self.project_dir, name), "w") as f:
+                f.write(name)
+        with open(path.join(self.project_dir, "pack.yml"), "w") as f:
+            f.write("exclude:\n- node_modules\n- '*.log'\n- data/raw\n")
+
+        walked = walk_to_file_paths(self.project_dir, exclude=is_excluded)
+        self.assertFalse([p for p in walked if "node_modules" in p or "raw" in p])
+
+        members = sorted(self.read_tar(self.pack("exclude.tar.gz")))
+        self.assertIn("pack_project/data/ok/file.txt", members)
+        self.assertIn("pack_project/types.pyi", members)
+        self.assertIn("pack_project/component/m0.pyc", members)
+        self.assertFalse([m for m in members if "node_modules" in m or "raw" in m or m.endswith(".log")])
+        self.assertNotIn("pack_project/pack.yml", members)
+
+    def test_codecs(self):
+        import gzip
+        import lzma
+        from functools import partial
+        from io import BytesIO
+
+        from hyssop.project.pack import ParallelBlockWriter, _gzip_compress, _xz_compress
+
+        data = bytes(range(256)) * 1000
+        for compress, decompress in [
+            (partial(_gzip_compress, level=6, mtime=0), gzip.decompress),
+            (partial(_xz_compress, level=1), lzma.decompress),
+        ]:
+            output = BytesIO()
+            writer = ParallelBlockWriter(output, compress, threads=2, block_size=10000)
+            for i in range(0, len(data), 3000):
+                writer.write(data[i : i + 3000])
+            writer.close()
+            self.assertEqual(writer.blocks, 26)
+            self.assertEqual(decompress(output.getvalue()), data)
+
+        expected = self.read_tar(self.pack("gz.tar.gz", use_cache=False))
+        for codec, threads in [("none", 1), ("gz", 2), ("xz", 1), ("xz", 2)]:
+            output = self.pack("codec.tar", codec=codec, threads=threads)
+            self.assertEqual(self.read_tar(output), expected)
+
+    def create_wheel(self, wheel_dir: str) -> str:
+        import zipfile
+
+        makedirs(wheel_dir)
+        wheel = path.join(wheel_dir, "hyssop_ut_wheel-1.0-py3-none-any.whl")
+        with zipfile.ZipFile(wheel, "w") as zf:
+            zf.writestr("hyssop_ut_wheel.py", "VALUE = 1\n")
+            zf.writestr(
+                "hyssop_ut_wheel-1.0.dist-info/METADATA", "Metadata-Version: 2.1\nName: hyssop-ut-wheel\nVersion: 1.0\n"
+            )
+            zf.writestr(
+                "hyssop_ut_wheel-1.0.dist-info/WHEEL",
+                "Wheel-Version: 1.0\nGenerator: ut\nRoot-Is-Purelib: true\nTag: py3-none-any\n",
+            )
+            zf.writestr("hyssop_ut_wheel-1.0.dist-info/RECORD", "")
+        return wheel
+
+    def test_wheel_cache(self):
+        from hyssop.project.pack import HyssopPack, get_wheel_platform_tag
+
+        links_dir = path.join(self.work_dir, "links")
+        wheel_cache = path.join(self.work_dir, "wheels")
+        dependency_dir = path.join(self.work_dir, "dependency")
+        wheel_name = path.basename(self.create_wheel(links_dir))
+        requirements = path.join(self.project_dir, "requirements.txt")
+        with open(requirements, "w") as f:
+            f.write("hyssop-ut-wheel==1.0\n")
+
+        HyssopPack()._preparing_python_wheels(dependency_dir, requirements, wheel_cache, [links_dir], offline=True)
+        self.assertEqual(listdir(dependency_dir), [wheel_name])
+        # the wheels are built in a temporary folder of the cache folder, which is removed after moving the wheels
+        self.assertEqual(
+            sorted(listdir(path.join(wheel_cache, get_wheel_platform_tag()))), [wheel_name, "requirements"]
+        )
+
+        # pip is not required while requirements is unchanged
+        rmtree(links_dir)
+        rmtree(dependency_dir)
+        HyssopPack()._preparing_python_wheels(dependency_dir, requirements, wheel_cache, offline=True)
+        self.assertEqual(listdir(dependency_dir), [wheel_name])
+
+    def write_pyz_unit_test(self):
+        makedirs(path.join(self.project_dir, "unit_test"), exist_ok=True)
+        with open(path.join(self.project_dir, "unit_test", "__init__.py"), "w") as f:
+            f.write(
+                "from hyssop.unit_test import UnitTestTypes\n"
+                "from hyssop.unit_test.base import IUnitTestCase\n"
+                "from pack_project.component.m3 import VALUE\n\n\n"
+                "class PyzTestCase(IUnitTestCase):\n"
+                "    def test(self):\n"
+                "        self.assertEqual(VALUE, 3)\n\n\n"
+                "class PyzTestTypes(UnitTestTypes):\n"
+                "    Pyz = PyzTestCase\n"
+            )
+
+    def test_pyz(self):
+        import os
+        import subprocess
+        import sys
+        import zipfile
+
+        from hyssop import Module_Path
+
+        self.write_pyz_unit_test()
+        output = self.pack("pack_project.pyz", pack_format="pyz")
+        with zipfile.ZipFile(output) as zf:
+            self.assertIn("__main__.py", zf.namelist())
+            self.assertIn("pack_project/component/m3.pyc", zf.namelist())
+
+        env = dict(
+            os.environ, PYTHONPATH=path.dirname(Module_Path), HYSSOP_PYZ_ROOT=path.join(self.work_dir, "pyz_root")
+        )
+        res = subprocess.run([sys.executable, output], env=env, capture_output=True, text=True)
+        self.assertIn("Ran 1 test", res.stderr)
+        self.assertIn("OK", res.stderr)
+        pyz_dirs = listdir(path.join(self.work_dir, "pyz_root"))
+        self.assertEqual(pyz_dirs[0][: len("pack_project-")], "pack_project-")
+
+        # only the non-module files of project are extracted, the modules are imported from zipapp
+        extracted = path.join(self.work_dir, "pyz_root", pyz_dirs[0])
+        self.assertEqual(listdir(extracted), ["pack_project"])
+        self.assertTrue(path.isfile(path.join(extracted, "pack_project", "project_config.yml")))
+        self.assertFalse(path.exists(path.join(extracted, "pack_project", "component")))
+
+    def create_distribution_wheel(self, wheel_dir: str, name: str) -> None:
+        """create the wheel of installed distribution from its recorded files"""
+        import zipfile
+        from importlib.metadata import distribution
+
+        dist = distribution(name)
+        tag = [line[len("Tag: ") :] for line in dist.read_text("WHEEL").splitlines() if line.startswith("Tag: ")][0]
+        wheel = path.join(wheel_dir, "{}-{}-{}.whl".format(dist.metadata["Name"].replace("-", "_"), dist.version, tag))
+        with zipfile.ZipFile(wheel, "w") as zf:
+            for file in dist.files:
+                if file.parts[0] != ".." and "__pycache__" not in file.parts:
+                    zf.write(dist.locate_file(file), file.as_posix())
+
+    def create_hyssop_wheel(self, wheel_dir: str) -> None:
+        import zipfile
+
+        from hyssop import Module_Path
+        from hyssop.utils.func import compile_path_patterns, walk_to_file_paths
+
+        with zipfile.ZipFile(path.join(wheel_dir, "hyssop-0.0.0-py3-none-any.whl"), "w") as zf:
+            for file in walk_to_file_paths(Module_Path, exclude=compile_path_patterns(["__pycache__"])):
+                zf.write(file, "hyssop/" + path.relpath(file, Module_Path).replace(path.sep, "/"))
+            zf.writestr(
+                "hyssop-0.0.0.dist-info/METADATA",
+                "Metadata-Version: 2.1\nName: hyssop\nVersion: 0.0.0\n"
+                "Requires-Dist: PyYAML>=5.1.1\nRequires-Dist: pydantic>=2.0\n",
+            )
+            zf.writestr(
+                "hyssop-0.0.0.dist-info/WHEEL",
+                "Wheel-Version: 1.0\nGenerator: ut\nRoot-Is-Purelib: true\nTag: py3-none-any\n",
+            )
+            zf.writestr("hyssop-0.0.0.dist-info/RECORD", "")
+
+    def test_pyz_vendored_dependencies(self):
+        import os
+        import subprocess
+        import sys
+
+        # the wheels of hyssop and its dependencies, pydantic_core and PyYAML are platform wheels
+        links_dir = path.join(self.work_dir, "links")
+        makedirs(links_dir)
+        self.create_hyssop_wheel(links_dir)
+        for name in [
+            "PyYAML",
+            "pydantic",
+            "pydantic_core",
+            "annotated_types",
+            "typing_extensions",
+            "typing_inspection",
+        ]:
+            self.create_distribution_wheel(links_dir, name)
+        with open(path.join(self.project_dir, "requirements.txt"), "w") as f:
+            f.write("hyssop\n")
+        self.write_pyz_unit_test()
+
+        cwd = os.getcwd()
+        os.chdir(self.work_dir)
+        try:
+            output = self.pack(
+                "pack_project.pyz",
+                pack_format="pyz",
+                prepare_wheels=True,
+                wheel_cache=path.join(self.work_dir, "wheels"),
+                find_links=[links_dir],
+                offline=True,
+            )
+        finally:
+            os.chdir(cwd)
+
+        # the interpreter runs in isolated mode without site-packages, hyssop is imported from the zipapp only
+        pyz_root = path.join(self.work_dir, "pyz_isolated")
+        env = dict(os.environ, HYSSOP_PYZ_ROOT=pyz_root)
+        res = subprocess.run([sys.executable, "-I", "-S", output], env=env, capture_output=True, text=True)
+        self.assertIn("Ran 1 test", res.stderr)
+        self.assertIn("OK", res.stderr)
+
+        # the packages with data files or extension modules are extracted to site folder
+        extracted = path.join(pyz_root, listdir(pyz_root)[0])
+        site = listdir(path.join(extracted, "site"))
+        self.assertIn("hyssop", site)
+        self.assertIn("pydantic_core", site)
+        self.assertNotIn("pydantic", site)
+        self.assertNotIn("typing_extensions.pyc", site)
+        self.assertTrue(path.isfile(path.join(extracted, "site", "hyssop", "utils", "local.csv")))
+
+    def test_pyz_site_files(self):
+        import zipfile
+
+        from hyssop.project.zipapp import extract_wheels, get_site_files
+
+        wheel = path.join(self.work_dir, "native-1.0-cp311-cp311-linux_x86_64.whl")
+        with zipfile.ZipFile(wheel, "w") as zf:
+            zf.writestr("native/__init__.py", "")
+            zf.writestr("native-1.0.data/platlib/_native.so", "")
+            zf.writestr("native-1.0.data/scripts/native", "")
+            zf.writestr("native-1.0.dist-info/METADATA", "")
+        arcnames = [arcname for _, arcname in extract_wheels([wheel], path.join(self.work_dir, "wheel"))]
+        self.assertEqual(sorted(arcnames), ["_native.so", "native-1.0.dist-info/METADATA", "native/__init__.py"])
+
+        arcnames = [
+            "pack_project/data.txt",
+            "pure/__init__.pyc",
+            "pure/py.typed",
+            "pure.pyc",
+            "data/__init__.pyc",
+            "data/local.csv",
+            "_native.so",
+            "data-1.0.dist-info/METADATA",
+            "__main__.py",
+        ]
+        self.assertEqual(
+            get_site_files("pack_project", arcnames), ["_native.so", "data/__init__.pyc", "data/local.csv"]
+        )
+
+    def test_pack_hooks(self):
+        from hyssop.project.pack import add_pack_hook, pack_hooks
+
+        def hook(server_folder, paths, work_dir):
+            self.assertIn("pack_project/project_config.yml", [arcname for _, arcname in paths])
+            with open(path.join(work_dir, "generated.txt"), "w") as f:
+                f.write("generated")
+            return [(path.join(work_dir, "generated.txt"), "pack_project/generated.txt")]
+
+        add_pack_hook(hook)
+        try:
+            files = self.read_tar(self.pack("hook.tar.gz"))
+        finally:
+            pack_hooks.remove(hook)
+        self.assertEqual(files["pack_project/generated.txt"], b"generated")
+        self.assertIn(
+            "pack_project/generated.txt", self.read_manifest(path.join(self.work_dir, "hook.tar.gz"))["files"]
+        )
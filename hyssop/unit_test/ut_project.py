@@ -10,7 +10,7 @@ Modified By: hsky77
 Last Updated: April 4th 2025 17:16:11 pm
 """
 
-from asyncio import run
+from asyncio import get_event_loop_policy, new_event_loop, run, set_event_loop_policy
 from logging import DEBUG
 
 
@@ -38,3 +38,29 @@ class TestCaseComponent(IUnitTestCase):
         component_manager = project.create_component_manager()
         component_manager.get_logger("unit test").debug(component_manager.get_message(LocalCode_Hello))
         run(component_manager.dispose_components())
+
+        self._check_event_loop(HyssopProject(Module_Path, {"name": "event loop unit test", "event_loop": "uvloop"}))
+
+    def _check_event_loop(self, project):
+        """uvloop is used if it is installed, otherwise fall back to asyncio"""
+        try:
+            import uvloop
+        except ImportError:
+            uvloop = None
+
+        try:
+            self.assertEqual(project.set_event_loop_policy(), "uvloop" if uvloop else "asyncio")
+            loop = new_event_loop()
+            if uvloop:
+                self.assertIsInstance(loop, uvloop.Loop)
+            loop.close()
+
+            project.event_loop = "asyncio"
+            self.assertEqual(project.set_event_loop_policy(), "asyncio")
+            self.assertNotIn("uvloop", type(get_event_loop_policy()).__module__)
+
+            project.event_loop = "trio"
+            with self.assertRaises(ValueError):
+                project.set_event_loop_policy()
+        finally:
+            set_event_loop_policy(None)
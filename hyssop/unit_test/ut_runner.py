@@ -0,0 +1,119 @@
+# Copyright (C) 2020-Present the hyssop authors and contributors.
+#
+# This module is part of hyssop and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+File created: October 19th 2026
+
+Modified By: hsky77
+Last Updated: October 19th 2026 13:40:52 pm
+"""
+
+import sys
+from io import StringIO
+from os import makedirs, path
+from shutil import rmtree
+from tempfile import mkdtemp
+
+from .base import IUnitTestCase
+
+UT_Cases = """
+import time
+
+from hyssop.unit_test import UnitTestTypes
+from hyssop.unit_test.base import IUnitTestCase
+
+
+class SlowTestCase(IUnitTestCase):
+    def test(self):
+        time.sleep(0.2)
+
+
+class FastTestCase(IUnitTestCase):
+    def test(self):
+        pass
+
+
+class FailedTestCase(IUnitTestCase):
+    def test(self):
+        self.assertEqual(1, 2)
+
+
+class RunnerTestTypes(UnitTestTypes):
+    Slow = SlowTestCase
+    Fast = FastTestCase
+    Failed = FailedTestCase
+"""
+
+
+class TestCaseRunner(IUnitTestCase):
+    def setUp(self):
+        self.work_dir = mkdtemp()
+        self.project_dir = path.join(self.work_dir, "runner_project")
+        makedirs(path.join(self.project_dir, "unit_test"))
+        with open(path.join(self.project_dir, "unit_test", "__init__.py"), "w") as f:
+            f.write(UT_Cases)
+        sys.path.insert(0, self.work_dir)
+
+    def tearDown(self):
+        sys.path.remove(self.work_dir)
+        for name in [m for m in sys.modules if m.startswith("runner_project")]:
+            del sys.modules[name]
+        rmtree(self.work_dir, ignore_errors=True)
+
+    def test(self):
+        self.test_parallel_runner()
+        self.test_benchmark_runner()
+
+    def test_parallel_runner(self):
+        from hyssop.unit_test.runner import ParallelTestRunner, get_test_case_ids
+
+        test_ids = get_test_case_ids("runner_project.unit_test")
+        self.assertEqual(len(test_ids), 3)
+
+        stream = StringIO()
+        runner = ParallelTestRunner(self.project_dir, jobs=2, stream=stream)
+        results = {r.test_id.split(".")[-1]: r for r in runner.run(test_ids)}
+        self.assertEqual(results["SlowTestCase"].status, "ok")
+        self.assertGreaterEqual(results["SlowTestCase"].duration, 0.2)
+        self.assertEqual(results["FailedTestCase"].status, "FAIL")
+        self.assertIn("AssertionError", results["FailedTestCase"].output)
+        self.assertIn("FAILED (failures=1)", stream.getvalue())
+
+        # the slowest test case is scheduled first in the next run
+        self.assertTrue(path.isfile(runner.durations_path))
+        self.assertEqual(runner.schedule(test_ids)[0], "runner_project.unit_test.SlowTestCase")
+
+    def test_benchmark_runner(self):
+        from hyssop.unit_test.base import IBenchmarkCase
+        from hyssop.unit_test.benchmark import BenchmarkRunner, get_benchmark_cases, run_benchmark_case
+
+        calls = []
+
+        class AsyncBenchmark(IBenchmarkCase):
+            warmup = 2
+            repeat = 3
+            number = 4
+
+            async def bench(self):
+                calls.append(1)
+
+        result = run_benchmark_case(AsyncBenchmark)
+        self.assertEqual(len(calls), 2 + 3 * 4)
+        self.assertEqual(result["repeat"], 3)
+        self.assertLessEqual(result["min"], result["median"])
+
+        cases = get_benchmark_cases("hyssop.unit_test")
+        self.assertIn("hyssop.unit_test.bench_utils.BenchmarkLocalization", cases)
+
+        stream = StringIO()
+        runner = BenchmarkRunner(warmup=0, repeat=2, stream=stream)
+        results = runner.run(cases)
+        baseline = {"benchmarks": {k: dict(v) for k, v in results["benchmarks"].items()}}
+        self.assertEqual(runner.compare(results, baseline, cases), [])
+
+        regressed_id = "hyssop.unit_test.bench_utils.BenchmarkLocalization"
+        baseline["benchmarks"][regressed_id]["median"] /= 2
+        self.assertEqual(runner.compare(results, baseline, cases), [regressed_id])
+        self.assertIn("REGRESS", stream.getvalue())
@@ -7,10 +7,11 @@
 File created: August 21st 2020
 
 Modified By: hsky77
-Last Updated: April 6th 2025 05:19:22 am
+Last Updated: October 19th 2026 22:31:50 pm
 """
 
 import asyncio
+import threading
 import time
 
 from hyssop.utils.executor import ExecutorFactory
@@ -23,6 +24,7 @@ class TestCaseWorker(IUnitTestCase):
     def test(self):
         # self.test_pools()
         self.test_workers()
+        self.test_executor()
 
     def test_pools(self):
         """test worker pool both sync and async function"""
@@ -76,6 +78,44 @@ class TestCaseWorker(IUnitTestCase):
         ap.dispose()
         self.assertLessEqual(ap.worker_count, worker_count)
 
+    def test_executor(self):
+        """test the executor waits the results by event or future and skips the calls cancelled in queue"""
+
+        def fail():
+            raise ValueError("failed")
+
+        factory = ExecutorFactory(worker_limit=1)
+        with factory.get_executor() as executor:
+            # the calling thread waits the event
+            self.assertEqual(executor.run_method(pow, 2, 10), 1024)
+            with self.assertRaises(ValueError):
+                executor.run_method(fail)
+
+        async def test():
+            # the future is set by the worker thread via call_soon_threadsafe
+            self.assertEqual(await factory.run_method_async(pow, 2, 10), 1024)
+            with self.assertRaises(ValueError):
+                await factory.run_method_async(fail)
+
+            started, release = threading.Event(), threading.Event()
+            calls = []
+            running = asyncio.ensure_future(factory.run_method_async(lambda: started.set() or release.wait(1)))
+            queued = asyncio.ensure_future(factory.run_method_async(calls.append, "queued"))
+            await asyncio.get_running_loop().run_in_executor(None, started.wait, 1)
+
+            queued.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await queued
+            release.set()
+            self.assertTrue(await running)
+
+            # the cancelled call is skipped by the worker
+            self.assertIsNone(await factory.run_method_async(calls.append, "next"))
+            self.assertEqual(calls, ["next"])
+
+        asyncio.run(test())
+        factory.dispose()
+
     def test_workers(self):
         """test function and callback have been executed properly, it should takes 2~3 secs"""
 
@@ -0,0 +1,48 @@
+# Copyright (C) 2020-Present the hyssop authors and contributors.
+#
+# This module is part of hyssop and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+File created: October 19th 2026
+
+Modified By: hsky77
+Last Updated: October 19th 2026 15:24:52 pm
+
+Event loop selection of project config "event_loop: uvloop|asyncio".
+
+The event loop policy is set before the server or test cases create their event loops, so web.run_app(),
+asyncio.run() and asyncio.new_event_loop() use the selected loop. uvloop is optional, the default asyncio loop
+is used if it is not installed.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+Event_Loop_Asyncio = "asyncio"
+Event_Loop_Uvloop = "uvloop"
+Event_Loops = (Event_Loop_Asyncio, Event_Loop_Uvloop)
+
+
+def get_event_loop_policy(name: Optional[str] = None) -> asyncio.AbstractEventLoopPolicy:
+    """return the event loop policy of name, fall back to asyncio if uvloop is not installed"""
+    if name is None or name == Event_Loop_Asyncio:
+        return asyncio.DefaultEventLoopPolicy()
+
+    if name == Event_Loop_Uvloop:
+        try:
+            import uvloop
+        except ImportError:
+            logging.getLogger(__name__).warning("uvloop is not installed, use asyncio event loop")
+            return asyncio.DefaultEventLoopPolicy()
+        return uvloop.EventLoopPolicy()
+
+    raise ValueError("event_loop must be one of {}, but got: {}".format(", ".join(Event_Loops), name))
+
+
+def set_event_loop_policy(name: Optional[str] = None) -> str:
+    """set the event loop policy of name and return the name of event loop in use"""
+    policy = get_event_loop_policy(name)
+    asyncio.set_event_loop_policy(policy)
+    return Event_Loop_Uvloop if type(policy).__module__.split(".")[0] == "uvloop" else Event_Loop_Asyncio
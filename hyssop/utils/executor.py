@@ -10,31 +10,56 @@ File created: August 21st 2020
     - class ExecutorFactory manages FunctionQueueWorker instances and produces the Executors.
 
 Modified By: hsky77
-Last Updated: September 3rd 2020 14:30:27 pm
+Last Updated: October 19th 2026 20:31:05 pm
 """
 
 
 import asyncio
 import random
-import time
+from threading import Event
 from typing import Any, Callable, List, Type, Optional
 
 from .worker import FunctionQueueWorker
 
 
 class _WorkerTask:
-    def __init__(self):
+    """result of function run by worker, it is awaited by the event or the future of event loop"""
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
         self.result = None
         self.exception = None
         self.done = False
+        self.cancelled = False
+        self.event = Event() if loop is None else None
+        self.future = loop.create_future() if loop is not None else None
+
+    def run(self, func: Callable, *args, **kwargs) -> Any:
+        """run func in worker thread if it is not cancelled"""
+        if not self.cancelled:
+            return func(*args, **kwargs)
 
     def on_finish(self, result: Any):
         self.result = result
         self.done = True
+        self._notify()
 
     def on_exception(self, e: Exception):
         self.exception = e
         self.done = True
+        self._notify()
+
+    def _notify(self):
+        if self.future is not None:
+            try:
+                self.future.get_loop().call_soon_threadsafe(self._set_future)
+            except RuntimeError:  # event loop is closed
+                pass
+        else:
+            self.event.set()
+
+    def _set_future(self):
+        if not self.future.done():
+            self.future.set_result(None)
 
 
 class Executor:
@@ -72,21 +97,24 @@ class Executor:
         """Run the given function. It blocks the calling thread."""
         task = _WorkerTask()
         self.__worker.run_method(func, *args, on_finish=task.on_finish, on_exception=task.on_exception, **kwargs)
-
-        while not task.done:
-            time.sleep(0)
+        task.event.wait()
 
         if task.exception:
             raise task.exception from task.exception
         return task.result
 
     async def run_method_async(self, func: Callable, *args, **kwargs) -> Any:
-        """Run the given function asynchronously."""
-        task = _WorkerTask()
-        self.__worker.run_method(func, *args, on_finish=task.on_finish, on_exception=task.on_exception, **kwargs)
-
-        while not task.done:
-            await asyncio.sleep(0)
+        """Run the given function asynchronously. The function is not run if it is cancelled in queue."""
+        task = _WorkerTask(asyncio.get_running_loop())
+        self.__worker.run_method(
+            task.run, func, *args, on_finish=task.on_finish, on_exception=task.on_exception, **kwargs
+        )
+
+        try:
+            await task.future
+        except asyncio.CancelledError:
+            task.cancelled = True
+            raise
 
         if task.exception:
             raise task.exception from task.exception
@@ -1,5 +1,7 @@
+import fnmatch
 import os
-from typing import List
+import re
+from typing import Callable, Iterable, List, Optional
 
 
 def join_to_abs_path(*paths) -> str:
@@ -12,17 +14,52 @@ def join_path(*paths) -> str:
     return os.path.join(*paths).replace("\\", "/")
 
 
-def walk_to_file_paths(file_or_directory: str) -> List[str]:
-    """get a list of absolutely path from the input path recursively"""
+def compile_path_patterns(patterns: Iterable[str]) -> Callable[[str], bool]:
+    """
+    compile path patterns to a function returns whether the path matches any of the patterns.
+    Patterns with glob characters "*?[" match the whole path or the file name, e.g. "*.log" or "*/data/*",
+    the other patterns match as sub string of path, e.g. ".log", "node_modules" or "data/raw".
+    """
+    substrings, globs = [], []
+    for pattern in patterns:
+        pattern = str(pattern).replace("\\", "/")
+        if any(c in pattern for c in "*?["):
+            globs.append(fnmatch.translate(pattern))
+        elif pattern:
+            substrings.append(re.escape(pattern))
+
+    search = re.compile("|".join(substrings)).search if substrings else None
+    match = re.compile("|".join(globs)).match if globs else None
+
+    def is_matched(path: str) -> bool:
+        if search and search(path):
+            return True
+        return bool(match and (match(path) or match(os.path.basename(path))))
+
+    return is_matched
+
+
+def walk_to_file_paths(file_or_directory: str, exclude: Optional[Callable[[str], bool]] = None) -> List[str]:
+    """
+    get a list of absolutely path from the input path recursively.
+    The files and directories matched exclude function are skipped, excluded directories are not walked into.
+    """
     file_paths = []
     if os.path.isdir(file_or_directory):
-        for root, _, files in os.walk(file_or_directory):
-            for i in range(len(files)):
-                files[i] = join_path(os.path.abspath(root), files[i])
-
-            if len(files) > 0:
-                file_paths.extend(files)
+        directories = [join_path(os.path.abspath(file_or_directory))]
+        while directories:
+            directory = directories.pop()
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    path = join_path(directory, entry.name)
+                    if entry.is_dir():
+                        # symbolic links to directories are not followed as os.walk()
+                        if not entry.is_symlink() and (exclude is None or not exclude(path + "/")):
+                            directories.append(path)
+                    elif exclude is None or not exclude(path):
+                        file_paths.append(path)
     elif os.path.isfile(file_or_directory):
-        file_paths.append(file_or_directory)
+        if exclude is None or not exclude(file_or_directory):
+            file_paths.append(file_or_directory)
 
     return file_paths
@@ -1,5 +1,11 @@
+import csv
+import hashlib
+import marshal
 import os
-from typing import Dict, List, Any
+import sys
+from io import StringIO
+from string import Formatter
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
 
 from .constants import (
     LocalCode_Duplicated_Code,
@@ -9,17 +15,77 @@ from .constants import (
 )
 from .func import join_path
 
+# (languages, {lang: {code: message}})
+Catalog = Tuple[List[str], Dict[str, Dict[int, str]]]
+
+MessageTemplate = Callable[..., str]
+
+_formatter = Formatter()
+
+
+def compile_message_template(template: str) -> MessageTemplate:
+    """
+    Precompile str.format() template to a function.
+    Templates without fields return the literal, templates with only "{}" fields are converted to printf-style,
+    the others fall back to str.format(). Missing arguments raise IndexError as str.format() does.
+    """
+    parsed = list(_formatter.parse(template))
+    fields = [p for p in parsed if p[1] is not None]
+    if not fields:
+        literal = "".join(p[0] for p in parsed)
+        return lambda *args: literal
+
+    if all(name == "" and not spec and conversion is None for _, name, spec, conversion in fields):
+        literals = [p[0].replace("%", "%%") for p in parsed]
+        if parsed[-1][1] is not None:
+            literals.append("")
+        printf_template = "%s".join(literals)
+        count = len(fields)
+
+        def format_simple(*args: Any) -> str:
+            if len(args) < count:
+                raise IndexError("Replacement index {} out of range for positional args tuple".format(len(args)))
+            return printf_template % args[:count]
+
+        return format_simple
+
+    return template.format
+
+
+class _CatalogFile:
+    """csv file imported by Localization, its messages are loaded by language on demand"""
+
+    __slots__ = ("path", "digest", "encoding", "languages", "codes")
+
+    def __init__(self, path: str, digest: str, encoding: str, languages: List[str]):
+        self.path = path
+        self.digest = digest
+        self.encoding = encoding
+        self.languages = languages
+        self.codes: FrozenSet[int] = frozenset()
+
 
 class Localization:
-    """convert message to localized language message"""
+    """
+    convert message to localized language message.
+    The messages of a language are loaded from the imported files when the language is used for the first time,
+    and the message templates are compiled and cached by (code, language).
+    """
 
     default_code = LocalCode_No_Code
+    fallback_language = "en"
+
+    catalog_cache_folder = "__pycache__"
+    catalog_cache_suffix = ".{}.catalog".format(sys.implementation.cache_tag)
 
-    def __init__(self, lang: str = "en"):
-        self.__mapping: Dict[int, Dict[str, str]] = {}  # {"code": {"lang": "string"}}
+    def __init__(self, lang: str = "en", cache_catalog: bool = True):
+        self.__catalogs: Dict[str, Dict[int, str]] = {}  # {"lang": {"code": "string"}} of loaded languages
+        self.__files: Dict[str, _CatalogFile] = {}  # {"abs path": file} in imported order
+        self.__templates: Dict[Tuple[int, str], MessageTemplate] = {}
         self.__csvs = []
         self.set_language(lang)
         self.__languages = set()
+        self.cache_catalog = cache_catalog
 
     def set_language(self, lang: str) -> None:
         self.__lang = lang
@@ -32,70 +98,171 @@ class Localization:
         """return dict shows how many language avaliable and the codes loaded"""
         return {
             "current_language": self.current_language,
-            "loaded_languages": list(self.__languages),
-            "codes": len(self.__mapping),
+            "languages": list(self.__languages),
+            "loaded_languages": list(self.__catalogs),
+            "codes": len(set().union(*self.__catalogs.values())),
             "files_loaded": self.__csvs,
         }
 
     def import_csvs_from_directory(self, dir: str, encoding: str = "utf-8") -> None:
         """import coded message from all csv files of indicated directory"""
         self.import_csv(
-            [join_path(dir, f) for f in os.listdir(dir) if ".csv" in f and os.path.isfile(join_path(dir, f))]
+            [join_path(dir, f) for f in os.listdir(dir) if ".csv" in f and os.path.isfile(join_path(dir, f))],
+            encoding=encoding,
         )
 
     def import_csv(self, files: List[str], encoding: str = "utf-8", replace_duplicated_code: bool = True) -> None:
-        """import coded message from csv file"""
-        import re
-
+        """
+        import coded message from csv file.
+        The file is skipped if it has been imported with the same content.
+        The messages are loaded only for the languages in use, parsed catalogs are cached in __pycache__ folder
+        beside the csv file and reused while the file is unchanged.
+        The duplicated codes are checked when the file is imported, KeyError is raised if replace_duplicated_code is
+        False and the code of a language exists in the other imported files.
+        """
         for path in files:
-            with open(path, "r", encoding=encoding) as f:
+            with open(path, "rb") as f:
+                data = f.read()
+
+            abs_path = os.path.abspath(path)
+            digest = hashlib.sha1(data).hexdigest()
+            imported = self.__files.get(abs_path)
+            if imported is not None and imported.digest == digest:
+                continue
+
+            header = next(csv.reader(StringIO(data.split(b"\n", 1)[0].decode(encoding))), [])
+            catalog_file = _CatalogFile(path, digest, encoding, [x.strip() for x in header[1:]])
+
+            catalog = None
+            if catalog_file.languages:
+                # the rows have the messages of all languages, so the codes of the first language are the file's
+                messages = self._load_cached_messages(catalog_file, catalog_file.languages[0])
+                if messages is None:
+                    # validate the new or changed file and cache its languages
+                    catalog = self._load_catalog(catalog_file, data)
+                    messages = catalog[catalog_file.languages[0]]
+                catalog_file.codes = frozenset(messages)
+
+            if not replace_duplicated_code:
+                self._check_duplicated_codes(abs_path, catalog_file)
+
+            self.__files[abs_path] = catalog_file
+            self.__languages.update(catalog_file.languages)
+            if imported is None:
                 self.__csvs.append(path)
-                lines = f.readlines()
-
-                langs = []
-                if len(lines) > 0:
-                    langs = [x.replace("\n", "") for x in lines.pop(0).split(",") if "code" not in x]
-
-                for line in lines:
-                    line = [x for x in re.split(',"(.*?)"|,', line) if x is not None and not x == "" and not x == "\n"]
-                    if not len(line) - 1 == len(langs):
-                        raise SyntaxError(self.get_message(LocalCode_Local_Pack_Parsing_Error, path))
-                    idx = 1
-                    for lang in langs:
-                        self.__languages.add(lang)
-                        if line[0] not in self.__mapping:
-                            self.__mapping[int(line[0])] = {}
-
-                        if lang not in self.__mapping[int(line[0])]:
-                            self.__mapping[int(line[0])][lang] = line[idx].replace("\n", "")
-                        else:
-                            if replace_duplicated_code:
-                                self.__mapping[int(line[0])][lang] = line[idx].replace("\n", "")
-                            else:
-                                raise KeyError(self.get_message(LocalCode_Duplicated_Code, line[0], lang))
-
-                        idx = idx + 1
+
+            for lang in catalog_file.languages:
+                if lang in self.__catalogs:
+                    messages = catalog[lang] if catalog else self._load_messages(catalog_file, lang)
+                    self.__catalogs[lang].update(messages)
+            self.__templates.clear()
+
+    def _check_duplicated_codes(self, abs_path: str, catalog_file: _CatalogFile) -> None:
+        """raise KeyError if the codes of file exist in the other imported files of the same language"""
+        for other_path, other in self.__files.items():
+            if other_path != abs_path:
+                langs = [lang for lang in catalog_file.languages if lang in other.languages]
+                duplicated = catalog_file.codes & other.codes
+                if langs and duplicated:
+                    raise KeyError(self.get_message(LocalCode_Duplicated_Code, min(duplicated), langs[0]))
+
+    def load_language(self, lang: str) -> Dict[int, str]:
+        """load and return the messages of language from the imported files"""
+        if lang not in self.__catalogs:
+            self.__catalogs[lang] = {}
+            for catalog_file in self.__files.values():
+                if lang in catalog_file.languages:
+                    self.__catalogs[lang].update(self._load_messages(catalog_file, lang))
+        return self.__catalogs[lang]
+
+    def _load_messages(self, catalog_file: _CatalogFile, lang: str) -> Dict[int, str]:
+        messages = self._load_cached_messages(catalog_file, lang)
+        if messages is None:
+            with open(catalog_file.path, "rb") as f:
+                messages = self._load_catalog(catalog_file, f.read())[lang]
+        return messages
+
+    def _get_catalog_cache_path(self, path: str, lang: str) -> str:
+        directory, file_name = os.path.split(path)
+        cache_file_name = "{}.{}{}".format(file_name, lang, self.catalog_cache_suffix)
+        return join_path(directory, self.catalog_cache_folder, cache_file_name)
+
+    def _load_cached_messages(self, catalog_file: _CatalogFile, lang: str) -> Optional[Dict[int, str]]:
+        """return the cached messages of language if the digest matches"""
+        if self.cache_catalog:
+            try:
+                with open(self._get_catalog_cache_path(catalog_file.path, lang), "rb") as f:
+                    cached_digest, messages = marshal.loads(f.read())
+                if cached_digest == catalog_file.digest:
+                    return messages
+            except (OSError, EOFError, ValueError, TypeError):
+                pass
+        return None
+
+    def _load_catalog(self, catalog_file: _CatalogFile, data: bytes) -> Dict[str, Dict[int, str]]:
+        """parse csv file and cache the messages of each language"""
+        langs, catalog = self._parse_csv(catalog_file.path, data.decode(catalog_file.encoding))
+        if self.cache_catalog and not sys.dont_write_bytecode:
+            try:
+                for lang in langs:
+                    cache_path = self._get_catalog_cache_path(catalog_file.path, lang)
+                    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                    tmp_path = "{}.{}".format(cache_path, os.getpid())
+                    with open(tmp_path, "wb") as f:
+                        f.write(marshal.dumps((catalog_file.digest, catalog[lang])))
+                    os.replace(tmp_path, cache_path)
+            except OSError:
+                pass
+        return catalog
+
+    def _parse_csv(self, path: str, text: str) -> Catalog:
+        """parse csv text with header row of "code,<lang>,<lang>..." to catalog"""
+        reader = csv.reader(StringIO(text))
+        header: Optional[List[str]] = next(reader, None)
+        langs = [x.strip() for x in header[1:]] if header else []
+        catalog: Dict[str, Dict[int, str]] = {lang: {} for lang in langs}
+        columns = [catalog[lang] for lang in langs]
+
+        for row in reader:
+            if not row:
+                continue
+            if not len(row) - 1 == len(langs):
+                raise SyntaxError(self.get_message(LocalCode_Local_Pack_Parsing_Error, path))
+            code = int(row[0])
+            for messages, message in zip(columns, row[1:]):
+                messages[code] = message
+        return langs, catalog
 
     def has_message(self, code: int) -> bool:
-        return code in self.__mapping
+        return code in self.load_language(self.__lang) or code in self.load_language(self.fallback_language)
 
     def get_message(self, code: int, *strings) -> str:
         """convert to localized message via code and following parameters"""
-        if self.__lang not in self.__languages:
-            raise KeyError("language: {}, code: {} does not exist".format(self.__lang, code))
+        lang = self.__lang
+        template = self.__templates.get((code, lang))
+        if template is None:
+            template = self._resolve_template(code, lang)
 
-        if code in self.__mapping:
-            lang = self.__lang
-            if self.__lang not in self.__mapping[code]:
-                lang = "en"
+        try:
+            return template(*strings)
+        except IndexError:
+            return self.get_message(LocalCode_Message_Format_Invalid, code, strings)
 
-            try:
-                return self.__mapping[code][lang].format(*strings)
-            except IndexError:
-                return self.__mapping[LocalCode_Message_Format_Invalid][lang].format(code, strings)
-        else:
-            lang = self.__lang
-            if self.__lang not in self.__mapping[self.default_code]:
-                lang = "en"
-
-            return self.__mapping[self.default_code][lang].format(self.__lang, code)
+    def _resolve_template(self, code: int, lang: str) -> MessageTemplate:
+        """compile and cache the message template of code in language or fallback language"""
+        if lang not in self.__languages:
+            raise KeyError("language: {}, code: {} does not exist".format(lang, code))
+
+        message = self.load_language(lang).get(code)
+        if message is None:
+            message = self.load_language(self.fallback_language).get(code)
+
+        if message is None:
+            default = self.load_language(lang).get(self.default_code)
+            if default is None:
+                default = self.load_language(self.fallback_language)[self.default_code]
+            message = default.format(lang, code).replace("{", "{{").replace("}", "}}")
+
+        template = compile_message_template(message)
+        self.__templates[(code, lang)] = template
+        return template
@@ -1,17 +1,513 @@
+import copy
 import logging
+import os
+import shutil
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
 from multiprocessing import Queue
+from queue import Empty, Full
+from queue import Queue as ThreadQueue
+from threading import Event, Lock, Thread
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .worker import FunctionQueueWorker
+
+try:
+    import orjson
+
+    def _dumps(obj: Dict[str, Any]) -> str:
+        return orjson.dumps(obj, default=str).decode()
+
+except ImportError:  # pragma: no cover
+    import json
+
+    def _dumps(obj: Dict[str, Any]) -> str:
+        return json.dumps(obj, default=str, ensure_ascii=False, separators=(",", ":"))
+
 
 LOG_FORMAT = "%(asctime)s %(levelname)-7s %(name)s - %(message)s"
 
+LOG_QUEUE_POLICY_DROP = "drop"
+LOG_QUEUE_POLICY_BLOCK = "block"
+
+# (logger name, level, created timestamp, message, exception text, context fields, extra fields)
+LogRecordData = Tuple[str, int, float, str, Optional[str], Optional[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+_exception_formatter = logging.Formatter()
+
+# (context fields, start timestamp of elapsed time)
+_log_context: ContextVar[Tuple[Dict[str, Any], Optional[float]]] = ContextVar("hyssop_log_context", default=({}, None))
+
+_record_attributes = set(logging.makeLogRecord({}).__dict__) | {"message", "asctime", "context"}
+
+LOG_COMPRESSION_SUFFIXES = {"gz": ".gz", "zstd": ".zst"}
+
+_compress_worker: Optional[FunctionQueueWorker] = None
+
 
 class MultiProcessingQueueHandle(logging.Handler):
-    def __init__(self, log_queue: Queue) -> None:
+    """
+    Handler sends records to a log sink process via multiprocessing queue.
+    Records are converted to compact LogRecordData tuples and sent in batches of (sub_dir, [records]),
+    a batch is sent when it is full, the flush interval has passed or an error record is logged.
+    The log_context() and "extra" fields are sent along, the values not of str, int, float or bool are sent as str.
+    The policy decides whether to drop the batch or to block the logging call when the queue is full.
+    """
+
+    def __init__(
+        self,
+        log_queue: Queue,
+        sub_dir: str = "",
+        batch_size: int = 256,
+        flush_interval: float = 1.0,
+        policy: str = LOG_QUEUE_POLICY_DROP,
+    ) -> None:
         super().__init__()
+        if policy not in (LOG_QUEUE_POLICY_DROP, LOG_QUEUE_POLICY_BLOCK):
+            raise ValueError(policy)
         self.process_queue = log_queue
+        self.policy = policy
+        self.sub_dir = sub_dir
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._buffer: List[LogRecordData] = []
+        self._last_flush = time.monotonic()
 
-    def emit(self, record):
+    def emit(self, record: logging.LogRecord) -> None:
         if self.process_queue is not None:
-            self.process_queue.put_nowait(record.getMessage())
+            try:
+                exc_text = record.exc_text
+                if record.exc_info and not exc_text:
+                    exc_text = _exception_formatter.formatException(record.exc_info)
+                extra = {k: v for k, v in record.__dict__.items() if k not in _record_attributes}
+                self._buffer.append(
+                    (
+                        record.name,
+                        record.levelno,
+                        record.created,
+                        record.getMessage(),
+                        exc_text,
+                        _to_plain_fields(getattr(record, "context", None)),
+                        _to_plain_fields(extra),
+                    )
+                )
+                if (
+                    len(self._buffer) >= self.batch_size
+                    or record.levelno >= logging.ERROR
+                    or time.monotonic() - self._last_flush >= self.flush_interval
+                ):
+                    self._send()
+            except Exception:
+                self.handleError(record)
+
+    def flush(self) -> None:
+        with self.lock:  # type: ignore
+            self._send()
+
+    def close(self) -> None:
+        self.flush()
+        super().close()
+
+    def _send(self) -> None:
+        self._last_flush = time.monotonic()
+        if self._buffer:
+            batch, self._buffer = self._buffer, []
+            try:
+                if self.policy == LOG_QUEUE_POLICY_BLOCK:
+                    self.process_queue.put((self.sub_dir, batch))
+                else:
+                    self.process_queue.put_nowait((self.sub_dir, batch))
+            except Full:
+                self.dropped += len(batch)
+
+
+def _to_plain_fields(fields: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Return the fields can be pickled to the log sink process, None if there is no field."""
+    if not fields:
+        return None
+    return {k: v if v is None or isinstance(v, (str, int, float, bool)) else str(v) for k, v in fields.items()}
+
+
+def to_log_record(data: LogRecordData) -> logging.LogRecord:
+    """Convert LogRecordData sent by MultiProcessingQueueHandle back to logging.LogRecord"""
+    name, levelno, created, message, exc_text, context, extra = data
+    record = logging.makeLogRecord(
+        {
+            **(extra or {}),
+            "name": name,
+            "levelno": levelno,
+            "levelname": logging.getLevelName(levelno),
+            "created": created,
+            "msecs": (created - int(created)) * 1000,
+            "msg": message,
+            "exc_text": exc_text,
+        }
+    )
+    if context is not None:
+        record.context = context
+    return record
+
+
+@contextmanager
+def log_context(start_time: Optional[float] = None, **fields: Any) -> Iterator[None]:
+    """
+    Add contextual fields such as component or request id to the records logged in this context.
+    The records carry "elapsed_ms" since start_time if it is given as time.time() value.
+    LogContextFilter attached to logger collects the fields and JsonFormatter outputs them.
+    """
+    parent_fields, parent_start_time = _log_context.get()
+    token = _log_context.set(({**parent_fields, **fields}, start_time or parent_start_time))
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+
+class LogContextFilter(logging.Filter):
+    """Logger filter captures the fields of log_context() in the logging thread as record.context"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        fields, start_time = _log_context.get()
+        if start_time is not None:
+            record.context = {**fields, "elapsed_ms": round((record.created - start_time) * 1000, 3)}
+        elif fields:
+            record.context = fields
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """Token bucket filter passes at most rate records per second with bursts up to burst records."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None, exempt_level: int = logging.WARNING) -> None:
+        super().__init__()
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate, 1.0)
+        self.exempt_level = exempt_level
+        self.suppressed = 0
+        self._tokens = self.burst
+        self._last = time.monotonic()
+        self._lock = Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= self.exempt_level:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            self.suppressed += 1
+            return False
+
+
+class SamplingFilter(logging.Filter):
+    """Filter passes the given ratio of records evenly, e.g. ratio 0.1 passes 1 of every 10 records."""
+
+    def __init__(self, ratio: float, exempt_level: int = logging.WARNING) -> None:
+        super().__init__()
+        self.ratio = ratio
+        self.exempt_level = exempt_level
+        self.suppressed = 0
+        self._credit = 1.0 - ratio  # pass the first record
+        self._lock = Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= self.exempt_level:
+            return True
+        with self._lock:
+            self._credit += self.ratio
+            if self._credit >= 1:
+                self._credit -= 1
+                return True
+            self.suppressed += 1
+            return False
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Format record to a JSON line with time, level, logger, message, the log_context() fields and the "extra" fields.
+    It uses orjson if that is installed.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        data: Dict[str, Any] = {
+            "time": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        context = getattr(record, "context", None)
+        if context:
+            data.update(context)
+        for k, v in record.__dict__.items():
+            if k not in _record_attributes:
+                data[k] = v
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exc_info"] = record.exc_text
+        if record.stack_info:
+            data["stack_info"] = self.formatStack(record.stack_info)
+        return _dumps(data)
+
+
+class AsyncLogListener:
+    """
+    Background thread writes the records queued by AsyncLogQueueHandler to their target handlers.
+    Records are written in batches by Handler.handle() of their target handlers, so the handler filters, locks and
+    rollovers apply, and the handlers are flushed again once per batch or flush interval.
+    Records are written synchronously while the thread is not running, so the listener can be created before fork
+    and started in the forked process. The thread is created by start() since the threads created before fork are
+    marked stopped in the forked process.
+    """
+
+    def __init__(
+        self,
+        queue_size: int = 10000,
+        policy: str = LOG_QUEUE_POLICY_DROP,
+        batch_size: int = 256,
+        flush_interval: float = 1.0,
+    ) -> None:
+        if policy not in (LOG_QUEUE_POLICY_DROP, LOG_QUEUE_POLICY_BLOCK):
+            raise ValueError(policy)
+        self.queue: "ThreadQueue[Optional[Tuple[logging.Handler, logging.LogRecord]]]" = ThreadQueue(queue_size)
+        self.policy = policy
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self.enqueued = 0
+        self.dropped = 0
+        self.written = 0
+        self.errors = 0
+        self._count_lock = Lock()
+        self._stopped = Event()
+        self._thread: Optional[Thread] = None
+
+    @property
+    def pending_count(self) -> int:
+        return self.queue.qsize()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "written": self.written,
+            "errors": self.errors,
+            "pending": self.pending_count,
+        }
+
+    def enqueue(self, handler: logging.Handler, record: logging.LogRecord) -> None:
+        if not self.is_alive() and not self._stopped.is_set():
+            if self._write(handler, record):
+                handler.flush()
+            return
+
+        try:
+            if self._stopped.is_set():
+                raise Full()
+            if self.policy == LOG_QUEUE_POLICY_BLOCK:
+                self.queue.put((handler, record))
+            else:
+                self.queue.put_nowait((handler, record))
+            with self._count_lock:
+                self.enqueued += 1
+        except Full:
+            with self._count_lock:
+                self.dropped += 1
+
+    def is_alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the thread if it is not running."""
+        if not self.is_alive() and not self._stopped.is_set():
+            self._thread = Thread(target=self.run, name=type(self).__name__, daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Write the pending records and stop the thread."""
+        if self.is_alive() and not self._stopped.is_set():
+            self._stopped.set()
+            self.queue.put(None)
+            self._thread.join(timeout)  # type: ignore
+
+    def run(self) -> None:
+        dirty: Dict[int, logging.Handler] = {}
+        last_flush = time.monotonic()
+        running = True
+        while running:
+            batch: List[Tuple[logging.Handler, logging.LogRecord]] = []
+            try:
+                item = self.queue.get(timeout=self.flush_interval)
+                while item is not None:
+                    batch.append(item)
+                    if len(batch) >= self.batch_size:
+                        break
+                    item = self.queue.get_nowait()
+                running = item is not None
+            except Empty:
+                pass
+
+            for handler, record in batch:
+                if self._write(handler, record):
+                    dirty[id(handler)] = handler
+
+            if dirty and (not running or time.monotonic() - last_flush >= self.flush_interval or not batch):
+                for handler in dirty.values():
+                    handler.flush()
+                dirty.clear()
+                last_flush = time.monotonic()
+
+    def _write(self, handler: logging.Handler, record: logging.LogRecord) -> bool:
+        """Write record by handler.handle(), return False if it is filtered or fails."""
+        try:
+            if getattr(handler, "_closed", False):
+                return False
+            if not handler.handle(record):
+                return False
+            self.written += 1
+            return True
+        except Exception:
+            self.errors += 1
+            return False
+
+
+class AsyncLogQueueHandler(logging.Handler):
+    """Handler forwards records to the target handler via AsyncLogListener, it never touches the target stream."""
+
+    def __init__(self, listener: AsyncLogListener, target: logging.Handler) -> None:
+        super().__init__()
+        self.listener = listener
+        self.target = target
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Return the copy of record with the merged message so it is independent of the caller's mutable objects,
+        the record passed to the other handlers is not modified.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.listener.enqueue(self.target, self.prepare(record))
+        except Exception:
+            self.handleError(record)
+
+    def close(self) -> None:
+        self.target.close()
+        super().close()
+
+
+def compress_log_file(source: str, dest: str, compression: str) -> None:
+    """Compress source file to dest with "gz" or "zstd" and remove the source file."""
+    tmp = dest + ".tmp"
+    with open(source, "rb") as src:
+        if compression == "zstd":
+            import zstandard
+
+            with open(tmp, "wb") as dst:
+                zstandard.ZstdCompressor().copy_stream(src, dst)
+        else:
+            import gzip
+
+            with gzip.open(tmp, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+    os.replace(tmp, dest)
+    os.remove(source)
+
+
+def get_log_compress_worker() -> FunctionQueueWorker:
+    """Return the shared background worker compresses the rotated log files."""
+    global _compress_worker
+    if _compress_worker is None:
+        _compress_worker = FunctionQueueWorker("hyssop_log_compressor")
+        _compress_worker.daemon = True
+    return _compress_worker
+
+
+class _CompressJob:
+    """Compression of a rotated log file, it is run once by the compress worker or the next rollover."""
+
+    def __init__(self, source: str, dest: str, compression: str) -> None:
+        self.source = source
+        self.dest = dest
+        self.compression = compression
+        self.done = Event()
+        self._claim = Lock()
+
+    def run(self) -> None:
+        """Compress the file if it is not claimed, elsewise wait until it is compressed."""
+        if self._claim.acquire(blocking=False):
+            try:
+                compress_log_file(self.source, self.dest, self.compression)
+            finally:
+                self.done.set()
+        else:
+            self.done.wait()
+
+
+class _CompressingRotatorMixin:
+    """
+    Rotate log file by renaming it to a unique pending file and compressing the pending file in background.
+    The next rollover compresses or waits for the previous pending file before shifting the backups,
+    so a rotated file is never overwritten before it is compressed.
+    """
+
+    compression: Optional[str] = None
+    _compress_job: Optional[_CompressJob] = None
+
+    def _setup_compression(self, compression: Optional[str]) -> None:
+        if compression is not None:
+            if compression not in LOG_COMPRESSION_SUFFIXES:
+                raise ValueError(compression)
+            if compression == "zstd":
+                import zstandard  # noqa: F401 raise ImportError before the first rollover
+
+            self.compression = compression
+            self.namer = self._compressed_name
+            self.rotator = self._rotate_and_compress
+
+    def doRollover(self) -> None:
+        if self._compress_job is not None:
+            self._compress_job.run()
+        super().doRollover()  # type: ignore
+
+    def _compressed_name(self, default_name: str) -> str:
+        return default_name + LOG_COMPRESSION_SUFFIXES[self.compression]  # type: ignore
+
+    def _rotate_and_compress(self, source: str, dest: str) -> None:
+        if os.path.exists(source):
+            pending = "{}.{}.pending".format(
+                dest[: -len(LOG_COMPRESSION_SUFFIXES[self.compression])], time.time_ns()  # type: ignore
+            )
+            os.replace(source, pending)
+            self._compress_job = _CompressJob(pending, dest, self.compression)  # type: ignore
+            get_log_compress_worker().run_method(self._compress_job.run)
+
+
+class CompressingRotatingFileHandler(_CompressingRotatorMixin, RotatingFileHandler):
+    """RotatingFileHandler rolls over by file size and compresses the rotated files in background."""
+
+    def __init__(self, *args, compression: Optional[str] = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._setup_compression(compression)
+
+
+class CompressingTimedRotatingFileHandler(_CompressingRotatorMixin, TimedRotatingFileHandler):
+    """TimedRotatingFileHandler rolls over by time and compresses the rotated files in background."""
+
+    def __init__(self, *args, compression: Optional[str] = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._setup_compression(compression)
 
 
 logging.basicConfig(format=LOG_FORMAT)
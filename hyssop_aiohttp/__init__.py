@@ -11,4 +11,5 @@ Last Updated: April 6th 2025 10:57:27 am
 """
 
 
+Module_Path = __path__[0]
 Version = "2.0.0-beta"
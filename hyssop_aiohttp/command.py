@@ -16,7 +16,7 @@ from hyssop.utils.func import join_path
 from hyssop.command import CommandProcessor
 
 from .server import AioHttpHyssopProject
-from . import Version
+from . import Module_Path, Version
 
 
 class AioHttpCommandProcessor(CommandProcessor):
@@ -24,22 +24,44 @@ class AioHttpCommandProcessor(CommandProcessor):
 
     def __init__(self):
         super().__init__()
+        self.project_dir = Module_Path
 
         start_parser = self.command_parsers.add_parser(
             AioHttpCommandProcessor.Command_Start_Server,
             help="start server with specfied server project directory path",
         )
         start_parser.add_argument(self.args_key_project_directory, help="path of server project directory")
+        start_parser.add_argument(
+            "-w", "--workers", type=int, default=1, help="number of server processes bind the port with reuse_port"
+        )
+        start_parser.add_argument(
+            "--preload",
+            action="store_true",
+            help="create the server before forking workers to share the preloaded memory",
+        )
         start_parser.set_defaults(command=AioHttpCommandProcessor.Command_Start_Server)
 
     def create_project(self):
         self.project = AioHttpHyssopProject(self.project_dir)
 
     def start(self) -> None:
-        from .server import AioHttpServer
+        if self.args.workers > 1:
+            from .server.supervisor import ServerSupervisor
+
+            ServerSupervisor(self.project_dir, self.args.workers, preload=self.args.preload).start()
+        else:
+            from .server import AioHttpServer
+
+            server = AioHttpServer(self.project_dir)
+            server.start()
+
+    def pack(self) -> None:
+        from hyssop.project.pack import add_pack_hook
+
+        from .server.static import precompress_static_files
 
-        server = AioHttpServer(self.project_dir)
-        server.start()
+        add_pack_hook(precompress_static_files)
+        super().pack()
 
     def version(self):
         print("hyssop-aiohttp {}".format(Version))
@@ -13,7 +13,19 @@ Last Updated: April 6th 2025 07:37:05 am
 from hyssop.component import ComponentTypes
 
 from .aio_client import AioClientComponent
+from .coalescing import CoalescingComponent
+from .compression import CompressionComponent
+from .executor import ExecutorComponent
+from .limiter import LimiterComponent
+from .metrics import MetricsComponent
+from .response_cache import ResponseCacheComponent
 
 
 class AioHttpComponentTypes(ComponentTypes):
     AioClient = AioClientComponent
+    Coalescing = CoalescingComponent
+    Compression = CompressionComponent
+    Executor = ExecutorComponent
+    Limiter = LimiterComponent
+    Metrics = MetricsComponent
+    Response_Cache = ResponseCacheComponent
@@ -0,0 +1,157 @@
+# Copyright (C) 2020-Present the hyssop authors and contributors.
+#
+# This module is part of hyssop and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+    CoalescingComponent:
+
+        - coalesce the identical concurrent GET requests of configured routes by the coalescing middleware, the
+          handler is executed once and the other requests are replied with the copies of its response:
+
+        component:
+            coalescing:
+                enabled:        <bool>          # enable coalescing middleware, default is False
+                routes:
+                    /items/{id}:                # path or route pattern of controller
+                        query:  <list>          # query args of key, all query args if not set
+                        vary:   <list>          # request headers of key
+
+        The requests are identical if their method, path, selected query args and vary headers are the same, so
+        vary should contain the request headers read by the handler. The requests with Authorization header are not
+        coalesced unless it is in vary. The handler is executed in a task not cancelled by the disconnection of the
+        first request. The streaming responses and the responses setting cookies are not shared, the waiting
+        requests execute the handler themselves.
+
+File created: October 19th 2026
+
+Modified By: hsky77
+Last Updated: October 19th 2026 22:15:09 pm
+"""
+
+import asyncio
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from aiohttp import hdrs, web
+from multidict import CIMultiDict
+from pydantic import BaseModel, Field
+
+from hyssop.component import Component
+
+CoalescingKey = Tuple[str, str, Tuple[Tuple[str, str], ...], Tuple[str, ...]]
+
+# status, reason, body and headers of the shared response
+ResponseSnapshot = Tuple[int, str, bytes, CIMultiDict]
+
+
+class CoalescingRouteConfig(BaseModel):
+    query: Optional[List[str]] = Field(None, description="query args of key, all query args if not set")
+    vary: List[str] = Field(default_factory=list, description="request headers of key")
+
+
+class CoalescingComponentConfig(BaseModel):
+    enabled: bool = Field(False, description="enable coalescing middleware")
+    routes: Dict[str, CoalescingRouteConfig] = Field(default_factory=dict, description="coalesced routes")
+
+
+def snapshot_response(response: web.StreamResponse) -> Optional[ResponseSnapshot]:
+    """return the snapshot of response to be copied, None if response should not be shared"""
+    if (
+        not isinstance(response, web.Response)
+        or response.prepared
+        or not isinstance(response.body, (bytes, bytearray))
+        or response.cookies
+        or hdrs.SET_COOKIE in response.headers
+    ):
+        return None
+    return response.status, response.reason, bytes(response.body), CIMultiDict(response.headers)
+
+
+class CoalescingComponent(Component[CoalescingComponentConfig]):
+    """default component coalesces the identical concurrent requests of routes"""
+
+    def init(self) -> None:
+        self.routes = {
+            route: (config, tuple(h.lower() for h in config.vary)) for route, config in self.config.routes.items()
+        }
+        self.__flights: Dict[CoalescingKey, "asyncio.Task[Tuple[web.StreamResponse, Optional[ResponseSnapshot]]]"] = {}
+        self.executions = 0
+        self.coalesced = 0
+        self.fallbacks = 0
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            **super().info(),
+            "metrics": {
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "fallbacks": self.fallbacks,
+                "in_flight": len(self.__flights),
+            },
+        }
+
+    def get_route(self, request: web.Request) -> Optional[str]:
+        """return the configured route of request, the path takes precedence over the route pattern"""
+        if request.path in self.routes:
+            return request.path
+        resource = request.match_info.route.resource
+        if resource is not None and resource.canonical in self.routes:
+            return resource.canonical
+        return None
+
+    def get_key(self, request: web.Request, route: str) -> Optional[CoalescingKey]:
+        """return coalescing key of request, None if request should not be coalesced"""
+        config, vary = self.routes[route]
+        if hdrs.AUTHORIZATION in request.headers and "authorization" not in vary:
+            return None
+
+        if config.query is None:
+            query = tuple(sorted(request.query.items()))
+        else:
+            query = tuple(sorted((k, v) for k, v in request.query.items() if k in config.query))
+        return (request.method, request.path, query, tuple(request.headers.get(h, "") for h in vary))
+
+    async def execute(
+        self,
+        key: CoalescingKey,
+        request: web.Request,
+        handler: Callable[[web.Request], Awaitable[web.StreamResponse]],
+    ) -> web.StreamResponse:
+        """execute handler once for the concurrent requests of key and return the copies of response to others"""
+        task = self.__flights.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._execute(request, handler))
+            self.__flights[key] = task
+            task.add_done_callback(partial(self._on_flight_done, key))
+            self.executions += 1
+            response, _ = await asyncio.shield(task)
+            if isinstance(response, web.HTTPException):
+                raise response
+            return response
+
+        self.coalesced += 1
+        _, snapshot = await asyncio.shield(task)
+        if snapshot is None:
+            self.fallbacks += 1
+            return await handler(request)
+
+        status, reason, body, headers = snapshot
+        return web.Response(status=status, reason=reason, body=body, headers=CIMultiDict(headers))
+
+    def _on_flight_done(self, key: CoalescingKey, task: "asyncio.Task") -> None:
+        if self.__flights.get(key) is task:
+            self.__flights.pop(key)
+        # retrieve the exception, it is not awaited if all the requests of key are cancelled
+        if not task.cancelled():
+            task.exception()
+
+    async def _execute(
+        self, request: web.Request, handler: Callable[[web.Request], Awaitable[web.StreamResponse]]
+    ) -> Tuple[web.StreamResponse, Optional[ResponseSnapshot]]:
+        try:
+            response = await handler(request)
+        except web.HTTPException as e:
+            response = e
+        # the snapshot is taken before the outer middlewares modify the response of first request
+        return response, snapshot_response(response)
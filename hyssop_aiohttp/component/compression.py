@@ -0,0 +1,174 @@
+# Copyright (C) 2020-Present the hyssop authors and contributors.
+#
+# This module is part of hyssop and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+    CompressionComponent:
+
+        - compress the responses of controllers by the compression middleware of hyssop_aiohttp.server:
+
+        component:
+            compression:
+                enabled:        <bool>          # enable compression middleware, default is False
+                min_size:       <int>           # bytes of the smallest body to compress
+                content_types:  <list>          # prefixes of content types to compress
+                codecs:         <list>          # preferred codecs in "br", "gzip" and "deflate"
+                levels:         <dict>          # {codec: level} of compression
+                executor_size:  <int>           # bodies larger than it are compressed in executor
+                streaming:      <bool>          # compress the chunked streaming responses with gzip or deflate
+
+        "br" requires brotli package, it is ignored if brotli is not installed.
+
+File created: October 19th 2026
+
+Modified By: hsky77
+Last Updated: October 19th 2026 16:58:03 pm
+"""
+
+import asyncio
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from hyssop.component import Component
+
+Compression_Codec_Brotli = "br"
+Compression_Codec_Gzip = "gzip"
+Compression_Codec_Deflate = "deflate"
+
+# codecs supported by aiohttp streaming compression
+Compression_Stream_Codecs = (Compression_Codec_Gzip, Compression_Codec_Deflate)
+
+
+def parse_accept_encoding(accept_encoding: str) -> Dict[str, float]:
+    """return {coding: qvalue} of Accept-Encoding header"""
+    codings = {}
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip()
+        if coding:
+            qvalue = 1.0
+            params = params.strip()
+            if params.startswith("q="):
+                try:
+                    qvalue = float(params[2:])
+                except ValueError:
+                    qvalue = 0.0
+            codings[coding] = qvalue
+    return codings
+
+
+def compress_bytes(codec: str, data: bytes, level: int) -> Tuple[bytes, float]:
+    """return compressed data and the cpu seconds of compression, it could be called in executor"""
+    start = time.thread_time()
+    if codec == Compression_Codec_Brotli:
+        import brotli
+
+        compressed = brotli.compress(data, quality=level)
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31 if codec == Compression_Codec_Gzip else 15)
+        compressed = compressor.compress(data) + compressor.flush()
+    return compressed, time.thread_time() - start
+
+
+class CompressionComponentConfig(BaseModel):
+    enabled: bool = Field(False, description="enable compression middleware")
+    min_size: int = Field(1024, description="bytes of the smallest body to compress")
+    content_types: List[str] = Field(
+        default_factory=lambda: [
+            "text/",
+            "application/json",
+            "application/javascript",
+            "application/xml",
+            "application/yaml",
+            "image/svg+xml",
+        ],
+        description="prefixes of content types to compress",
+    )
+    excluded_content_types: List[str] = Field(
+        default_factory=lambda: ["text/event-stream"], description="prefixes of content types not to compress"
+    )
+    codecs: List[str] = Field(
+        default_factory=lambda: [Compression_Codec_Brotli, Compression_Codec_Gzip, Compression_Codec_Deflate],
+        description="preferred codecs",
+    )
+    levels: Dict[str, int] = Field(
+        default_factory=lambda: {Compression_Codec_Brotli: 4, Compression_Codec_Gzip: 6, Compression_Codec_Deflate: 6},
+        description="compression levels of codecs",
+    )
+    executor_size: int = Field(64 * 1024, description="bodies larger than it are compressed in executor")
+    streaming: bool = Field(True, description="compress chunked streaming responses")
+
+
+class CompressionComponent(Component[CompressionComponentConfig]):
+    """default component for response compression settings and metrics"""
+
+    max_cached_accept_encodings = 256
+
+    def init(self) -> None:
+        try:
+            import brotli  # noqa: F401
+
+            self.codecs = list(self.config.codecs)
+        except ImportError:
+            self.codecs = [c for c in self.config.codecs if c != Compression_Codec_Brotli]
+
+        self.__selected_codecs: Dict[Tuple[str, bool], Optional[str]] = {}
+        self.responses = 0
+        self.streams = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cpu_seconds = 0.0
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            **super().info(),
+            "codecs": self.codecs,
+            "metrics": {
+                "compressed_responses": self.responses,
+                "compressed_streams": self.streams,
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+                "ratio": self.bytes_out / self.bytes_in if self.bytes_in else 0.0,
+                "cpu_seconds": self.cpu_seconds,
+            },
+        }
+
+    def is_compressible(self, content_type: str) -> bool:
+        return content_type.startswith(tuple(self.config.content_types)) and not content_type.startswith(
+            tuple(self.config.excluded_content_types)
+        )
+
+    def select_codec(self, accept_encoding: str, streaming: bool = False) -> Optional[str]:
+        """return the preferred codec accepted by client"""
+        key = (accept_encoding, streaming)
+        if key not in self.__selected_codecs:
+            codings = parse_accept_encoding(accept_encoding)
+            codec = None
+            for c in self.codecs:
+                if (not streaming or c in Compression_Stream_Codecs) and codings.get(c, codings.get("*", 0)) > 0:
+                    codec = c
+                    break
+
+            if len(self.__selected_codecs) >= self.max_cached_accept_encodings:
+                self.__selected_codecs.clear()
+            self.__selected_codecs[key] = codec
+        return self.__selected_codecs[key]
+
+    async def compress(self, codec: str, data: bytes) -> bytes:
+        """compress data with codec, the large data is compressed in executor"""
+        level = self.config.levels.get(codec, -1 if codec != Compression_Codec_Brotli else 4)
+        if len(data) > self.config.executor_size:
+            loop = asyncio.get_running_loop()
+            compressed, cpu_seconds = await loop.run_in_executor(None, compress_bytes, codec, data, level)
+        else:
+            compressed, cpu_seconds = compress_bytes(codec, data, level)
+
+        self.responses += 1
+        self.bytes_in += len(data)
+        self.bytes_out += len(compressed)
+        self.cpu_seconds += cpu_seconds
+        return compressed
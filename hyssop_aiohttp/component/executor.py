@@ -0,0 +1,225 @@
+# Copyright (C) 2020-Present the hyssop authors and contributors.
+#
+# This module is part of hyssop and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+    ExecutorComponent:
+
+        - run the blocking or cpu heavy functions in the named thread or process pools without blocking event loop:
+
+        component:
+            executor:
+                default_pool:   <str>           # pool used by loop.run_in_executor(None, ...), optional
+                pools:
+                    cpu:                        # name of pool
+                        type:           <str>   # "thread" or "process", default is "thread"
+                        max_workers:    <int>   # workers of pool, default of concurrent.futures if not set
+                        start_method:   <str>   # multiprocessing start method of process pool, optional
+
+        The "default" thread pool is always available. The pools are created when they are used first time.
+
+        - run function: await request.offload("cpu", func, *args, **kwargs)
+        - run sync route handler in thread pool:
+
+            from hyssop_aiohttp.component.executor import offload
+
+            @routes.get("/report")
+            @offload("io")
+            def report(request):
+                return web.json_response(build_report(request.query))
+
+        The cancellation of the awaiting request cancels the queued calls, the running calls are finished and their
+        results are dropped. The functions and arguments of process pools should be picklable.
+        The pools of the offload() route handlers are checked at server startup, the server fails to start if the
+        pool is not configured or is a process pool.
+
+File created: October 19th 2026
+
+Modified By: hsky77
+Last Updated: October 19th 2026 23:58:14 pm
+"""
+
+import asyncio
+import functools
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple, TypeVar
+
+from aiohttp import web
+from pydantic import BaseModel, Field
+
+from hyssop.component import Component
+
+T = TypeVar("T")
+
+Executor_Default_Pool = "default"
+Executor_Pool_Thread = "thread"
+Executor_Pool_Process = "process"
+Executor_Pool_Types = (Executor_Pool_Thread, Executor_Pool_Process)
+
+
+def run_timed(func: Callable[..., T], args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Tuple[float, T]:
+    """return the wall time func started and its result, it is called in the workers of pools"""
+    started_at = time.time()
+    return started_at, func(*args, **kwargs)
+
+
+class ExecutorPoolConfig(BaseModel):
+    type: str = Field(Executor_Pool_Thread, description='"thread" or "process"')
+    max_workers: Optional[int] = Field(None, description="workers of pool")
+    start_method: Optional[str] = Field(None, description="multiprocessing start method of process pool")
+
+
+class ExecutorComponentConfig(BaseModel):
+    default_pool: Optional[str] = Field(None, description="pool used by loop.run_in_executor(None, ...)")
+    pools: Dict[str, ExecutorPoolConfig] = Field(default_factory=dict, description="named pools")
+
+
+class ExecutorPool:
+    """named pool creates concurrent.futures executor when it is used first time and records the call metrics"""
+
+    def __init__(self, name: str, config: ExecutorPoolConfig):
+        if config.type not in Executor_Pool_Types:
+            raise ValueError(
+                "type of executor pool {} must be one of {}, but got: {}".format(
+                    name, ", ".join(Executor_Pool_Types), config.type
+                )
+            )
+        if config.type == Executor_Pool_Process:
+            # raise ValueError of unknown start method at init rather than the first call
+            multiprocessing.get_context(config.start_method)
+        self.name = name
+        self.config = config
+        self.__executor: Optional[Executor] = None
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.in_flight = 0
+        self.wait_seconds = 0.0
+        self.run_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    @property
+    def executor(self) -> Executor:
+        if self.__executor is None:
+            if self.config.type == Executor_Pool_Process:
+                self.__executor = ProcessPoolExecutor(
+                    max_workers=self.config.max_workers,
+                    mp_context=multiprocessing.get_context(self.config.start_method),
+                )
+            else:
+                self.__executor = ThreadPoolExecutor(
+                    max_workers=self.config.max_workers, thread_name_prefix="hyssop_{}".format(self.name)
+                )
+        return self.__executor
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """run func in pool and await the result, the cancellation cancels the queued call"""
+        submitted_at = time.time()
+        future = asyncio.wrap_future(self.executor.submit(run_timed, func, args, kwargs))
+        self.submitted += 1
+        self.in_flight += 1
+        try:
+            started_at, result = await future
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+        wait_seconds = max(0.0, started_at - submitted_at)
+        self.completed += 1
+        self.wait_seconds += wait_seconds
+        self.run_seconds += max(0.0, time.time() - started_at)
+        self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+        return result
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "in_flight": self.in_flight,
+            "wait_seconds": self.wait_seconds,
+            "run_seconds": self.run_seconds,
+            "max_wait_seconds": self.max_wait_seconds,
+        }
+
+    def shutdown(self) -> None:
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=False, cancel_futures=True)
+            self.__executor = None
+
+
+class ExecutorComponent(Component[ExecutorComponentConfig]):
+    """default component manages the named thread and process pools"""
+
+    def init(self) -> None:
+        self.pools: Dict[str, ExecutorPool] = {
+            name: ExecutorPool(name, config)
+            for name, config in {Executor_Default_Pool: ExecutorPoolConfig(), **self.config.pools}.items()
+        }
+        if self.config.default_pool is not None:
+            if self.get_pool(self.config.default_pool).config.type != Executor_Pool_Thread:
+                raise ValueError("default_pool must be a thread pool, but got: {}".format(self.config.default_pool))
+
+    async def start(self) -> None:
+        if self.config.default_pool is not None:
+            asyncio.get_running_loop().set_default_executor(self.get_pool(self.config.default_pool).executor)
+
+    def info(self) -> Dict[str, Any]:
+        metrics: Dict[str, Dict[str, Any]] = {}
+        for name, pool in self.pools.items():
+            for key, value in pool.info().items():
+                metrics.setdefault(key, {})[name] = value
+        return {**super().info(), "metrics": metrics}
+
+    def get_pool(self, name: str) -> ExecutorPool:
+        pool = self.pools.get(name, None)
+        if pool is None:
+            raise KeyError("executor pool {} is not configured".format(name))
+        return pool
+
+    def check_routes(self, routes: Iterable[web.AbstractRoute]) -> None:
+        """
+        check the pools of the route handlers decorated by offload(),
+        raise KeyError if the pool is not configured or TypeError if it is a process pool
+        """
+        for route in routes:
+            pool = getattr(route.handler, "offload_pool", None)
+            if pool is not None and self.get_pool(pool).config.type != Executor_Pool_Thread:
+                raise TypeError("route handler cannot run in process pool {}, use request.offload()".format(pool))
+
+    async def run(self, pool: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """run func in the named pool and await the result"""
+        return await self.get_pool(pool).run(func, *args, **kwargs)
+
+    async def dispose(self) -> None:
+        for pool in self.pools.values():
+            pool.shutdown()
+
+
+def offload(
+    pool: str = Executor_Default_Pool,
+) -> Callable[[Callable[[web.Request], web.StreamResponse]], Callable[[web.Request], Awaitable[web.StreamResponse]]]:
+    """
+    decorator runs the sync route handler in the thread pool of ExecutorComponent,
+    the pool is checked by ExecutorComponent.check_routes() at server startup
+    """
+
+    def decorator(handler: Callable[[web.Request], web.StreamResponse]):
+        @functools.wraps(handler)
+        async def wrapper(request: web.Request) -> web.StreamResponse:
+            return await request.app.component_manager.get_component("executor").run(pool, handler, request)
+
+        wrapper.offload_pool = pool  # type: ignore
+        return wrapper
+
+    return decorator
@@ -0,0 +1,195 @@
+# Copyright (C) 2020-Present the hyssop authors and contributors.
+#
+# This module is part of hyssop and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+    LimiterComponent:
+
+        - limit the concurrent requests by the limiter middleware, the requests over the limits wait in a bounded
+          queue and are replied "503 Service Unavailable" with Retry-After header if the queue is full or timeout:
+
+        component:
+            limiter:
+                enabled:            <bool>      # enable limiter middleware, default is False
+                max_in_flight:      <int>       # max concurrent requests of server, 0 is unlimited
+                queue_size:         <int>       # max waiting requests
+                queue_timeout:      <float>     # seconds to wait in queue
+                adaptive:           <bool>      # adjust the limit by latency, max_in_flight is the upper bound
+                target_latency:     <float>     # seconds of the latency to decrease the adaptive limit
+                min_in_flight:      <int>       # lower bound of the adaptive limit
+                decrease_ratio:     <float>     # multiplier of the adaptive limit when latency is over target
+                retry_after:        <int>       # seconds of Retry-After header
+                exempt_routes:      <list>      # routes are not limited, default is ["/metrics"]
+                routes:
+                    /items/{id}:                # path or route pattern of controller
+                        max_in_flight:  <int>   # the same settings of limit above
+                        ...
+
+        The route limits are acquired before the server limit, so the requests waiting for a busy route do not
+        hold the slots of server. The adaptive limit is AIMD, it increases by 1 / limit for each request completed
+        within target_latency when the limit is in use, and is multiplied by decrease_ratio at most once per
+        target_latency when the latency is over target_latency.
+
+File created: October 19th 2026
+
+Modified By: hsky77
+Last Updated: October 19th 2026 18:56:02 pm
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from hyssop.component import Component
+
+Limiter_Server_Key = "server"
+
+
+class LimitConfig(BaseModel):
+    max_in_flight: int = Field(0, description="max concurrent requests, 0 is unlimited")
+    queue_size: int = Field(64, description="max waiting requests")
+    queue_timeout: float = Field(0.5, description="seconds to wait in queue")
+    adaptive: bool = Field(False, description="adjust the limit by latency, max_in_flight is the upper bound")
+    target_latency: float = Field(0.1, description="seconds of the latency to decrease the adaptive limit")
+    min_in_flight: int = Field(1, description="lower bound of the adaptive limit")
+    decrease_ratio: float = Field(0.9, description="multiplier of the adaptive limit when latency is over target")
+
+
+class LimiterComponentConfig(LimitConfig):
+    enabled: bool = Field(False, description="enable limiter middleware")
+    retry_after: int = Field(1, description="seconds of Retry-After header")
+    exempt_routes: List[str] = Field(default_factory=lambda: ["/metrics"], description="routes are not limited")
+    routes: Dict[str, LimitConfig] = Field(default_factory=dict, description="limits of routes")
+
+
+class ConcurrencyLimit:
+    """concurrency limit with a bounded wait queue, the released slots are handed to the waiters in order"""
+
+    def __init__(self, config: LimitConfig):
+        self.config = config
+        self.limit = float(config.max_in_flight)
+        self.in_flight = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+        self.accepted = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.last_decreased_at = 0.0
+
+    async def acquire(self) -> bool:
+        """return True if the slot is acquired, False if the queue is full or timeout"""
+        if self.in_flight < int(self.limit) and not self.waiters:
+            self.in_flight += 1
+            self.accepted += 1
+            return True
+
+        if len(self.waiters) >= self.config.queue_size:
+            self.rejected += 1
+            return False
+
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self.waiters.append(waiter)
+        handle = loop.call_later(self.config.queue_timeout, self._timeout, waiter)
+        try:
+            acquired = await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled() and waiter.result():
+                self.release()
+            elif waiter in self.waiters:
+                self.waiters.remove(waiter)
+            raise
+        finally:
+            handle.cancel()
+
+        if acquired:
+            self.accepted += 1
+        else:
+            self.timeouts += 1
+            self.rejected += 1
+        return acquired
+
+    def release(self) -> None:
+        """release the slot, it is handed to the first waiter if the limit is not exceeded"""
+        if self.in_flight <= int(self.limit):
+            while self.waiters:
+                waiter = self.waiters.popleft()
+                if not waiter.done():
+                    waiter.set_result(True)
+                    return
+        self.in_flight -= 1
+        self._wake_waiters()
+
+    def observe(self, latency: float) -> None:
+        """update the adaptive limit by the latency of completed request"""
+        if not self.config.adaptive:
+            return
+
+        if latency > self.config.target_latency:
+            now = time.monotonic()
+            if now - self.last_decreased_at >= self.config.target_latency:
+                self.last_decreased_at = now
+                self.limit = max(float(self.config.min_in_flight), self.limit * self.config.decrease_ratio)
+        elif self.in_flight + len(self.waiters) >= self.limit / 2:
+            self.limit = min(float(self.config.max_in_flight), self.limit + 1 / self.limit)
+            self._wake_waiters()
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "queued": len(self.waiters),
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+        }
+
+    def _timeout(self, waiter: asyncio.Future) -> None:
+        if not waiter.done():
+            waiter.set_result(False)
+            self.waiters.remove(waiter)
+
+    def _wake_waiters(self) -> None:
+        while self.waiters and self.in_flight < int(self.limit):
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(True)
+
+
+class LimiterComponent(Component[LimiterComponentConfig]):
+    """default component limits the concurrent requests of server and routes"""
+
+    def init(self) -> None:
+        self.limits: Dict[str, ConcurrencyLimit] = {
+            route: ConcurrencyLimit(config) for route, config in self.config.routes.items() if config.max_in_flight > 0
+        }
+        self.server_limit = ConcurrencyLimit(self.config) if self.config.max_in_flight > 0 else None
+        self.exempt_routes = frozenset(self.config.exempt_routes)
+
+    def info(self) -> Dict[str, Any]:
+        limits = dict(self.limits)
+        if self.server_limit is not None:
+            limits[Limiter_Server_Key] = self.server_limit
+
+        metrics: Dict[str, Dict[str, int]] = {}
+        for route, limit in limits.items():
+            for name, value in limit.info().items():
+                metrics.setdefault(name, {})[route] = value
+        return {**super().info(), "metrics": metrics}
+
+    def get_limits(self, path: str, route: Optional[str]) -> List[ConcurrencyLimit]:
+        """return the limits of request in acquiring order, the path takes precedence over the route pattern"""
+        if path in self.exempt_routes or route in self.exempt_routes:
+            return []
+
+        limits = []
+        limit = self.limits.get(path, None) or self.limits.get(route, None)
+        if limit is not None:
+            limits.append(limit)
+        if self.server_limit is not None:
+            limits.append(self.server_limit)
+        return limits
@@ -0,0 +1,192 @@
+# Copyright (C) 2020-Present the hyssop authors and contributors.
+#
+# This module is part of hyssop and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+    MetricsComponent:
+
+        - record the request metrics of routes by the metrics middleware and render them at metrics endpoint:
+
+        component:
+            metrics:
+                enabled:        <bool>          # enable metrics middleware and endpoint, default is False
+                path:           <str>           # route of metrics endpoint, default is "/metrics"
+                buckets:        <list>          # upper bounds in seconds of latency histogram
+                components:     <bool>          # render the "metrics" in info() of components
+
+        The endpoint renders Prometheus text format of per route latency histograms, in-flight gauges, status code
+        counters and request/response sizes. The numeric values in info()["metrics"] of components are rendered as
+        "hyssop_<component>_<metric>" gauges. The routes are labeled by the route patterns, the unmatched requests
+        are labeled as "unmatched". The metrics are kept per process, each worker of "--workers" has its own metrics.
+
+File created: October 19th 2026
+
+Modified By: hsky77
+Last Updated: October 19th 2026 18:20:37 pm
+"""
+
+import re
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from hyssop.component import Component
+
+Metrics_Content_Type = "text/plain; version=0.0.4; charset=utf-8"
+Metrics_Unmatched_Route = "unmatched"
+
+RouteKey = Tuple[str, str]  # (method, route)
+
+
+def escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels: Dict[str, str]) -> str:
+    return "{" + ",".join('{}="{}"'.format(k, escape_label_value(v)) for k, v in labels.items()) + "}"
+
+
+def format_metric_name(name: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+
+def format_value(value: float) -> str:
+    if isinstance(value, float):
+        return "+Inf" if value == float("inf") else repr(value)
+    return str(int(value))
+
+
+class RouteMetrics:
+    """request metrics of a route"""
+
+    __slots__ = (
+        "buckets",
+        "count",
+        "sum",
+        "in_flight",
+        "statuses",
+        "request_bytes",
+        "response_bytes",
+    )
+
+    def __init__(self, bucket_count: int):
+        self.buckets = [0] * (bucket_count + 1)  # the last one is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.in_flight = 0
+        self.statuses: Dict[int, int] = {}
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+
+class MetricsComponentConfig(BaseModel):
+    enabled: bool = Field(False, description="enable metrics middleware and endpoint")
+    path: str = Field("/metrics", description="route of metrics endpoint")
+    buckets: List[float] = Field(
+        default_factory=lambda: [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0],
+        description="upper bounds in seconds of latency histogram",
+    )
+    components: bool = Field(True, description="render the metrics in info() of components")
+
+
+class MetricsComponent(Component[MetricsComponentConfig]):
+    """default component records the request metrics of routes"""
+
+    def init(self) -> None:
+        self.buckets = sorted(self.config.buckets)
+        self.routes: Dict[RouteKey, RouteMetrics] = {}
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            **super().info(),
+            "metrics": {
+                "requests": sum(m.count for m in self.routes.values()),
+                "in_flight": sum(m.in_flight for m in self.routes.values()),
+            },
+        }
+
+    def get_route_metrics(self, method: str, route: Optional[str]) -> RouteMetrics:
+        key = (method, route or Metrics_Unmatched_Route)
+        metrics = self.routes.get(key)
+        if metrics is None:
+            metrics = self.routes[key] = RouteMetrics(len(self.buckets))
+        return metrics
+
+    def observe(
+        self, metrics: RouteMetrics, seconds: float, status: int, request_bytes: int, response_bytes: int
+    ) -> None:
+        metrics.buckets[bisect_left(self.buckets, seconds)] += 1
+        metrics.count += 1
+        metrics.sum += seconds
+        metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+        metrics.request_bytes += request_bytes
+        metrics.response_bytes += response_bytes
+
+    def render(self) -> str:
+        """return the metrics in Prometheus text format"""
+        lines: List[str] = []
+        routes = sorted(self.routes.items())
+
+        lines.append("# HELP hyssop_http_requests_total Count of handled requests.")
+        lines.append("# TYPE hyssop_http_requests_total counter")
+        for (method, route), metrics in routes:
+            for status, count in sorted(metrics.statuses.items()):
+                labels = format_labels({"method": method, "route": route, "status": str(status)})
+                lines.append("hyssop_http_requests_total{} {}".format(labels, count))
+
+        lines.append("# HELP hyssop_http_requests_in_flight Count of requests being handled.")
+        lines.append("# TYPE hyssop_http_requests_in_flight gauge")
+        for (method, route), metrics in routes:
+            labels = format_labels({"method": method, "route": route})
+            lines.append("hyssop_http_requests_in_flight{} {}".format(labels, metrics.in_flight))
+
+        lines.append("# HELP hyssop_http_request_duration_seconds Latency of request handlers.")
+        lines.append("# TYPE hyssop_http_request_duration_seconds histogram")
+        for (method, route), metrics in routes:
+            cumulative = 0
+            for le, count in zip(self.buckets + [float("inf")], metrics.buckets):
+                cumulative += count
+                labels = format_labels({"method": method, "route": route, "le": format_value(float(le))})
+                lines.append("hyssop_http_request_duration_seconds_bucket{} {}".format(labels, cumulative))
+            labels = format_labels({"method": method, "route": route})
+            lines.append("hyssop_http_request_duration_seconds_sum{} {}".format(labels, repr(metrics.sum)))
+            lines.append("hyssop_http_request_duration_seconds_count{} {}".format(labels, metrics.count))
+
+        for name, attr, description in (
+            ("request", "request_bytes", "Bytes of request bodies."),
+            ("response", "response_bytes", "Bytes of response bodies."),
+        ):
+            lines.append("# HELP hyssop_http_{}_size_bytes {}".format(name, description))
+            lines.append("# TYPE hyssop_http_{}_size_bytes summary".format(name))
+            for (method, route), metrics in routes:
+                labels = format_labels({"method": method, "route": route})
+                lines.append("hyssop_http_{}_size_bytes_sum{} {}".format(name, labels, getattr(metrics, attr)))
+                lines.append("hyssop_http_{}_size_bytes_count{} {}".format(name, labels, metrics.count))
+
+        if self.config.components:
+            for component in self.component_manager.components:
+                if component is not self:
+                    metrics = component.info().get("metrics", None)
+                    if isinstance(metrics, dict):
+                        lines.extend(self.render_component_metrics(component.name, metrics))
+
+        lines.append("")
+        return "\n".join(lines)
+
+    def render_component_metrics(self, component_name: str, metrics: Dict[str, Any]) -> List[str]:
+        """render the numeric metrics as gauges, the dicts of numeric values are labeled by "key" """
+        lines = []
+        for key, value in metrics.items():
+            name = format_metric_name("hyssop_{}_{}".format(component_name, key))
+            if isinstance(value, (int, float)):
+                lines.append("# TYPE {} gauge".format(name))
+                lines.append("{} {}".format(name, format_value(value)))
+            elif isinstance(value, dict):
+                values = [(str(k), v) for k, v in value.items() if isinstance(v, (int, float))]
+                if values:
+                    lines.append("# TYPE {} gauge".format(name))
+                    for k, v in values:
+                        lines.append("{}{} {}".format(name, format_labels({"key": k}), format_value(v)))
+        return lines
@@ -0,0 +1,223 @@
+# Copyright (C) 2020-Present the hyssop authors and contributors.
+#
+# This module is part of hyssop and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+    ResponseCacheComponent:
+
+        - cache the GET and HEAD responses of configured routes in memory by the response cache middleware:
+
+        component:
+            response_cache:
+                enabled:        <bool>          # enable response cache middleware, default is False
+                max_size:       <int>           # bytes of cached bodies
+                max_body_size:  <int>           # the larger bodies are not cached
+                routes:
+                    /items/{id}:                # path or route pattern of controller
+                        ttl:    <float>         # seconds to keep response
+                        query:  <list>          # query args of cache key, all query args if not set
+                        vary:   <list>          # request headers of cache key
+
+        The headers of response "Vary" header are added to the cache key of route, the responses with
+        Set-Cookie, "Cache-Control: private" or "no-store" are not cached, the requests with Authorization header are
+        not cached unless it is in vary. The ETag of body digest is added to the responses without ETag. The 304 replies
+        have the ETag, Cache-Control, Content-Location, Expires and Vary headers of cached response.
+
+File created: October 19th 2026
+
+Modified By: hsky77
+Last Updated: October 19th 2026 22:03:37 pm
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from aiohttp import hdrs, web
+from multidict import CIMultiDict
+from pydantic import BaseModel, Field
+
+from hyssop.component import Component
+
+CacheKey = Tuple[str, str, Tuple[Tuple[str, str], ...], Tuple[str, ...]]
+
+# headers not replayed from cache
+Response_Cache_Skip_Headers = frozenset(
+    h.lower() for h in (hdrs.CONTENT_LENGTH, hdrs.DATE, hdrs.TRANSFER_ENCODING, hdrs.CONNECTION, hdrs.KEEP_ALIVE)
+)
+
+# headers of 304 reply, RFC 7232 section 4.1
+Response_Cache_Not_Modified_Headers = (hdrs.ETAG, hdrs.CACHE_CONTROL, hdrs.CONTENT_LOCATION, hdrs.EXPIRES, hdrs.VARY)
+
+
+class ResponseCacheRouteConfig(BaseModel):
+    ttl: float = Field(1.0, description="seconds to keep response")
+    query: Optional[List[str]] = Field(None, description="query args of cache key, all query args if not set")
+    vary: List[str] = Field(default_factory=list, description="request headers of cache key")
+
+
+class ResponseCacheComponentConfig(BaseModel):
+    enabled: bool = Field(False, description="enable response cache middleware")
+    max_size: int = Field(64 * 1024 * 1024, description="bytes of cached bodies")
+    max_body_size: int = Field(1024 * 1024, description="the larger bodies are not cached")
+    routes: Dict[str, ResponseCacheRouteConfig] = Field(default_factory=dict, description="cached routes")
+
+
+class CachedResponse:
+    __slots__ = ("status", "body", "headers", "etag", "expires_at")
+
+    def __init__(self, status: int, body: bytes, headers: CIMultiDict, etag: str, expires_at: float):
+        self.status = status
+        self.body = body
+        self.headers = headers
+        self.etag = etag
+        self.expires_at = expires_at
+
+    def is_not_modified(self, request: web.Request) -> bool:
+        if_none_match = request.if_none_match
+        if if_none_match is None:
+            return False
+        etag = self.etag[2:] if self.etag.startswith("W/") else self.etag
+        return any(e.value == "*" or '"{}"'.format(e.value) == etag for e in if_none_match)
+
+    def make_not_modified_response(self) -> web.Response:
+        headers: CIMultiDict = CIMultiDict()
+        for header in Response_Cache_Not_Modified_Headers:
+            for value in self.headers.getall(header, ()):
+                headers.add(header, value)
+        return web.Response(status=304, headers=headers)
+
+    def make_response(self, request: web.Request) -> web.Response:
+        if self.is_not_modified(request):
+            return self.make_not_modified_response()
+        return web.Response(status=self.status, body=self.body, headers=self.headers)
+
+
+class ResponseCacheComponent(Component[ResponseCacheComponentConfig]):
+    """default component for caching the responses of routes"""
+
+    def init(self) -> None:
+        self.routes = {
+            route: (config, tuple(sorted(h.lower() for h in config.vary)))
+            for route, config in self.config.routes.items()
+        }
+        self.__route_vary: Dict[str, Tuple[str, ...]] = {}  # vary headers of routes learned from responses
+        self.__responses: "OrderedDict[CacheKey, CachedResponse]" = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            **super().info(),
+            "metrics": {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / (self.hits + self.misses) if self.hits + self.misses else 0.0,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "entries": len(self.__responses),
+                "size": self.size,
+            },
+        }
+
+    def get_route(self, request: web.Request) -> Optional[str]:
+        """return the configured route of request, the path takes precedence over the route pattern"""
+        if request.path in self.routes:
+            return request.path
+        resource = request.match_info.route.resource
+        if resource is not None and resource.canonical in self.routes:
+            return resource.canonical
+        return None
+
+    def get_key(self, request: web.Request, route: str) -> Optional[CacheKey]:
+        """return cache key of request, None if request should not be cached"""
+        config, vary = self.routes[route]
+        vary = self.__route_vary.get(route, vary)
+        if hdrs.AUTHORIZATION in request.headers and "authorization" not in vary:
+            return None
+
+        if config.query is None:
+            query = tuple(sorted(request.query.items()))
+        else:
+            query = tuple(sorted((k, v) for k, v in request.query.items() if k in config.query))
+        return (request.method, request.path, query, tuple(request.headers.get(h, "") for h in vary))
+
+    def get(self, key: CacheKey) -> Optional[CachedResponse]:
+        cached = self.__responses.get(key)
+        if cached is not None and cached.expires_at <= time.monotonic():
+            self.pop(key)
+            self.expirations += 1
+            cached = None
+
+        if cached is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.__responses.move_to_end(key)
+        return cached
+
+    def put(self, request: web.Request, route: str, response: web.Response) -> Optional[CachedResponse]:
+        """cache the response if it is cacheable and return the cached response"""
+        body = response.body
+        if (
+            response.status != 200
+            or not isinstance(body, (bytes, bytearray))
+            or len(body) > min(self.config.max_body_size, self.config.max_size)
+            or hdrs.SET_COOKIE in response.headers
+            or response.cookies
+        ):
+            return None
+
+        cache_control = response.headers.get(hdrs.CACHE_CONTROL, "").lower()
+        if "no-store" in cache_control or "private" in cache_control:
+            return None
+
+        config, vary = self.routes[route]
+        response_vary = response.headers.get(hdrs.VARY, "")
+        if response_vary:
+            if "*" in response_vary:
+                return None
+            vary = tuple(sorted(set(vary) | set(h.strip().lower() for h in response_vary.split(",") if h.strip())))
+        self.__route_vary[route] = vary
+
+        key = self.get_key(request, route)
+        if key is None:
+            return None
+
+        body = bytes(body)
+        etag = response.headers.get(hdrs.ETAG)
+        if etag is None:
+            etag = '"{}"'.format(hashlib.blake2b(body, digest_size=16).hexdigest())
+            response.headers[hdrs.ETAG] = etag
+
+        headers = CIMultiDict(
+            (k, v) for k, v in response.headers.items() if k.lower() not in Response_Cache_Skip_Headers
+        )
+        cached = CachedResponse(200, body, headers, etag, time.monotonic() + config.ttl)
+
+        self.pop(key)
+        while self.__responses and self.size + len(body) > self.config.max_size:
+            _, evicted = self.__responses.popitem(last=False)
+            self.size -= len(evicted.body)
+            self.evictions += 1
+        self.__responses[key] = cached
+        self.size += len(body)
+        self.stores += 1
+        return cached
+
+    def pop(self, key: CacheKey) -> Optional[CachedResponse]:
+        cached = self.__responses.pop(key, None)
+        if cached is not None:
+            self.size -= len(cached.body)
+        return cached
+
+    def clear(self) -> None:
+        self.__responses.clear()
+        self.size = 0
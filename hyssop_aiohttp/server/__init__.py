@@ -1,9 +1,11 @@
 import asyncio
-from os import mkdir
-from os.path import isdir, isfile
-from typing import Any, Dict, List, Optional, Type
+from inspect import isclass
+from os.path import isfile
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Type, TypeVar
 
 from aiohttp import web
+from pydantic import BaseModel, TypeAdapter, ValidationError
 
 from hyssop.component import add_default_component_module_path
 from hyssop.component.constants import LocalCode_File_Not_Found
@@ -13,11 +15,19 @@ from hyssop.utils.func import join_path
 
 from .base import ControllerTypes
 
+ModelT = TypeVar("ModelT")
+T = TypeVar("T")
+
 routes = web.RouteTableDef()
 add_default_component_module_path("hyssop_aiohttp.component")
 
 
 class AioHttpRequest(web.Request):
+    ATTRS = web.Request.ATTRS | frozenset(["_parsed_body", "_arguments"])
+
+    _parsed_body: Optional[Mapping[str, Any]] = None
+    _arguments: Optional[Mapping[str, Any]] = None
+
     @property
     def app(self) -> "AioHttpApplication":
         return super().app  # type: ignore
@@ -36,18 +46,26 @@ class AioHttpRequest(web.Request):
     def get_message(self, code: int, *args: Any):
         return self.component_manager.get_message(code, *args)
 
+    async def get_arguments(self) -> Mapping[str, Any]:
+        """
+        Get read-only merged arguments of query string and body data.
+        The body is parsed and merged with query string once per request.
+        """
+        if self._arguments is None:
+            if self._parsed_body is None:
+                if self.content_type == "application/json":
+                    self._parsed_body = await self.json()
+                else:
+                    self._parsed_body = await self.post()
+            self._arguments = MappingProxyType({**self.query, **self._parsed_body})
+        return self._arguments
+
     async def get_argument(self, name: str, *default) -> Any:
         """
         Get argument from query string or body data.
         Return default or raise HTTPBadRequest exception if that does not exist.
         """
-        if not hasattr(self, "_parsed_body"):
-            if self.content_type == "application/json":
-                self._parsed_body = await self.json()
-            else:
-                self._parsed_body = await self.post()
-
-        data = {**self.query, **self._parsed_body}
+        data = self._arguments if self._arguments is not None else await self.get_arguments()
         if name in data:
             return data[name]
         else:
@@ -56,21 +74,50 @@ class AioHttpRequest(web.Request):
             else:
                 raise web.HTTPBadRequest(text=str(KeyError(name)))
 
-    async def get_arguments_dict(self, keys: Optional[List[str]] = None):
+    async def get_arguments_dict(self, keys: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Get arguments dict from query string or body data with indicated args.
         """
-        if not hasattr(self, "_parsed_body"):
-            if self.content_type == "application/json":
-                self._parsed_body = await self.json()
-            else:
-                self._parsed_body = await self.post()
-
-        data = {**self.query, **self._parsed_body}
+        data = await self.get_arguments()
         if keys:
             return {k: v for k, v in data.items() if k in keys}
         else:
-            return data
+            return dict(data)
+
+    async def offload(self, pool: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run func in the named thread or process pool of executor component and await the result.
+        The queued call is cancelled if the request is cancelled.
+        """
+        return await self.component_manager.get_component("executor").run(pool, func, *args, **kwargs)
+
+    async def parse_arguments(self, model: Type[ModelT]) -> ModelT:
+        """
+        Parse arguments from query string and body data to pydantic model, dataclass or typed dict.
+        Raise HTTPBadRequest exception with the validation errors if arguments are invalid.
+        """
+        validate = get_arguments_validator(model)
+        try:
+            return validate(dict(await self.get_arguments()))
+        except ValidationError as e:
+            raise web.HTTPBadRequest(
+                text=e.json(include_url=False, include_context=False), content_type="application/json"
+            )
+
+
+_arguments_validators: Dict[Any, Callable[[Mapping[str, Any]], Any]] = {}
+
+
+def get_arguments_validator(model: Type[ModelT]) -> Callable[[Mapping[str, Any]], ModelT]:
+    """return the cached validator of model that validates arguments in lax mode"""
+    validator = _arguments_validators.get(model)
+    if validator is None:
+        if isclass(model) and issubclass(model, BaseModel):
+            validator = model.model_validate
+        else:
+            validator = TypeAdapter(model).validate_python
+        _arguments_validators[model] = validator
+    return validator
 
 
 class AioHttpHyssopProject(HyssopProject):
@@ -111,25 +158,16 @@ class AioHttpHyssopProject(HyssopProject):
     def create_controllers(self):
         return ControllerTypes.get_dynamic_classes_types(self.controller_module)
 
+    def create_static_routes(self) -> List[web.RouteDef]:
+        """create the routes of "static_file" and "www" in aiohttp config"""
+        from .static import create_static_routes
+
+        return create_static_routes(self.project_dir, self.config.get("aiohttp", None))
+
     def init_controllers(self):
         controller_types = self.create_controllers()
         aiohttp_data: Optional[Dict[str, Any]] = self.config.get("aiohttp", None)
         if aiohttp_data:
-            static_file: Optional[Dict[str, Any]] = aiohttp_data.get("static_file", None)
-            if static_file:
-                for k, v in static_file.items():
-                    path = self.project_dir + k
-                    if not isdir(path):
-                        mkdir(path)
-                    # add_routes([web.static(k, path, **v)])
-
-            www: Optional[str] = aiohttp_data.get("www", None)
-            if www:
-                path = f"{self.project_dir}/{www}"
-                if not isdir(path):
-                    mkdir(path)
-                # self.add_routes([web.static("/", path)])
-
             route_decorators: Optional[List[str]] = aiohttp_data.get("route_decorators", None)
             if route_decorators:
                 for controller_type in controller_types:
@@ -185,6 +223,11 @@ class AioHttpApplication(web.Application):
         return self.project.port
 
     async def start_components(self, app: web.Application):
+        from ..component import AioHttpComponentTypes
+
+        # the executor component is required by the offload() route handlers
+        if any(hasattr(route.handler, "offload_pool") for route in self.router.routes()):
+            self.component_manager.get_component(AioHttpComponentTypes.Executor).check_routes(self.router.routes())
         await self.component_manager.start_components()
 
     async def dispose_components(self, app: web.Application):
@@ -196,6 +239,7 @@ class AioHttpApplication(web.Application):
         self.project = project
         self.component_manager = project.create_component_manager()
         self.project.init_controllers()
+        self.init_middlewares()
         self.on_startup.append(self.start_components)
         self.on_cleanup.append(self.dispose_components)
 
@@ -203,6 +247,48 @@ class AioHttpApplication(web.Application):
         comp.default_loggers += ["aiohttp.access", "aiohttp.web", "aiohttp.server"]
         comp.update_default_logger(project.debug)
 
+    def init_middlewares(self):
+        """add the middlewares of enabled components in order"""
+        from hyssop.component import DefaultComponentTypes
+
+        from ..component import AioHttpComponentTypes
+        from .middleware import (
+            create_coalescing_middleware,
+            create_compression_middleware,
+            create_compression_prepare_hook,
+            create_limiter_middleware,
+            create_log_context_middleware,
+            create_metrics_handler,
+            create_metrics_middleware,
+            create_response_cache_middleware,
+        )
+
+        logger = self.component_manager.get_component(DefaultComponentTypes.Logger)
+        if logger.config.log_format == "json":
+            self.middlewares.append(create_log_context_middleware())
+
+        metrics = self.component_manager.get_component(AioHttpComponentTypes.Metrics)
+        if metrics.config.enabled:
+            self.middlewares.append(create_metrics_middleware(metrics))
+            self.router.add_get(metrics.config.path, create_metrics_handler(metrics))
+
+        response_cache = self.component_manager.get_component(AioHttpComponentTypes.Response_Cache)
+        if response_cache.config.enabled:
+            self.middlewares.append(create_response_cache_middleware(response_cache))
+
+        limiter = self.component_manager.get_component(AioHttpComponentTypes.Limiter)
+        if limiter.config.enabled:
+            self.middlewares.append(create_limiter_middleware(limiter))
+
+        compression = self.component_manager.get_component(AioHttpComponentTypes.Compression)
+        if compression.config.enabled:
+            self.middlewares.append(create_compression_middleware(compression))
+            self.on_response_prepare.append(create_compression_prepare_hook(compression))
+
+        coalescing = self.component_manager.get_component(AioHttpComponentTypes.Coalescing)
+        if coalescing.config.enabled:
+            self.middlewares.append(create_coalescing_middleware(coalescing))
+
     def _make_request(
         self,
         message,
@@ -232,6 +318,9 @@ class AioHttpServer:
         self.app = AioHttpApplication()
         self.app.init_server_with_project(AioHttpHyssopProject(project_dir))
         self.app.add_routes(routes)
+        # static routes are added last since "www" matches all paths
+        self.app.add_routes(self.app.project.create_static_routes())
 
-    def start(self):
-        web.run_app(self.app, port=self.app.port, ssl_context=self.app.project.ssl_context)
+    def start(self, reuse_port: Optional[bool] = None):
+        self.app.project.set_event_loop_policy()
+        web.run_app(self.app, port=self.app.port, ssl_context=self.app.project.ssl_context, reuse_port=reuse_port)
@@ -0,0 +1,240 @@
+# Copyright (C) 2020-Present the hyssop authors and contributors.
+#
+# This module is part of hyssop and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+File created: October 19th 2026
+
+Modified By: hsky77
+Last Updated: October 19th 2026 23:20:41 pm
+
+Middlewares of AioHttpApplication created from the settings of components.
+
+The compression middleware compresses the bodies of web.Response returned by controllers. The streaming responses
+prepared and written by controllers are compressed chunk by chunk by the aiohttp writer enabled in the
+on_response_prepare signal. The responses already encoded or enabled compression by controllers, FileResponse and
+server-sent events are not compressed.
+
+The response cache middleware replies the cached GET responses of configured routes and 304 to the conditional
+requests. It is added before the compression middleware so the compressed bodies are cached by Accept-Encoding.
+
+The limiter middleware is added after the response cache middleware so the cache hits are not limited, and before
+the compression middleware so the compression is counted in the latency of adaptive limits.
+
+The coalescing middleware is the innermost middleware, so the shared responses are not compressed yet and each
+request is compressed by its own Accept-Encoding.
+
+The metrics middleware records the latency, status and sizes of all requests including the ones replied by the other
+middlewares.
+
+The log context middleware is the outermost middleware when the logger component formats json lines, the records
+logged while handling the request carry its request id, method, path and elapsed time.
+"""
+
+import time
+from typing import Awaitable, Callable
+from uuid import uuid4
+
+from aiohttp import hdrs, web
+
+from hyssop.utils.logger import log_context
+
+from ..component.coalescing import CoalescingComponent
+from ..component.compression import CompressionComponent
+from ..component.limiter import LimiterComponent
+from ..component.metrics import Metrics_Content_Type, MetricsComponent
+from ..component.response_cache import ResponseCacheComponent
+
+Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+Middleware = Callable[[web.Request, Handler], Awaitable[web.StreamResponse]]
+ResponsePrepareHook = Callable[[web.Request, web.StreamResponse], Awaitable[None]]
+
+Uncompressible_Status = frozenset([204, 206, 304])
+
+Request_Id_Header = "X-Request-ID"
+
+
+def add_vary_header(response: web.StreamResponse, header: str) -> None:
+    vary = response.headers.get(hdrs.VARY)
+    if not vary:
+        response.headers[hdrs.VARY] = header
+    elif header.lower() not in vary.lower():
+        response.headers[hdrs.VARY] = "{}, {}".format(vary, header)
+
+
+def is_compressible_response(component: CompressionComponent, response: web.StreamResponse) -> bool:
+    return (
+        response.status >= 200
+        and response.status not in Uncompressible_Status
+        and hdrs.CONTENT_ENCODING not in response.headers
+        # the response enabled compression is compressed by aiohttp when it is prepared
+        and not response.compression
+        and "no-transform" not in response.headers.get(hdrs.CACHE_CONTROL, "")
+        and component.is_compressible(response.content_type)
+    )
+
+
+def create_compression_middleware(component: CompressionComponent) -> Middleware:
+    @web.middleware
+    async def compression_middleware(request: web.Request, handler: Handler) -> web.StreamResponse:
+        response = await handler(request)
+        if (
+            isinstance(response, web.Response)
+            and not response.prepared
+            and isinstance(response.body, (bytes, bytearray))
+            and len(response.body) >= component.config.min_size
+            and is_compressible_response(component, response)
+        ):
+            add_vary_header(response, hdrs.ACCEPT_ENCODING)
+            codec = component.select_codec(request.headers.get(hdrs.ACCEPT_ENCODING, ""))
+            if codec is not None:
+                body = bytes(response.body)
+                compressed = await component.compress(codec, body)
+                if len(compressed) < len(body):
+                    response.body = compressed
+                    response.headers[hdrs.CONTENT_ENCODING] = codec
+                    # the compressed body is another representation of the strong ETag
+                    etag = response.headers.get(hdrs.ETAG)
+                    if etag and not etag.startswith("W/"):
+                        response.headers[hdrs.ETAG] = "W/" + etag
+        return response
+
+    return compression_middleware
+
+
+def create_compression_prepare_hook(component: CompressionComponent) -> ResponsePrepareHook:
+    async def on_response_prepare(request: web.Request, response: web.StreamResponse) -> None:
+        if (
+            component.config.streaming
+            and not isinstance(response, (web.Response, web.FileResponse, web.WebSocketResponse))
+            and request.method != hdrs.METH_HEAD
+            and response.content_length is None
+            and is_compressible_response(component, response)
+        ):
+            add_vary_header(response, hdrs.ACCEPT_ENCODING)
+            codec = component.select_codec(request.headers.get(hdrs.ACCEPT_ENCODING, ""), streaming=True)
+            if codec is not None:
+                # the headers are prepared before the signal, so compression is enabled on the writer directly
+                response.headers[hdrs.CONTENT_ENCODING] = codec
+                request.writer.enable_compression(codec)
+                component.streams += 1
+
+    return on_response_prepare
+
+
+def create_response_cache_middleware(component: ResponseCacheComponent) -> Middleware:
+    @web.middleware
+    async def response_cache_middleware(request: web.Request, handler: Handler) -> web.StreamResponse:
+        if request.method not in (hdrs.METH_GET, hdrs.METH_HEAD):
+            return await handler(request)
+
+        route = component.get_route(request)
+        if route is None:
+            return await handler(request)
+
+        key = component.get_key(request, route)
+        if key is not None:
+            cached = component.get(key)
+            if cached is not None:
+                return cached.make_response(request)
+
+        response = await handler(request)
+        if key is not None and isinstance(response, web.Response) and not response.prepared:
+            cached = component.put(request, route, response)
+            if cached is not None and cached.is_not_modified(request):
+                return cached.make_not_modified_response()
+        return response
+
+    return response_cache_middleware
+
+
+def create_metrics_middleware(component: MetricsComponent) -> Middleware:
+    @web.middleware
+    async def metrics_middleware(request: web.Request, handler: Handler) -> web.StreamResponse:
+        resource = request.match_info.route.resource
+        metrics = component.get_route_metrics(request.method, resource.canonical if resource is not None else None)
+        metrics.in_flight += 1
+        start = time.perf_counter()
+        status = 500
+        response = None
+        try:
+            response = await handler(request)
+            status = response.status
+            return response
+        except web.HTTPException as e:
+            status = e.status
+            raise
+        finally:
+            metrics.in_flight -= 1
+            if response is None:
+                response_bytes = 0
+            elif response.prepared:
+                response_bytes = response.body_length
+            else:
+                response_bytes = response.content_length or 0
+            component.observe(metrics, time.perf_counter() - start, status, request.content_length or 0, response_bytes)
+
+    return metrics_middleware
+
+
+def create_log_context_middleware() -> Middleware:
+    @web.middleware
+    async def log_context_middleware(request: web.Request, handler: Handler) -> web.StreamResponse:
+        request_id = request.headers.get(Request_Id_Header) or uuid4().hex
+        with log_context(time.time(), request_id=request_id, method=request.method, path=request.path):
+            return await handler(request)
+
+    return log_context_middleware
+
+
+def create_metrics_handler(component: MetricsComponent) -> Handler:
+    async def metrics_handler(request: web.Request) -> web.StreamResponse:
+        return web.Response(body=component.render().encode(), headers={hdrs.CONTENT_TYPE: Metrics_Content_Type})
+
+    return metrics_handler
+
+
+def create_limiter_middleware(component: LimiterComponent) -> Middleware:
+    retry_after = str(component.config.retry_after)
+
+    @web.middleware
+    async def limiter_middleware(request: web.Request, handler: Handler) -> web.StreamResponse:
+        resource = request.match_info.route.resource
+        limits = component.get_limits(request.path, resource.canonical if resource is not None else None)
+        if not limits:
+            return await handler(request)
+
+        acquired = []
+        try:
+            for limit in limits:
+                if not await limit.acquire():
+                    raise web.HTTPServiceUnavailable(headers={hdrs.RETRY_AFTER: retry_after})
+                acquired.append(limit)
+
+            start = time.perf_counter()
+            response = await handler(request)
+            latency = time.perf_counter() - start
+            for limit in acquired:
+                limit.observe(latency)
+            return response
+        finally:
+            for limit in acquired:
+                limit.release()
+
+    return limiter_middleware
+
+
+def create_coalescing_middleware(component: CoalescingComponent) -> Middleware:
+    @web.middleware
+    async def coalescing_middleware(request: web.Request, handler: Handler) -> web.StreamResponse:
+        if request.method not in (hdrs.METH_GET, hdrs.METH_HEAD):
+            return await handler(request)
+
+        route = component.get_route(request)
+        key = component.get_key(request, route) if route is not None else None
+        if key is None:
+            return await handler(request)
+        return await component.execute(key, request, handler)
+
+    return coalescing_middleware
@@ -0,0 +1,352 @@
+# Copyright (C) 2020-Present the hyssop authors and contributors.
+#
+# This module is part of hyssop and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+File created: October 19th 2026
+
+Modified By: hsky77
+Last Updated: October 19th 2026 21:40:26 pm
+
+Static file serving of project config:
+
+    aiohttp:
+        static_file:
+            /static:                            # route prefix, the files are in <project>/static
+                cache_control: max-age=3600     # optional Cache-Control header
+        www: www                                # files of <project>/www are served at "/", "index.html" for folders
+        static_cache:
+            max_size: 33554432                  # bytes of files cached in memory
+            max_file_size: 262144               # files larger than it are sent by sendfile
+            revalidate: 1.0                     # seconds to check the cached files have not been changed
+
+The small files are kept in LRU memory cache with their precompressed ".br" and ".gz" variants, the other files
+are sent by aiohttp.web.FileResponse with sendfile. The variant is chosen by Accept-Encoding, and the responses
+have ETag and Last-Modified headers to reply 304 to conditional requests. The variants older than the file are
+not served. The ETag of cached files is the digest
+of content since the files extracted from reproducible "hyssop pack" output have the same mtime.
+
+precompress_static_files() is the hook of "hyssop pack" generates the precompressed variants at build time,
+".br" requires brotli package.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import mimetypes
+import os
+import time
+from collections import OrderedDict
+from email.utils import formatdate
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from aiohttp import hdrs, web
+
+from ..component.compression import parse_accept_encoding
+
+Static_Encodings = (("br", ".br"), ("gzip", ".gz"))
+
+Static_Compress_Extensions = (
+    ".css",
+    ".csv",
+    ".html",
+    ".htm",
+    ".ico",
+    ".js",
+    ".json",
+    ".map",
+    ".md",
+    ".mjs",
+    ".svg",
+    ".txt",
+    ".wasm",
+    ".xml",
+    ".yaml",
+    ".yml",
+)
+Static_Compress_Min_Size = 256
+
+
+def get_static_directories(project_dir: str, aiohttp_config: Optional[Dict[str, Any]]) -> List[Tuple[str, str, Dict]]:
+    """return [(route prefix, directory, options)] of static_file and www in project config"""
+    directories = []
+    if aiohttp_config:
+        static_file: Optional[Dict[str, Any]] = aiohttp_config.get("static_file", None)
+        if static_file:
+            for prefix, options in static_file.items():
+                directories.append((prefix.rstrip("/"), project_dir + prefix, options or {}))
+
+        www: Optional[str] = aiohttp_config.get("www", None)
+        if www:
+            directories.append(("", f"{project_dir}/{www}", {}))
+    return directories
+
+
+class StaticFile:
+    """cached static file with its precompressed variants"""
+
+    __slots__ = ("content_type", "variants", "stats", "size", "checked_at")
+
+    def __init__(self, content_type: str):
+        self.content_type = content_type
+        self.variants: Dict[str, Tuple[bytes, str, float]] = {}  # {encoding: (body, etag, mtime)}
+        self.stats: Dict[str, Tuple[int, int]] = {}  # {path: (mtime_ns, size)}
+        self.size = 0
+        self.checked_at = time.monotonic()
+
+    def add_variant(self, encoding: str, path: str, body: bytes, st: os.stat_result) -> None:
+        self.variants[encoding] = (body, '"{}"'.format(hashlib.blake2b(body, digest_size=16).hexdigest()), st.st_mtime)
+        self.stats[path] = (st.st_mtime_ns, st.st_size)
+        self.size += len(body)
+
+    def is_modified(self) -> bool:
+        for path, stat in self.stats.items():
+            try:
+                st = os.stat(path)
+            except OSError:
+                return True
+            if (st.st_mtime_ns, st.st_size) != stat:
+                return True
+        return False
+
+
+class StaticFileCache:
+    """LRU cache of small static files bounded by total bytes"""
+
+    def __init__(self, max_size: int = 32 * 1024 * 1024, max_file_size: int = 256 * 1024, revalidate: float = 1.0):
+        self.max_size = max_size
+        self.max_file_size = max_file_size
+        self.revalidate = revalidate
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.__files: "OrderedDict[str, StaticFile]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.__files)
+
+    def get(self, path: str) -> Optional[StaticFile]:
+        static_file = self.__files.get(path)
+        if static_file is not None:
+            now = time.monotonic()
+            if now - static_file.checked_at >= self.revalidate:
+                if static_file.is_modified():
+                    self.pop(path)
+                    static_file = None
+                else:
+                    static_file.checked_at = now
+
+        if static_file is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.__files.move_to_end(path)
+        return static_file
+
+    def put(self, path: str, static_file: StaticFile) -> None:
+        self.pop(path)
+        if static_file.size > self.max_size:
+            return
+
+        while self.__files and self.size + static_file.size > self.max_size:
+            _, evicted = self.__files.popitem(last=False)
+            self.size -= evicted.size
+            self.evictions += 1
+        self.__files[path] = static_file
+        self.size += static_file.size
+
+    def pop(self, path: str) -> Optional[StaticFile]:
+        static_file = self.__files.pop(path, None)
+        if static_file is not None:
+            self.size -= static_file.size
+        return static_file
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "files": len(self.__files),
+            "size": self.size,
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class StaticFileHandler:
+    """request handler serves the files of directory from memory cache or by sendfile"""
+
+    def __init__(
+        self,
+        directory: str,
+        cache: StaticFileCache,
+        cache_control: Optional[str] = None,
+        index: Optional[str] = "index.html",
+    ):
+        self.directory = os.path.abspath(directory)
+        self.real_directory = os.path.realpath(self.directory)
+        self.cache = cache
+        self.cache_control = cache_control
+        self.index = index
+
+    async def __call__(self, request: web.Request) -> web.StreamResponse:
+        filename = request.match_info.get("filename", "")
+        if self.index and (not filename or filename.endswith("/")):
+            filename += self.index
+
+        path = os.path.normpath(os.path.join(self.directory, filename))
+        if not path.startswith(self.directory + os.sep):
+            raise web.HTTPNotFound()
+
+        # range requests are handled by FileResponse
+        static_file = None if hdrs.RANGE in request.headers else self.cache.get(path)
+        if static_file is None:
+            loop = asyncio.get_running_loop()
+            is_file, static_file = await loop.run_in_executor(None, self._load_file, path)
+            if not is_file:
+                raise web.HTTPNotFound()
+            if static_file is None or hdrs.RANGE in request.headers:
+                return self._make_file_response(path)
+            self.cache.put(path, static_file)
+
+        return self._make_response(request, static_file)
+
+    def _load_file(self, path: str) -> Tuple[bool, Optional[StaticFile]]:
+        """return whether path is a file in directory and the file to be cached if it is small enough"""
+        real_path = os.path.realpath(path)
+        if not real_path.startswith(self.real_directory + os.sep) or not os.path.isfile(real_path):
+            return False, None
+
+        st = os.stat(path)
+        if st.st_size > self.cache.max_file_size:
+            return True, None
+
+        static_file = StaticFile(mimetypes.guess_type(path)[0] or "application/octet-stream")
+        for encoding, extension in Static_Encodings:
+            try:
+                variant_st = os.stat(path + extension)
+                # the variant is stale if the file is modified after it is generated
+                if variant_st.st_mtime_ns >= st.st_mtime_ns and variant_st.st_size <= self.cache.max_file_size:
+                    with open(path + extension, "rb") as f:
+                        static_file.add_variant(encoding, path + extension, f.read(), variant_st)
+            except OSError:
+                pass
+
+        with open(path, "rb") as f:
+            static_file.add_variant("", path, f.read(), st)
+        return True, static_file
+
+    def _make_file_response(self, path: str) -> web.FileResponse:
+        response = web.FileResponse(path)
+        if self.cache_control:
+            response.headers[hdrs.CACHE_CONTROL] = self.cache_control
+        return response
+
+    def _make_response(self, request: web.Request, static_file: StaticFile) -> web.Response:
+        encoding = ""
+        if len(static_file.variants) > 1:
+            codings = parse_accept_encoding(request.headers.get(hdrs.ACCEPT_ENCODING, ""))
+            for variant_encoding, _ in Static_Encodings:
+                if variant_encoding in static_file.variants and codings.get(variant_encoding, codings.get("*", 0)) > 0:
+                    encoding = variant_encoding
+                    break
+
+        body, etag, mtime = static_file.variants[encoding]
+        headers = {hdrs.ETAG: etag, hdrs.LAST_MODIFIED: formatdate(mtime, usegmt=True)}
+        if len(static_file.variants) > 1:
+            headers[hdrs.VARY] = hdrs.ACCEPT_ENCODING
+        if self.cache_control:
+            headers[hdrs.CACHE_CONTROL] = self.cache_control
+
+        if self._is_not_modified(request, etag, mtime):
+            return web.Response(status=304, headers=headers)
+
+        headers[hdrs.CONTENT_TYPE] = static_file.content_type
+        if encoding:
+            headers[hdrs.CONTENT_ENCODING] = encoding
+        return web.Response(body=body, headers=headers)
+
+    def _is_not_modified(self, request: web.Request, etag: str, mtime: float) -> bool:
+        if_none_match = request.if_none_match
+        if if_none_match is not None:
+            return any(e.value == "*" or '"{}"'.format(e.value) == etag for e in if_none_match)
+
+        if_modified_since = request.if_modified_since
+        return if_modified_since is not None and int(mtime) <= if_modified_since.timestamp()
+
+
+def create_static_routes(project_dir: str, aiohttp_config: Optional[Dict[str, Any]]) -> List[web.RouteDef]:
+    """create the routes of static directories share one memory cache, the directories are created if not exist"""
+    routes = []
+    cache = StaticFileCache(**((aiohttp_config or {}).get("static_cache", None) or {}))
+    for prefix, directory, options in get_static_directories(project_dir, aiohttp_config):
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        routes.append(web.get(prefix + "/{filename:.*}", StaticFileHandler(directory, cache, **options)))
+    return routes
+
+
+def precompress_static_files(
+    server_folder: str, paths: List[Tuple[str, str]], work_dir: str
+) -> Iterable[Tuple[str, str]]:
+    """
+    hook of "hyssop pack" writes the ".gz" and ".br" variants of the compressible static files to work_dir,
+    the variants exist in project or not smaller than the file are skipped.
+    """
+    import yaml
+
+    from hyssop.project import HyssopProject
+
+    config_file = os.path.join(server_folder, HyssopProject.Project_Config_File)
+    if not os.path.isfile(config_file):
+        return []
+
+    with open(config_file, "r", encoding="utf8") as f:
+        config = yaml.load(f, Loader=yaml.SafeLoader) or {}
+
+    project_dir = os.path.abspath(server_folder)
+    directories = [
+        os.path.abspath(directory) + os.sep
+        for _, directory, _ in get_static_directories(project_dir, config.get("aiohttp"))
+    ]
+    if not directories:
+        return []
+
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+        print("brotli is not installed, only .gz static files are generated")
+
+    arcnames = set(arcname for _, arcname in paths)
+    generated = []
+    for path, arcname in paths:
+        if not arcname.endswith(Static_Compress_Extensions):
+            continue
+        if not any(os.path.abspath(path).startswith(d) for d in directories):
+            continue
+
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < Static_Compress_Min_Size:
+            continue
+
+        for encoding, extension in Static_Encodings:
+            if arcname + extension in arcnames:
+                continue
+            if encoding == "gzip":
+                compressed = gzip.compress(data, compresslevel=9, mtime=0)
+            elif brotli is not None:
+                compressed = brotli.compress(data, quality=11)
+            else:
+                continue
+
+            if len(compressed) < len(data):
+                variant_path = os.path.join(work_dir, *(arcname + extension).split("/"))
+                os.makedirs(os.path.dirname(variant_path), exist_ok=True)
+                with open(variant_path, "wb") as f:
+                    f.write(compressed)
+                print("packing precompressed file: {}{}".format(path, extension))
+                generated.append((variant_path, arcname + extension))
+    return generated
@@ -0,0 +1,221 @@
+# Copyright (C) 2020-Present the hyssop authors and contributors.
+#
+# This module is part of hyssop and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+File created: October 19th 2026
+
+Modified By: hsky77
+Last Updated: October 19th 2026 15:02:11 pm
+
+Supervisor of "hyssop_aiohttp start --workers N".
+
+The supervisor forks N worker processes, each worker creates its own AioHttpServer after fork, so the component
+manager, connection pools and event loop are not shared, and binds the project port with SO_REUSEPORT to let the
+kernel balance connections. Crashed workers are restarted with backoff. SIGINT and SIGTERM stop the workers
+gracefully and kill the workers still alive after shutdown timeout.
+
+With "--preload", the supervisor imports the modules, parses the project config, creates the components and loads
+the localization catalogs once before fork, then calls gc.freeze() so the preloaded objects stay in the memory
+pages shared copy-on-write by the workers. The components create per-worker resources such as connection pools in
+start() which is called by each worker after fork. The memory of each worker is logged once it is up and
+on SIGUSR1.
+"""
+
+import gc
+import logging
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from multiprocessing.connection import wait
+from typing import Dict, List, Optional
+
+Smaps_Memory_Keys = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty")
+
+logger = logging.getLogger("hyssop_aiohttp.supervisor")
+
+
+def run_server_worker(project_dir: str, worker_index: int, server=None) -> None:
+    """entry of worker process starts the preloaded server or creates a new AioHttpServer"""
+    from . import AioHttpServer
+
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGUSR1, signal.SIG_DFL)
+    os.environ["HYSSOP_WORKER_INDEX"] = str(worker_index)
+    if server is None:
+        server = AioHttpServer(project_dir)
+    else:
+        gc.enable()
+    server.start(reuse_port=True)
+
+
+def get_process_memory(pid: int) -> Optional[Dict[str, int]]:
+    """return the memory bytes of process from /proc/<pid>/smaps_rollup, None if it is not available"""
+    memory = {}
+    try:
+        with open("/proc/{}/smaps_rollup".format(pid), "r") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key in Smaps_Memory_Keys:
+                    memory[key] = int(value.split()[0]) * 1024
+    except (OSError, ValueError):
+        return None
+    return memory
+
+
+def format_process_memory(memory: Dict[str, int]) -> str:
+    """shared is the memory shared with the other processes, saved is rss minus its proportional share"""
+    mib = 1024 * 1024
+    return "rss: {:.1f}MiB, pss: {:.1f}MiB, shared: {:.1f}MiB, private: {:.1f}MiB, saved: {:.1f}MiB".format(
+        memory.get("Rss", 0) / mib,
+        memory.get("Pss", 0) / mib,
+        (memory.get("Shared_Clean", 0) + memory.get("Shared_Dirty", 0)) / mib,
+        (memory.get("Private_Clean", 0) + memory.get("Private_Dirty", 0)) / mib,
+        (memory.get("Rss", 0) - memory.get("Pss", 0)) / mib,
+    )
+
+
+class ServerSupervisor:
+    """fork and supervise server worker processes"""
+
+    def __init__(
+        self,
+        project_dir: str,
+        workers: int,
+        min_uptime: float = 1.0,
+        max_restart_delay: float = 30.0,
+        shutdown_timeout: float = 30.0,
+        preload: bool = False,
+    ):
+        if sys.platform == "win32":
+            raise OSError("multiple server workers require SO_REUSEPORT which is not supported on windows")
+
+        self.project_dir = project_dir
+        self.workers = workers
+        self.min_uptime = min_uptime
+        self.max_restart_delay = max_restart_delay
+        self.shutdown_timeout = shutdown_timeout
+        self.preload = preload
+        self.server = None
+        self.context = multiprocessing.get_context("fork")
+        self.processes: List[Optional[multiprocessing.process.BaseProcess]] = [None] * workers
+        self.started_at = [0.0] * workers
+        self.restart_delays = [0.0] * workers
+        self.restart_at = [0.0] * workers
+        self.memory_reported = [True] * workers
+        self.stopping = False
+        self.report_memory = False
+
+    def start(self) -> None:
+        if not logging.getLogger().handlers:
+            from hyssop.utils.logger import LOG_FORMAT
+
+            logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+        if logger.level == logging.NOTSET:
+            logger.setLevel(logging.INFO)
+
+        signal.signal(signal.SIGINT, self._handle_stop_signal)
+        signal.signal(signal.SIGTERM, self._handle_stop_signal)
+        signal.signal(signal.SIGUSR1, self._handle_report_signal)
+        logger.info("start {} server workers, supervisor pid: {}".format(self.workers, os.getpid()))
+        try:
+            if self.preload:
+                self._preload()
+            for index in range(self.workers):
+                self._start_worker(index)
+            self._supervise()
+        finally:
+            self._stop_workers()
+
+    def _handle_stop_signal(self, signum, frame) -> None:
+        self.stopping = True
+
+    def _handle_report_signal(self, signum, frame) -> None:
+        self.report_memory = True
+
+    def _preload(self) -> None:
+        """create the server in supervisor and freeze the objects to be shared by the workers"""
+        from hyssop.utils import BaseLocal
+
+        from . import AioHttpServer
+
+        # disable gc to avoid the collections make holes in the memory pages before freezing
+        gc.disable()
+        start = time.monotonic()
+        self.server = AioHttpServer(self.project_dir)
+        BaseLocal.load_language(BaseLocal.current_language)
+        BaseLocal.load_language(BaseLocal.fallback_language)
+        gc.freeze()
+        logger.info(
+            "preloaded server in {:.3f}s, {} objects are frozen".format(time.monotonic() - start, gc.get_freeze_count())
+        )
+
+    def _start_worker(self, index: int) -> None:
+        process = self.context.Process(
+            target=run_server_worker,
+            args=(self.project_dir, index, self.server),
+            name="hyssop-worker-{}".format(index),
+        )
+        process.start()
+        self.processes[index] = process
+        self.started_at[index] = time.monotonic()
+        self.memory_reported[index] = False
+        logger.info("worker {} started, pid: {}".format(index, process.pid))
+
+    def _supervise(self) -> None:
+        while not self.stopping:
+            sentinels = [p.sentinel for p in self.processes if p is not None]
+            wait(sentinels, timeout=0.5)
+            now = time.monotonic()
+            if self.report_memory:
+                self.report_memory = False
+                self._report_memory()
+            for index, process in enumerate(self.processes):
+                if self.stopping:
+                    return
+
+                if process is not None and not process.is_alive():
+                    process.join()
+                    logger.warning("worker {} exited with code {}".format(index, process.exitcode))
+                    self.processes[index] = None
+
+                    # restart with exponential backoff if the worker keeps crashing right after start
+                    if now - self.started_at[index] < self.min_uptime:
+                        delay = self.restart_delays[index] * 2 or self.min_uptime
+                        self.restart_delays[index] = min(delay, self.max_restart_delay)
+                    else:
+                        self.restart_delays[index] = 0.0
+                    self.restart_at[index] = now + self.restart_delays[index]
+
+                if self.processes[index] is None and now >= self.restart_at[index]:
+                    self._start_worker(index)
+                elif not self.memory_reported[index] and now - self.started_at[index] >= self.min_uptime:
+                    self._report_memory(index)
+
+    def _report_memory(self, index: Optional[int] = None) -> None:
+        """log the memory of worker of index or all the workers"""
+        for i, process in enumerate(self.processes):
+            if process is not None and (index is None or i == index):
+                self.memory_reported[i] = True
+                memory = get_process_memory(process.pid)  # type: ignore
+                if memory is not None:
+                    logger.info("worker {} pid: {} {}".format(i, process.pid, format_process_memory(memory)))
+
+    def _stop_workers(self) -> None:
+        processes = [p for p in self.processes if p is not None]
+        for process in processes:
+            if process.is_alive():
+                os.kill(process.pid, signal.SIGTERM)  # type: ignore
+
+        deadline = time.monotonic() + self.shutdown_timeout
+        for process in processes:
+            process.join(max(deadline - time.monotonic(), 0))
+            if process.is_alive():
+                logger.warning("kill worker pid: {} after shutdown timeout".format(process.pid))
+                process.kill()
+                process.join()
+        logger.info("server workers stopped")
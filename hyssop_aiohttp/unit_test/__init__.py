@@ -0,0 +1,42 @@
+# Copyright (C) 2020-Present the hyssop authors and contributors.
+#
+# This module is part of hyssop and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+File created: October 19th 2026
+
+provide the test cases of hyssop_aiohttp server, middlewares and components, the cases create the application of
+a temporary project and request it by aiohttp TestClient
+
+run command "python -m hyssop_aiohttp test" to test
+
+Modified By: hsky77
+Last Updated: October 19th 2026 23:24:37 pm
+"""
+
+from hyssop.unit_test import UnitTestTypes
+
+from .ut_arguments import TestCaseArguments
+from .ut_coalescing import TestCaseCoalescing
+from .ut_compression import TestCaseCompression
+from .ut_executor import TestCaseExecutor
+from .ut_limiter import TestCaseLimiter
+from .ut_log_context import TestCaseLogContext
+from .ut_metrics import TestCaseMetrics
+from .ut_response_cache import TestCaseResponseCache
+from .ut_static import TestCaseStatic
+from .ut_supervisor import TestCaseSupervisor
+
+
+class AioHttpUnitTestTypes(UnitTestTypes):
+    TestArguments = TestCaseArguments
+    TestSupervisor = TestCaseSupervisor
+    TestStatic = TestCaseStatic
+    TestCompression = TestCaseCompression
+    TestResponseCache = TestCaseResponseCache
+    TestMetrics = TestCaseMetrics
+    TestLimiter = TestCaseLimiter
+    TestCoalescing = TestCaseCoalescing
+    TestExecutor = TestCaseExecutor
+    TestLogContext = TestCaseLogContext
@@ -0,0 +1,60 @@
+# Copyright (C) 2020-Present the hyssop authors and contributors.
+#
+# This module is part of hyssop and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+File created: October 19th 2026
+
+Modified By: hsky77
+Last Updated: October 19th 2026 21:05:12 pm
+"""
+
+from copy import deepcopy
+from shutil import rmtree
+from tempfile import mkdtemp
+from typing import Any, Dict, List, Optional, Type
+
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+from hyssop.component import ComponentManagerT, DefaultComponentManager, create_component_manager
+from hyssop.unit_test.base import IUnitTestCase
+
+from ..server import AioHttpApplication, AioHttpHyssopProject
+
+
+class UnitTestProject(AioHttpHyssopProject):
+    """project of unit tests without component and controller modules, the routes are added by the test cases"""
+
+    def create_component_manager(
+        self,
+        component_manager_t: Type[ComponentManagerT] = DefaultComponentManager,
+    ) -> ComponentManagerT:
+        return create_component_manager(
+            self.project_dir, self.config.get(self.Component_Module_Folder, {}), component_manager_t=component_manager_t
+        )
+
+    def create_controllers(self) -> List[Any]:
+        return []
+
+
+class AioHttpTestCase(IUnitTestCase):
+    """base of the test cases request the application of a temporary project by aiohttp TestClient"""
+
+    def setUp(self):
+        self.project_dir = mkdtemp()
+
+    def tearDown(self):
+        rmtree(self.project_dir, ignore_errors=True)
+
+    def create_app(self, route_table: web.RouteTableDef, config: Optional[Dict[str, Any]] = None) -> AioHttpApplication:
+        app = AioHttpApplication()
+        app.init_server_with_project(UnitTestProject(self.project_dir, deepcopy(config or {})))
+        app.add_routes(route_table)
+        app.add_routes(app.project.create_static_routes())
+        return app
+
+    def create_client(self, route_table: web.RouteTableDef, config: Optional[Dict[str, Any]] = None) -> TestClient:
+        """return the client of test server, use "async with" to start and close the server"""
+        return TestClient(TestServer(self.create_app(route_table, config)))
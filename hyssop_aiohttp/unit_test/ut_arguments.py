@@ -0,0 +1,125 @@
+# Copyright (C) 2020-Present the hyssop authors and contributors.
+#
+# This module is part of hyssop and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+File created: October 19th 2026
+
+Modified By: hsky77
+Last Updated: October 19th 2026 21:05:12 pm
+"""
+
+from asyncio import run
+from dataclasses import asdict, dataclass
+
+from aiohttp import web
+from pydantic import BaseModel, Field
+from typing_extensions import TypedDict
+
+from .base import AioHttpTestCase
+
+routes = web.RouteTableDef()
+
+
+class ItemModel(BaseModel):
+    name: str
+    count: int = Field(1, gt=0)
+
+
+@dataclass
+class ItemData:
+    name: str
+    count: int = 1
+
+
+class ItemDict(TypedDict):
+    name: str
+    count: int
+
+
+@routes.post("/arguments")
+async def arguments(request):
+    first = await request.get_arguments()
+    second = await request.get_arguments()
+    return web.json_response(
+        {
+            "cached": first is second,
+            "arguments": dict(first),
+            "name": await request.get_argument("name"),
+            "default": await request.get_argument("missing", "default"),
+            "selected": await request.get_arguments_dict(["name"]),
+        }
+    )
+
+
+@routes.get("/argument")
+async def argument(request):
+    return web.json_response(await request.get_argument("name"))
+
+
+@routes.post("/model")
+async def model(request):
+    return web.json_response((await request.parse_arguments(ItemModel)).model_dump())
+
+
+@routes.post("/dataclass")
+async def dataclass_arguments(request):
+    return web.json_response(asdict(await request.parse_arguments(ItemData)))
+
+
+@routes.post("/typed_dict")
+async def typed_dict(request):
+    return web.json_response(await request.parse_arguments(ItemDict))
+
+
+class TestCaseArguments(AioHttpTestCase):
+    def test(self):
+        self.test_arguments()
+        self.test_parse_arguments()
+
+    def test_arguments(self):
+        async def test():
+            async with self.create_client(routes) as client:
+                res = await client.post("/arguments?name=query&page=1", json={"name": "body", "tags": ["a"]})
+                self.assertEqual(res.status, 200)
+                data = await res.json()
+                self.assertTrue(data["cached"])
+                self.assertEqual(data["arguments"], {"name": "body", "page": "1", "tags": ["a"]})
+                self.assertEqual(data["name"], "body")
+                self.assertEqual(data["default"], "default")
+                self.assertEqual(data["selected"], {"name": "body"})
+
+                res = await client.post("/arguments", data={"name": "form"})
+                self.assertEqual((await res.json())["arguments"], {"name": "form"})
+
+                res = await client.get("/argument")
+                self.assertEqual(res.status, 400)
+
+        run(test())
+
+    def test_parse_arguments(self):
+        from ..server import get_arguments_validator
+
+        async def test():
+            async with self.create_client(routes) as client:
+                for path in ("/model", "/dataclass", "/typed_dict"):
+                    # the query strings are converted in lax mode
+                    res = await client.post(path + "?count=3", data={"name": "item"})
+                    self.assertEqual(res.status, 200, path)
+                    self.assertEqual(await res.json(), {"name": "item", "count": 3})
+
+                    res = await client.post(path, json={"count": "x"})
+                    self.assertEqual(res.status, 400, path)
+                    self.assertEqual(res.content_type, "application/json")
+                    errors = await res.json()
+                    self.assertEqual(sorted(tuple(e["loc"]) for e in errors), [("count",), ("name",)])
+                    for e in errors:
+                        self.assertNotIn("url", e)
+
+                res = await client.post("/model", json={"name": "item", "count": 0})
+                self.assertEqual(res.status, 400)
+                self.assertEqual((await res.json())[0]["type"], "greater_than")
+
+        run(test())
+        self.assertIs(get_arguments_validator(ItemData), get_arguments_validator(ItemData))
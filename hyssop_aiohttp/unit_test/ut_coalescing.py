@@ -0,0 +1,140 @@
+# Copyright (C) 2020-Present the hyssop authors and contributors.
+#
+# This module is part of hyssop and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+File created: October 19th 2026
+
+Modified By: hsky77
+Last Updated: October 19th 2026 22:15:09 pm
+"""
+
+import asyncio
+import gc
+from asyncio import run
+from collections import Counter
+
+from aiohttp import hdrs, web
+
+from .base import AioHttpTestCase
+
+calls: Counter = Counter()
+release = {}
+
+routes = web.RouteTableDef()
+
+
+@routes.get("/items/{id}")
+async def item(request):
+    calls[request.path] += 1
+    await release[request.path].wait()
+    return web.Response(text="item {} {}".format(request.match_info["id"], calls[request.path]))
+
+
+@routes.get("/cookie")
+async def cookie(request):
+    calls[request.path] += 1
+    await release[request.path].wait()
+    response = web.Response(text="cookie {}".format(calls[request.path]))
+    response.set_cookie("session", str(calls[request.path]))
+    return response
+
+
+@routes.get("/stream")
+async def stream(request):
+    calls[request.path] += 1
+    await release[request.path].wait()
+    response = web.StreamResponse()
+    await response.prepare(request)
+    await response.write("stream {}".format(calls[request.path]).encode())
+    return response
+
+
+class TestCaseCoalescing(AioHttpTestCase):
+    def test(self):
+        async def test():
+            calls.clear()
+            config = {
+                "component": {
+                    "coalescing": {"enabled": True, "routes": {"/items/{id}": {}, "/cookie": {}, "/stream": {}}}
+                }
+            }
+            async with self.create_client(routes, config) as client:
+                component = client.app.component_manager.get_component("coalescing")
+                await self.check_shared_responses(client, component)
+                await self.check_fallbacks(client, component)
+                await self.check_authorization(client, component)
+                await self.check_exception(component)
+
+        run(test())
+
+    async def request(self, client, component, path, count, **kwargs):
+        """send count concurrent requests of path and return the response texts after they are waiting"""
+        release[path] = asyncio.Event()
+        coalesced = component.coalesced
+        requests = [asyncio.ensure_future(client.get(path, **kwargs)) for _ in range(count)]
+        while calls[path] + component.coalesced - coalesced < count:
+            await asyncio.sleep(0.01)
+        release[path].set()
+        return [await (await r).text() for r in requests]
+
+    async def check_shared_responses(self, client, component):
+        self.assertEqual(await self.request(client, component, "/items/1", 3), ["item 1 1"] * 3)
+        self.assertEqual(calls["/items/1"], 1)
+        self.assertEqual(component.info()["metrics"]["coalesced"], 2)
+        self.assertEqual(component.info()["metrics"]["in_flight"], 0)
+
+        # the next requests execute the handler again
+        self.assertEqual(await self.request(client, component, "/items/1", 2), ["item 1 2"] * 2)
+
+    async def check_fallbacks(self, client, component):
+        fallbacks = component.fallbacks
+        texts = await self.request(client, component, "/cookie", 3)
+        self.assertEqual(sorted(texts), ["cookie 1", "cookie 2", "cookie 3"])
+        self.assertEqual(component.fallbacks - fallbacks, 2)
+
+        texts = await self.request(client, component, "/stream", 2)
+        self.assertEqual(sorted(texts), ["stream 1", "stream 2"])
+        self.assertEqual(component.fallbacks - fallbacks, 3)
+
+    async def check_authorization(self, client, component):
+        executions = component.executions
+        texts = await self.request(client, component, "/items/2", 3, headers={hdrs.AUTHORIZATION: "Bearer token"})
+        self.assertEqual(sorted(texts), ["item 2 3"] * 3)
+        self.assertEqual(calls["/items/2"], 3)
+        self.assertEqual(component.executions, executions)
+
+    async def check_exception(self, component):
+        errors = []
+        loop = asyncio.get_running_loop()
+        loop.set_exception_handler(lambda loop, context: errors.append(context))
+        failed = asyncio.Event()
+
+        async def handler(request):
+            await failed.wait()
+            raise RuntimeError("failed")
+
+        # the exception of handler is retrieved even all the requests are cancelled
+        key = ("GET", "/failed", (), ())
+        requests = [asyncio.ensure_future(component.execute(key, None, handler)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        for request in requests:
+            request.cancel()
+        failed.set()
+        await asyncio.sleep(0.01)
+        self.assertEqual(component.info()["metrics"]["in_flight"], 0)
+
+        del requests, request
+        gc.collect()
+        loop.set_exception_handler(None)
+        self.assertEqual(errors, [])
+
+        # the exception is raised to the waiting requests
+        failed.clear()
+        requests = [asyncio.ensure_future(component.execute(key, None, handler)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        failed.set()
+        for request in requests:
+            with self.assertRaises(RuntimeError):
+                await request
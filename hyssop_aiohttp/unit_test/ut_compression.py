@@ -0,0 +1,88 @@
+# Copyright (C) 2020-Present the hyssop authors and contributors.
+#
+# This module is part of hyssop and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+File created: October 19th 2026
+
+Modified By: hsky77
+Last Updated: October 19th 2026 21:52:18 pm
+"""
+
+from asyncio import run
+
+from aiohttp import hdrs, web
+
+from .base import AioHttpTestCase
+
+Text_Content = "compressible text\n" * 100
+
+routes = web.RouteTableDef()
+
+
+@routes.get("/text")
+async def text(request):
+    return web.Response(text=Text_Content, headers={hdrs.ETAG: '"v1"'})
+
+
+@routes.get("/small")
+async def small(request):
+    return web.Response(text="small")
+
+
+@routes.get("/enabled")
+async def enabled(request):
+    response = web.Response(text=Text_Content)
+    response.enable_compression()
+    return response
+
+
+@routes.get("/stream")
+async def stream(request):
+    response = web.StreamResponse(headers={hdrs.CONTENT_TYPE: "text/plain"})
+    await response.prepare(request)
+    for _ in range(10):
+        await response.write(Text_Content.encode())
+    await response.write_eof()
+    return response
+
+
+class TestCaseCompression(AioHttpTestCase):
+    def test(self):
+        async def test():
+            config = {"component": {"compression": {"enabled": True, "min_size": 64, "codecs": ["gzip", "deflate"]}}}
+            async with self.create_client(routes, config) as client:
+                res = await client.get("/text", headers={hdrs.ACCEPT_ENCODING: "gzip, deflate"})
+                self.assertEqual(res.headers[hdrs.CONTENT_ENCODING], "gzip")
+                self.assertEqual(res.headers[hdrs.VARY], hdrs.ACCEPT_ENCODING)
+                self.assertEqual(res.headers[hdrs.ETAG], 'W/"v1"')
+                self.assertEqual(await res.text(), Text_Content)
+
+                res = await client.get("/text", headers={hdrs.ACCEPT_ENCODING: "gzip;q=0, deflate"})
+                self.assertEqual(res.headers[hdrs.CONTENT_ENCODING], "deflate")
+                self.assertEqual(await res.text(), Text_Content)
+
+                res = await client.get("/text", headers={hdrs.ACCEPT_ENCODING: "gzip;q=0"})
+                self.assertNotIn(hdrs.CONTENT_ENCODING, res.headers)
+                self.assertEqual(res.headers[hdrs.VARY], hdrs.ACCEPT_ENCODING)
+                self.assertEqual(res.headers[hdrs.ETAG], '"v1"')
+
+                res = await client.get("/small", headers={hdrs.ACCEPT_ENCODING: "gzip"})
+                self.assertNotIn(hdrs.CONTENT_ENCODING, res.headers)
+                self.assertEqual(await res.text(), "small")
+
+                # the response enabled compression by controller is compressed once by aiohttp
+                res = await client.get("/enabled", headers={hdrs.ACCEPT_ENCODING: "gzip"})
+                self.assertEqual(res.headers[hdrs.CONTENT_ENCODING], "gzip")
+                self.assertEqual(await res.text(), Text_Content)
+
+                res = await client.get("/stream", headers={hdrs.ACCEPT_ENCODING: "gzip"})
+                self.assertEqual(res.headers[hdrs.CONTENT_ENCODING], "gzip")
+                self.assertEqual(await res.text(), Text_Content * 10)
+
+                metrics = client.app.component_manager.get_component("compression").info()["metrics"]
+                self.assertEqual(metrics["compressed_responses"], 2)
+                self.assertEqual(metrics["compressed_streams"], 1)
+
+        run(test())
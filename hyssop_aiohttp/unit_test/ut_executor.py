@@ -0,0 +1,150 @@
+# Copyright (C) 2020-Present the hyssop authors and contributors.
+#
+# This module is part of hyssop and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+File created: October 19th 2026
+
+Modified By: hsky77
+Last Updated: October 19th 2026 23:58:14 pm
+"""
+
+import asyncio
+import threading
+from asyncio import run
+
+from aiohttp import web
+
+from ..component.executor import offload
+from .base import AioHttpTestCase, UnitTestProject
+
+routes = web.RouteTableDef()
+
+
+@routes.get("/offload")
+async def offload_function(request):
+    return web.Response(text=await request.offload("io", lambda: threading.current_thread().name))
+
+
+@routes.get("/sync")
+@offload("io")
+def sync_handler(request):
+    return web.Response(text=threading.current_thread().name)
+
+
+process_routes = web.RouteTableDef()
+
+
+@process_routes.get("/process")
+@offload("cpu")
+def process_handler(request):
+    return web.Response(text="process")
+
+
+unknown_routes = web.RouteTableDef()
+
+
+@unknown_routes.get("/unknown")
+@offload("unknown")
+def unknown_handler(request):
+    return web.Response(text="unknown")
+
+
+class TestCaseExecutor(AioHttpTestCase):
+    def test(self):
+        self.test_offload()
+        self.test_offload_routes()
+        self.test_pool()
+        self.test_config()
+
+    def create_executor_client(self, **config):
+        pools = {"io": {"max_workers": 1}, "cpu": {"type": "process", "max_workers": 1}}
+        return self.create_client(routes, {"component": {"executor": {"pools": pools, **config}}})
+
+    def test_offload(self):
+        async def test():
+            async with self.create_executor_client(default_pool="io") as client:
+                for path in ("/offload", "/sync"):
+                    res = await client.get(path)
+                    self.assertEqual(res.status, 200)
+                    self.assertTrue((await res.text()).startswith("hyssop_io"))
+
+                # the default pool is used by run_in_executor(None, ...)
+                name = await asyncio.get_running_loop().run_in_executor(None, lambda: threading.current_thread().name)
+                self.assertTrue(name.startswith("hyssop_io"))
+
+                component = client.app.component_manager.get_component("executor")
+                self.assertEqual(await component.run("cpu", pow, 2, 10), 1024)
+                metrics = component.info()["metrics"]
+                self.assertEqual(metrics["completed"], {"default": 0, "io": 2, "cpu": 1})
+                self.assertEqual(metrics["in_flight"], {"default": 0, "io": 0, "cpu": 0})
+
+        run(test())
+
+    def test_offload_routes(self):
+        from aiohttp.test_utils import TestServer
+
+        async def test(route_table, error):
+            pools = {"cpu": {"type": "process"}}
+            server = TestServer(self.create_app(route_table, {"component": {"executor": {"pools": pools}}}))
+            try:
+                with self.assertRaises(error):
+                    await server.start_server()
+            finally:
+                await server.close()
+
+        # the server fails to start if the pool of sync route handler is a process pool or not configured
+        run(test(process_routes, TypeError))
+        run(test(unknown_routes, KeyError))
+
+    def test_pool(self):
+        from ..component.executor import ExecutorPool, ExecutorPoolConfig
+
+        def fail():
+            raise ValueError("failed")
+
+        async def test():
+            pool = ExecutorPool("ut", ExecutorPoolConfig(max_workers=1))
+            started, release = threading.Event(), threading.Event()
+            queued_calls = []
+            running = asyncio.ensure_future(pool.run(lambda: started.set() or release.wait(1)))
+            queued = asyncio.ensure_future(pool.run(queued_calls.append, "queued"))
+            await asyncio.get_running_loop().run_in_executor(None, started.wait, 1)
+            self.assertEqual(pool.in_flight, 2)
+
+            # the cancellation cancels the queued call
+            queued.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await queued
+            release.set()
+            self.assertTrue(await running)
+            self.assertEqual(queued_calls, [])
+
+            with self.assertRaises(ValueError):
+                await pool.run(fail)
+
+            info = pool.info()
+            self.assertEqual(info["submitted"], 3)
+            self.assertEqual(info["completed"], 1)
+            self.assertEqual(info["cancelled"], 1)
+            self.assertEqual(info["failed"], 1)
+            self.assertEqual(info["in_flight"], 0)
+            self.assertGreater(info["run_seconds"], 0)
+            self.assertGreaterEqual(info["max_wait_seconds"], 0)
+            pool.shutdown()
+
+        run(test())
+
+    def test_config(self):
+        for config in [
+            {"default_pool": "cpu", "pools": {"cpu": {"type": "process"}}},
+            {"pools": {"pool": {"type": "fiber"}}},
+            {"pools": {"cpu": {"type": "process", "start_method": "unknown"}}},
+        ]:
+            with self.assertRaises(ValueError):
+                UnitTestProject(self.project_dir, {"component": {"executor": config}}).create_component_manager()
+
+        component_manager = UnitTestProject(self.project_dir, {}).create_component_manager()
+        with self.assertRaises(KeyError):
+            component_manager.get_component("executor").get_pool("unknown")
@@ -0,0 +1,118 @@
+# Copyright (C) 2020-Present the hyssop authors and contributors.
+#
+# This module is part of hyssop and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+File created: October 19th 2026
+
+Modified By: hsky77
+Last Updated: October 19th 2026 21:05:12 pm
+"""
+
+import asyncio
+from asyncio import run
+
+from aiohttp import web
+
+from .base import AioHttpTestCase
+
+
+class TestCaseLimiter(AioHttpTestCase):
+    def test(self):
+        self.test_limiter_middleware()
+        self.test_concurrency_limit()
+        self.test_adaptive_limit()
+
+    def test_limiter_middleware(self):
+        async def test():
+            config = {
+                "component": {
+                    "limiter": {
+                        "enabled": True,
+                        "max_in_flight": 1,
+                        "queue_size": 1,
+                        "queue_timeout": 5,
+                        "retry_after": 3,
+                        "exempt_routes": ["/fast"],
+                    }
+                }
+            }
+            release = asyncio.Event()
+            routes = web.RouteTableDef()
+
+            @routes.get("/slow")
+            async def slow(request):
+                await release.wait()
+                return web.Response(text="slow")
+
+            @routes.get("/fast")
+            async def fast(request):
+                return web.Response(text="fast")
+
+            async with self.create_client(routes, config) as client:
+                limiter = client.app.component_manager.get_component("limiter")
+                first = asyncio.ensure_future(client.get("/slow"))
+                second = asyncio.ensure_future(client.get("/slow"))
+                while limiter.server_limit.in_flight < 1 or len(limiter.server_limit.waiters) < 1:
+                    await asyncio.sleep(0.01)
+
+                # the queue is full
+                res = await client.get("/slow")
+                self.assertEqual(res.status, 503)
+                self.assertEqual(res.headers["Retry-After"], "3")
+
+                # the exempt routes are not limited
+                res = await client.get("/fast")
+                self.assertEqual(res.status, 200)
+
+                release.set()
+                self.assertEqual([r.status for r in await asyncio.gather(first, second)], [200, 200])
+                self.assertEqual(limiter.server_limit.in_flight, 0)
+                self.assertEqual(limiter.info()["metrics"]["rejected"], {"server": 1})
+
+        run(test())
+
+    def test_concurrency_limit(self):
+        from ..component.limiter import ConcurrencyLimit, LimitConfig
+
+        async def test():
+            limit = ConcurrencyLimit(LimitConfig(max_in_flight=1, queue_size=2, queue_timeout=0.05))
+            self.assertTrue(await limit.acquire())
+
+            # the waiter times out
+            self.assertFalse(await limit.acquire())
+            self.assertEqual(limit.timeouts, 1)
+
+            # the cancelled waiter leaves the queue and the released slot is handed to the next waiter
+            cancelled = asyncio.ensure_future(limit.acquire())
+            waiter = asyncio.ensure_future(limit.acquire())
+            await asyncio.sleep(0)
+            cancelled.cancel()
+            await asyncio.sleep(0)
+            self.assertEqual(len(limit.waiters), 1)
+            limit.release()
+            self.assertTrue(await waiter)
+            self.assertEqual(limit.in_flight, 1)
+            limit.release()
+            self.assertEqual(limit.in_flight, 0)
+
+        run(test())
+
+    def test_adaptive_limit(self):
+        from ..component.limiter import ConcurrencyLimit, LimitConfig
+
+        limit = ConcurrencyLimit(
+            LimitConfig(max_in_flight=10, adaptive=True, target_latency=0.0, min_in_flight=2, decrease_ratio=0.5)
+        )
+        limit.observe(1.0)
+        self.assertEqual(limit.info()["limit"], 5)
+        for _ in range(3):
+            limit.observe(1.0)
+        self.assertEqual(limit.info()["limit"], 2)
+
+        limit.config.target_latency = 1.0
+        limit.in_flight = 10
+        for _ in range(100):
+            limit.observe(0.1)
+        self.assertEqual(limit.info()["limit"], 10)
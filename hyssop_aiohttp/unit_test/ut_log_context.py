@@ -0,0 +1,72 @@
+# Copyright (C) 2020-Present the hyssop authors and contributors.
+#
+# This module is part of hyssop and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+File created: October 19th 2026
+
+Modified By: hsky77
+Last Updated: October 19th 2026 23:24:37 pm
+"""
+
+import logging
+from asyncio import run
+
+from aiohttp import web
+
+from .base import AioHttpTestCase
+
+records = []
+
+routes = web.RouteTableDef()
+
+
+class RecordHandler(logging.Handler):
+    def emit(self, record):
+        records.append(record)
+
+
+@routes.get("/log")
+async def log(request):
+    request.get_logger("ut_log_context").info("handled %s", request.path)
+    return web.Response(text="logged")
+
+
+class TestCaseLogContext(AioHttpTestCase):
+    def test(self):
+        self.test_json_format()
+        self.test_text_format()
+
+    def request_records(self, log_format, **kwargs):
+        async def test():
+            records.clear()
+            handler = RecordHandler()
+            logger = logging.getLogger("ut_log_context")
+            logger.addHandler(handler)
+            try:
+                config = {"component": {"logger": {"log_format": log_format}}}
+                async with self.create_client(routes, config) as client:
+                    res = await client.get("/log", **kwargs)
+                    self.assertEqual(await res.text(), "logged")
+            finally:
+                logger.removeHandler(handler)
+            return list(records)
+
+        return run(test())
+
+    def test_json_format(self):
+        [record] = self.request_records("json", headers={"X-Request-ID": "ut-request"})
+        self.assertEqual(record.getMessage(), "handled /log")
+        self.assertEqual(record.context["request_id"], "ut-request")
+        self.assertEqual(record.context["method"], "GET")
+        self.assertEqual(record.context["path"], "/log")
+        self.assertGreaterEqual(record.context["elapsed_ms"], 0)
+
+        # the request id is generated if the request does not have one
+        [record] = self.request_records("json")
+        self.assertEqual(len(record.context["request_id"]), 32)
+
+    def test_text_format(self):
+        [record] = self.request_records("text")
+        self.assertFalse(hasattr(record, "context"))
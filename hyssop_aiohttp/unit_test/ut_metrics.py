@@ -0,0 +1,72 @@
+# Copyright (C) 2020-Present the hyssop authors and contributors.
+#
+# This module is part of hyssop and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+File created: October 19th 2026
+
+Modified By: hsky77
+Last Updated: October 19th 2026 21:05:12 pm
+"""
+
+from asyncio import run
+
+from aiohttp import web
+
+from .base import AioHttpTestCase
+
+routes = web.RouteTableDef()
+
+
+@routes.get("/items/{id}")
+async def item(request):
+    if request.match_info["id"] == "0":
+        raise web.HTTPNotFound()
+    return web.Response(text="item " + request.match_info["id"])
+
+
+class TestCaseMetrics(AioHttpTestCase):
+    def test(self):
+        async def test():
+            config = {"component": {"metrics": {"enabled": True, "buckets": [0.5, 0.1]}}}
+            async with self.create_client(routes, config) as client:
+                for i in (1, 2, 0):
+                    await client.get("/items/{}".format(i))
+                await client.get("/unknown")
+
+                res = await client.get("/metrics")
+                self.assertEqual(res.status, 200)
+                self.assertEqual(res.headers["Content-Type"], "text/plain; version=0.0.4; charset=utf-8")
+                self.check_metrics((await res.text()).splitlines())
+                self.check_component_metrics(client.app.component_manager.get_component("metrics"))
+
+        run(test())
+
+    def check_metrics(self, lines):
+        for line in [
+            'hyssop_http_requests_total{method="GET",route="/items/{id}",status="200"} 2',
+            'hyssop_http_requests_total{method="GET",route="/items/{id}",status="404"} 1',
+            'hyssop_http_requests_total{method="GET",route="unmatched",status="404"} 1',
+            'hyssop_http_request_duration_seconds_bucket{method="GET",route="/items/{id}",le="0.1"} 3',
+            'hyssop_http_request_duration_seconds_bucket{method="GET",route="/items/{id}",le="+Inf"} 3',
+            'hyssop_http_request_duration_seconds_count{method="GET",route="/items/{id}"} 3',
+            'hyssop_http_response_size_bytes_sum{method="GET",route="/items/{id}"} 12',
+            'hyssop_http_requests_in_flight{method="GET",route="/metrics"} 1',
+        ]:
+            self.assertIn(line, lines)
+
+    def check_component_metrics(self, component):
+        lines = component.render_component_metrics(
+            "limiter", {"in_flight": {"server": 1, "/items": 2, "name": "text"}, "rate": 0.5, "name": "x"}
+        )
+        self.assertEqual(
+            lines,
+            [
+                "# TYPE hyssop_limiter_in_flight gauge",
+                'hyssop_limiter_in_flight{key="server"} 1',
+                'hyssop_limiter_in_flight{key="/items"} 2',
+                "# TYPE hyssop_limiter_rate gauge",
+                "hyssop_limiter_rate 0.5",
+            ],
+        )
@@ -0,0 +1,148 @@
+# Copyright (C) 2020-Present the hyssop authors and contributors.
+#
+# This module is part of hyssop and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+File created: October 19th 2026
+
+Modified By: hsky77
+Last Updated: October 19th 2026 22:03:37 pm
+"""
+
+from asyncio import run, sleep
+from collections import Counter
+
+from aiohttp import hdrs, web
+
+from .base import AioHttpTestCase
+
+calls: Counter = Counter()
+
+routes = web.RouteTableDef()
+
+
+@routes.get("/items/{id}")
+async def item(request):
+    calls[request.path] += 1
+    return web.Response(
+        text="{} item {} {}".format(request.method, request.match_info["id"], calls[request.path]),
+        headers={
+            hdrs.CACHE_CONTROL: "max-age=60",
+            hdrs.CONTENT_LOCATION: request.path,
+            hdrs.EXPIRES: "Thu, 01 Jan 2099 00:00:00 GMT",
+            hdrs.VARY: "Accept-Language",
+            "X-Item": "item",
+        },
+    )
+
+
+@routes.get("/etag")
+async def etag(request):
+    calls[request.path] += 1
+    return web.Response(text="etag", headers={hdrs.ETAG: '"v1"', hdrs.CACHE_CONTROL: "max-age=60"})
+
+
+@routes.get("/cookie")
+async def cookie(request):
+    calls[request.path] += 1
+    response = web.Response(text="cookie {}".format(calls[request.path]))
+    response.set_cookie("session", "value")
+    return response
+
+
+@routes.get("/private")
+async def private(request):
+    calls[request.path] += 1
+    return web.Response(text="private {}".format(calls[request.path]), headers={hdrs.CACHE_CONTROL: "private"})
+
+
+class TestCaseResponseCache(AioHttpTestCase):
+    def test(self):
+        async def test():
+            calls.clear()
+            config = {
+                "component": {
+                    "response_cache": {
+                        "enabled": True,
+                        "routes": {
+                            "/items/{id}": {"ttl": 60, "query": ["page"]},
+                            "/etag": {"ttl": 0.1},
+                            "/cookie": {"ttl": 60},
+                            "/private": {"ttl": 60},
+                        },
+                    }
+                }
+            }
+            async with self.create_client(routes, config) as client:
+                await self.check_cached_response(client)
+                await self.check_not_modified(client)
+                await self.check_not_cached(client)
+                metrics = client.app.component_manager.get_component("response_cache").info()["metrics"]
+                self.assertGreater(metrics["hits"], 0)
+                self.assertEqual(metrics["entries"], 5)
+
+        run(test())
+
+    async def check_cached_response(self, client):
+        res = await client.get("/items/1?page=1&ignored=1")
+        self.assertEqual(await res.text(), "GET item 1 1")
+        etag = res.headers[hdrs.ETAG]
+
+        res = await client.get("/items/1?ignored=2&page=1")
+        self.assertEqual(await res.text(), "GET item 1 1")
+        self.assertEqual(res.headers[hdrs.ETAG], etag)
+        self.assertEqual(res.headers["X-Item"], "item")
+
+        # the query args of key, the vary headers of response and the request method are in the cache key
+        res = await client.get("/items/1?page=2")
+        self.assertEqual(await res.text(), "GET item 1 2")
+        res = await client.get("/items/1?page=1", headers={hdrs.ACCEPT_LANGUAGE: "fr"})
+        self.assertEqual(await res.text(), "GET item 1 3")
+        res = await client.head("/items/1?page=1")
+        self.assertEqual(res.status, 200)
+        self.assertEqual(calls["/items/1"], 4)
+        res = await client.get("/items/1?page=1")
+        self.assertEqual(await res.text(), "GET item 1 1")
+
+        # the requests with authorization are not cached
+        res = await client.get("/items/1?page=1", headers={hdrs.AUTHORIZATION: "Bearer token"})
+        self.assertEqual(await res.text(), "GET item 1 5")
+        res = await client.get("/items/1?page=1", headers={hdrs.AUTHORIZATION: "Bearer token"})
+        self.assertEqual(await res.text(), "GET item 1 6")
+
+    async def check_not_modified(self, client):
+        res = await client.get("/items/1?page=1")
+        etag = res.headers[hdrs.ETAG]
+        res = await client.get("/items/1?page=1", headers={hdrs.IF_NONE_MATCH: etag})
+        self.assertEqual(res.status, 304)
+        self.assertEqual(res.headers[hdrs.ETAG], etag)
+        self.assertEqual(res.headers[hdrs.CACHE_CONTROL], "max-age=60")
+        self.assertEqual(res.headers[hdrs.CONTENT_LOCATION], "/items/1")
+        self.assertEqual(res.headers[hdrs.EXPIRES], "Thu, 01 Jan 2099 00:00:00 GMT")
+        self.assertEqual(res.headers[hdrs.VARY], "Accept-Language")
+        self.assertNotIn("X-Item", res.headers)
+
+        # the response stored by the conditional request is replied 304
+        res = await client.get("/etag", headers={hdrs.IF_NONE_MATCH: '"v1"'})
+        self.assertEqual(res.status, 304)
+        self.assertEqual(res.headers[hdrs.ETAG], '"v1"')
+        self.assertEqual(res.headers[hdrs.CACHE_CONTROL], "max-age=60")
+        res = await client.get("/etag", headers={hdrs.IF_NONE_MATCH: '"v0"'})
+        self.assertEqual(res.status, 200)
+        self.assertEqual(calls["/etag"], 1)
+
+        # the expired response is requested again
+        await sleep(0.2)
+        res = await client.get("/etag")
+        self.assertEqual(await res.text(), "etag")
+        self.assertEqual(calls["/etag"], 2)
+
+    async def check_not_cached(self, client):
+        for path in ("/cookie", "/private"):
+            for i in (1, 2):
+                res = await client.get(path)
+                self.assertEqual(await res.text(), "{} {}".format(path[1:], i))
+
+        res = await client.get("/cookie")
+        self.assertEqual(res.cookies["session"].value, "value")
@@ -0,0 +1,210 @@
+# Copyright (C) 2020-Present the hyssop authors and contributors.
+#
+# This module is part of hyssop and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+File created: October 19th 2026
+
+Modified By: hsky77
+Last Updated: October 19th 2026 21:40:26 pm
+"""
+
+import gzip
+import os
+from asyncio import run
+from tempfile import mkdtemp
+
+from aiohttp import hdrs, web
+from yarl import URL
+
+from hyssop.utils.func import join_path
+
+from .base import AioHttpTestCase
+
+Style_Content = "body { color: black; }\n" * 20
+
+
+class TestCaseStatic(AioHttpTestCase):
+    def test(self):
+        self.test_conditional_requests()
+        self.test_variants()
+        self.test_file_response()
+        self.test_path_traversal()
+        self.test_precompress_static_files()
+
+    def create_static_client(self):
+        config = {
+            "aiohttp": {
+                "static_file": {"/static": {"cache_control": "max-age=60"}},
+                "static_cache": {"max_file_size": 1024, "revalidate": 0},
+            }
+        }
+        return self.create_client(web.RouteTableDef(), config)
+
+    def write_static_file(self, name: str, data: bytes, mtime: float = None) -> str:
+        path = join_path(self.project_dir, "static", name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+        return path
+
+    def test_conditional_requests(self):
+        async def test():
+            self.write_static_file("a.txt", b"static text")
+            async with self.create_static_client() as client:
+                res = await client.get("/static/a.txt")
+                self.assertEqual(res.status, 200)
+                self.assertEqual(await res.text(), "static text")
+                self.assertEqual(res.headers[hdrs.CACHE_CONTROL], "max-age=60")
+                self.assertNotIn(hdrs.VARY, res.headers)
+                etag, last_modified = res.headers[hdrs.ETAG], res.headers[hdrs.LAST_MODIFIED]
+
+                res = await client.get("/static/a.txt", headers={hdrs.IF_NONE_MATCH: etag})
+                self.assertEqual(res.status, 304)
+                self.assertEqual(res.headers[hdrs.ETAG], etag)
+                self.assertEqual(res.headers[hdrs.CACHE_CONTROL], "max-age=60")
+
+                res = await client.get("/static/a.txt", headers={hdrs.IF_MODIFIED_SINCE: last_modified})
+                self.assertEqual(res.status, 304)
+
+                res = await client.get("/static/a.txt", headers={hdrs.IF_NONE_MATCH: '"other"'})
+                self.assertEqual(res.status, 200)
+
+                # the modified file is reloaded with the new etag
+                self.write_static_file("a.txt", b"modified text")
+                res = await client.get("/static/a.txt", headers={hdrs.IF_NONE_MATCH: etag})
+                self.assertEqual(res.status, 200)
+                self.assertEqual(await res.text(), "modified text")
+                self.assertNotEqual(res.headers[hdrs.ETAG], etag)
+
+        run(test())
+
+    def test_variants(self):
+        async def test():
+            data = Style_Content.encode()
+            path = self.write_static_file("a.css", data, mtime=1000)
+            self.write_static_file("a.css.gz", gzip.compress(data), mtime=1000)
+            self.write_static_file("a.css.br", b"brotli", mtime=1000)
+            async with self.create_static_client() as client:
+                for accept_encoding, encoding in [
+                    ("gzip, deflate, br", "br"),
+                    ("gzip, br;q=0", "gzip"),
+                    ("GZIP", "gzip"),
+                    ("*", "br"),
+                    ("br;q=0, *;q=0.5", "gzip"),
+                    ("gzip;q=0", None),
+                    ("gzip;q=0, br;q=0.0", None),
+                    ("deflate", None),
+                    ("", None),
+                ]:
+                    res = await client.get("/static/a.css", headers={hdrs.ACCEPT_ENCODING: accept_encoding})
+                    self.assertEqual(res.status, 200)
+                    self.assertEqual(res.headers.get(hdrs.CONTENT_ENCODING), encoding, accept_encoding)
+                    self.assertEqual(res.headers[hdrs.VARY], hdrs.ACCEPT_ENCODING)
+                    self.assertEqual(res.headers[hdrs.CONTENT_TYPE], "text/css")
+                    if encoding != "br":
+                        self.assertEqual(await res.text(), Style_Content)
+                    res.release()
+
+                # the variants older than the modified file are not served
+                with open(path, "ab") as f:
+                    f.write(b"a { color: blue; }\n")
+                os.utime(path, (2000, 2000))
+                res = await client.get("/static/a.css", headers={hdrs.ACCEPT_ENCODING: "gzip, br"})
+                self.assertIsNone(res.headers.get(hdrs.CONTENT_ENCODING))
+                self.assertNotIn(hdrs.VARY, res.headers)
+                self.assertTrue((await res.text()).endswith("a { color: blue; }\n"))
+
+        run(test())
+
+    def test_file_response(self):
+        async def test():
+            data = os.urandom(2048)
+            self.write_static_file("large.bin", data)
+            self.write_static_file("small.bin", data[:16])
+            async with self.create_static_client() as client:
+                # the large files are sent by FileResponse
+                res = await client.get("/static/large.bin")
+                self.assertEqual(res.status, 200)
+                self.assertEqual(await res.read(), data)
+                self.assertEqual(res.headers[hdrs.CACHE_CONTROL], "max-age=60")
+
+                # the range requests fall back to FileResponse
+                for name in ("large.bin", "small.bin"):
+                    res = await client.get("/static/" + name, headers={hdrs.RANGE: "bytes=2-5"})
+                    self.assertEqual(res.status, 206)
+                    self.assertEqual(await res.read(), data[2:6])
+
+        run(test())
+
+    def test_path_traversal(self):
+        async def test():
+            self.write_static_file("a.txt", b"static text")
+            with open(join_path(self.project_dir, "secret.txt"), "w") as f:
+                f.write("secret")
+            os.symlink(join_path(self.project_dir, "secret.txt"), join_path(self.project_dir, "static", "link.txt"))
+            async with self.create_static_client() as client:
+                for url in [
+                    "/static/..%2Fsecret.txt",
+                    "/static/%2E%2E%2Fsecret.txt",
+                    "/static/sub%2F..%2F..%2Fsecret.txt",
+                    "/static/link.txt",
+                    "/static/missing.txt",
+                    "/static/",
+                ]:
+                    res = await client.get(URL(url, encoded=True))
+                    self.assertEqual(res.status, 404, url)
+
+        if hasattr(os, "symlink"):
+            run(test())
+
+    def test_precompress_static_files(self):
+        from ..server.static import precompress_static_files
+
+        data = Style_Content.encode()
+        self.write_static_file("big.css", data)
+        self.write_static_file("done.css", data)
+        self.write_static_file("done.css.gz", gzip.compress(data))
+        self.write_static_file("small.css", b"a {}")
+        self.write_static_file("image.png", data)
+        with open(join_path(self.project_dir, "other.css"), "wb") as f:
+            f.write(data)
+        with open(join_path(self.project_dir, "project_config.yml"), "w") as f:
+            f.write("aiohttp:\n  static_file:\n    /static:\n")
+
+        paths = [
+            (join_path(self.project_dir, *arcname.split("/")), arcname)
+            for arcname in [
+                "static/big.css",
+                "static/done.css",
+                "static/done.css.gz",
+                "static/small.css",
+                "static/image.png",
+                "other.css",
+            ]
+        ]
+        work_dir = mkdtemp(dir=self.project_dir)
+        generated = dict(
+            (arcname, path) for path, arcname in precompress_static_files(self.project_dir, paths, work_dir)
+        )
+        try:
+            import brotli
+        except ImportError:
+            brotli = None
+
+        # the existing variants, small files, incompressible types and the files out of static folders are skipped
+        expected = ["static/big.css.gz"]
+        if brotli is not None:
+            expected += ["static/big.css.br", "static/done.css.br"]
+        self.assertEqual(sorted(generated), sorted(expected))
+        with open(generated["static/big.css.gz"], "rb") as f:
+            self.assertEqual(gzip.decompress(f.read()), data)
+        if brotli is not None:
+            with open(generated["static/big.css.br"], "rb") as f:
+                self.assertEqual(brotli.decompress(f.read()), data)
+
+        # no project config
+        self.assertEqual(list(precompress_static_files(work_dir, paths, work_dir)), [])
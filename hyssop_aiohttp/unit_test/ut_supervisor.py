@@ -0,0 +1,105 @@
+# Copyright (C) 2020-Present the hyssop authors and contributors.
+#
+# This module is part of hyssop and is released under
+# the MIT License: http://www.opensource.org/licenses/mit-license.php
+
+"""
+File created: October 19th 2026
+
+Modified By: hsky77
+Last Updated: October 19th 2026 21:05:12 pm
+"""
+
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from urllib.error import URLError
+from urllib.request import urlopen
+
+from hyssop.utils.func import join_path
+
+from .. import Module_Path
+from ..server.supervisor import format_process_memory, get_process_memory
+from .base import AioHttpTestCase
+
+pid_controller = """
+
+import os
+
+
+@routes.get("/pid")
+async def pid(request: web.Request):
+    return web.Response(text=str(os.getpid()))
+"""
+
+
+class TestCaseSupervisor(AioHttpTestCase):
+    def test(self):
+        self.test_process_memory()
+        if sys.platform != "win32":
+            self.test_workers()
+            self.test_workers(preload=True)
+
+    def test_process_memory(self):
+        memory = get_process_memory(os.getpid())
+        if memory is not None:
+            self.assertGreater(memory["Rss"], 0)
+        self.assertIsNone(get_process_memory(-1))
+        self.assertEqual(
+            format_process_memory({"Rss": 4 * 1024 * 1024, "Pss": 3 * 1024 * 1024, "Shared_Clean": 1024 * 1024}),
+            "rss: 4.0MiB, pss: 3.0MiB, shared: 1.0MiB, private: 0.0MiB, saved: 1.0MiB",
+        )
+
+    def test_workers(self, preload: bool = False):
+        port = self.create_project()
+        args = [sys.executable, "-m", "hyssop_aiohttp", "start", self.server_dir, "--workers", "2"]
+        if preload:
+            args.append("--preload")
+        process = subprocess.Popen(
+            args, cwd=self.project_dir, env=self.create_env(), stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+        )
+        try:
+            pids = set()
+            deadline = time.monotonic() + 30
+            while len(pids) < 2 and time.monotonic() < deadline and process.poll() is None:
+                try:
+                    with urlopen("http://127.0.0.1:{}/pid".format(port), timeout=5) as res:
+                        pids.add(int(res.read()))
+                except (URLError, ConnectionError):
+                    time.sleep(0.1)
+            self.assertEqual(len(pids), 2)
+            self.assertNotIn(process.pid, pids)
+        finally:
+            process.send_signal(signal.SIGTERM)
+            output = process.communicate(timeout=60)[0].decode()
+        self.assertEqual(process.returncode, 0, output)
+        self.assertIn("server workers stopped", output)
+        if preload:
+            self.assertIn("preloaded server", output)
+
+    def create_project(self) -> int:
+        """create the hello project listening a free port and return the port"""
+        self.server_dir = join_path(self.project_dir, "server")
+        subprocess.run(
+            [sys.executable, "-m", "hyssop_aiohttp", "create", self.server_dir], env=self.create_env(), check=True
+        )
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+
+        config_file = join_path(self.server_dir, "project_config.yml")
+        with open(config_file, "r") as f:
+            config = f.read().replace("port: 8888", "port: {}".format(port))
+        with open(config_file, "w") as f:
+            f.write(config)
+        with open(join_path(self.server_dir, "controller", "hello.py"), "a") as f:
+            f.write(pid_controller)
+        return port
+
+    def create_env(self):
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.path.dirname(Module_Path), env.get("PYTHONPATH")]))
+        return env
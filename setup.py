@@ -40,13 +40,13 @@ setuptools.setup(
     license="MIT License",
     classifiers=[
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.6",
-        "Programming Language :: Python :: 3.7",
-        "Programming Language :: Python :: 3.8",
+        "Programming Language :: Python :: 3.9",
+        "Programming Language :: Python :: 3.10",
+        "Programming Language :: Python :: 3.11",
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
-    install_requires=['PyYAML>=5.1.1'],
-    python_requires='>=3.6',
+    install_requires=['PyYAML>=5.1.1', 'pydantic>=2.0'],
+    python_requires='>=3.9',
     package_data={'': ['*.yaml', '*.csv']}
 )
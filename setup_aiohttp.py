@@ -43,16 +43,17 @@ setuptools.setup(
     license="MIT License",
     classifiers=[
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.6",
-        "Programming Language :: Python :: 3.7",
-        "Programming Language :: Python :: 3.8",
+        "Programming Language :: Python :: 3.9",
+        "Programming Language :: Python :: 3.10",
+        "Programming Language :: Python :: 3.11",
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
     install_requires=['hyssop>=' + hy_ver,
-                      'aiohttp==3.7.3',
+                      'aiohttp>=3.14.5',
+                      'pydantic>=2.0',
                       'aiohttp-cors==0.7.0',
                       'aiohttp-swagger==1.0.15'],
-    python_requires='>=3.6',
+    python_requires='>=3.9',
     package_data={'': ['*.yaml', '*.csv']}
 )